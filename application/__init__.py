@@ -1,2 +1,18 @@
-from .application import Application
-from .simple_application import SimpleApplication
+from importlib import import_module
+
+# imported when used, both load tkinter and the graphers
+_EXPORTS = {
+    "Application": "application",
+    "SimpleApplication": "simple_application",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -1,29 +1,93 @@
 import platform
+from collections import deque
+from time import perf_counter
+from typing import Iterator
 
 import tkinter as tk
 from tkinter import ttk, colorchooser, messagebox
 
-from core import GraphCanvas
-from function_impls.lines import LineType1, LineType2
-from function_impls.trigonometry import Sine, Cosine, Tangent
-from function_impls.parabola import Parabola
-from function_impls.logarithm import Logarithm
-from function_impls.roots import NthRoot
-from function_impls.user_functions import FunctionX, FunctionY
-from function_impls.ellipse import Circle, Ellipse
-from function_impls.homographic import Homographic
-from function_impls.hyperbole import HyperboleType1, HyperboleType2
+from core import GraphCanvas, SegmentIndex, FunctionGraphX, FunctionGraphY
+from core.definitions import DEFINITIONS
+from core.function_parser import PARTIAL_SUMS, SERIES_TERM_BUDGET
+from core.viewport import panned_ranges, zoomed_ranges
+from .registry import REGISTRY
+
+STREAM_POLL_MS = 30
+# graphers are drawn in slices of at most RENDER_BUDGET_MS, leaving the rest of
+# a 60 Hz frame to Tk, with RENDER_SLICE_DELAY_MS between the slices
+RENDER_BUDGET_MS = 8
+RENDER_SLICE_DELAY_MS = 1
+
+# while the view is dragged or zoomed the graphers draw a preview, sampling
+# every few pixels, and they are fully redrawn once the input has stopped for
+# INTERACTION_IDLE_MS; the stride doubles or halves to keep the preview frames
+# under FRAME_TARGET_MS
+INTERACTION_IDLE_MS = 150
+FRAME_TARGET_MS = 16
+MAX_STRIDE = 16
+HOVER_DISTANCE = 8
+# hover readouts are interpolated on segments up to this long, in pixels,
+# on longer ones between the cached samples, or evaluated again without them
+READOUT_TOLERANCE = 2
+SERIES_WARNING = "series cut short, over the terms computed per redraw"
+
+# while the window is resized the canvas is adjusted at most once every
+# RESIZE_THROTTLE_MS and fully redrawn RESIZE_SETTLE_MS after the last change
+RESIZE_THROTTLE_MS = 50
+RESIZE_SETTLE_MS = 200
+
+PANEL_MAX_HEIGHT = 240
+# estimated height of a row of the panel, used to decide how many rows to build
+ROW_HEIGHT = 36
+# rows built below the visible part of the panel
+PANEL_MARGIN_ROWS = 5
+
+
+class GrapherEntry:
+    def __init__(self, key: int, grapher, color: str):
+        self.key = key
+        self.grapher = grapher
+        self.color = color
+        self.visible = True
+        self.dirty = True
+        self.row: ttk.Frame | None = None
+        # why part of the graph is missing, shown in its row
+        self.warning = ""
+        self.warning_label: ttk.Label | None = None
+
+    @property
+    def tag(self) -> str:
+        return f"grapher{self.key}"
 
 
 class Application:
-    def __init__(self):
+    def __init__(self, recorder=None):
         self.initial_y_range: tuple | None = None
         self.initial_cart: tuple | None = None
         self.initial_x_range: tuple | None = None
         self.graph_canvas = None
-        self.grapher_types = {}
-        self.graphers = []
+        self.graphers: dict[int, GrapherEntry] = {}
         self.grapher_frame: tk.Widget | None = None
+        self.panel_canvas: tk.Canvas | None = None
+        self.__next_key = 0
+        self.__pending_rows: deque[int] = deque()
+        self.__redraw_job = None
+        self.__full_redraw = False
+        self.__render_queue: deque[tuple[GrapherEntry, Iterator]] = deque()
+        self.__render_job = None
+        self.__frame_start: float | None = None
+        self.interaction_idle_ms = INTERACTION_IDLE_MS
+        self.__interaction_stride = 2
+        self.__idle_job = None
+        self.__stream_job = None
+        self.__resize_job = None
+        self.__settle_job = None
+        self.__pending_size: tuple[int, int] | None = None
+        self.segment_index = SegmentIndex()
+        self.selected = None
+        self.__dragged = False
+        # when set, the events handled are written to it, see application.replay
+        self.recorder = recorder
 
         self.colors = [
             "#F9102F",
@@ -38,81 +102,144 @@ class Application:
 
         self.root = tk.Tk()
         self.root.title("Tkinter Grapher")
-        self.__register_graphers()
         self.__build_gui()
         self.redraw_canvas()
 
-    def __register_graphers(self):
-        self.__register_grapher(FunctionX)
-        self.__register_grapher(FunctionY)
-        self.__register_grapher(LineType1)
-        self.__register_grapher(LineType2)
-        self.__register_grapher(Parabola)
-        self.__register_grapher(Circle)
-        self.__register_grapher(Ellipse)
-        self.__register_grapher(Homographic)
-        self.__register_grapher(HyperboleType1)
-        self.__register_grapher(HyperboleType2)
-        self.__register_grapher(Sine)
-        self.__register_grapher(Cosine)
-        self.__register_grapher(Tangent)
-        self.__register_grapher(Logarithm)
-        self.__register_grapher(NthRoot)
-
-    def __register_grapher(self, grapher_class):
-        self.grapher_types[grapher_class.get_params().fmt.replace("$", "")] = grapher_class
+    def __record(self, kind: str, **fields):
+        if self.recorder is not None:
+            self.recorder.record(kind, **fields)
 
     def __build_gui(self):
         self.root.rowconfigure(0, weight=1)
         self.root.columnconfigure(0, weight=1)
-        self.root.resizable(False, False)
 
         frame = ttk.Frame(self.root)
-        frame.grid()
-        frame.rowconfigure(0, weight=1)
+        frame.grid(sticky=tk.NSEW)
+        frame.rowconfigure(2, weight=1)
         frame.columnconfigure(0, weight=1)
 
         select_func = ttk.Button(frame, text="+ Add Graph", command=self.function_selection_popup)
         select_func.grid(column=0, row=0, sticky=tk.W)
 
-        self.grapher_frame = ttk.Frame(frame)
-        self.grapher_frame.grid(column=0, row=1, sticky=tk.EW)
+        panel = ttk.Frame(frame)
+        panel.grid(column=0, row=1, sticky=tk.EW)
+        panel.columnconfigure(0, weight=1)
+        self.panel_canvas = tk.Canvas(panel, height=0, highlightthickness=0)
+        self.panel_canvas.grid(column=0, row=0, sticky=tk.EW)
+        panel_scrollbar = ttk.Scrollbar(panel, orient=tk.VERTICAL, command=self.__scroll_panel)
+        panel_scrollbar.grid(column=1, row=0, sticky=tk.NS)
+        self.panel_canvas.configure(yscrollcommand=panel_scrollbar.set)
+        self.grapher_frame = ttk.Frame(self.panel_canvas)
+        panel_window = self.panel_canvas.create_window(0, 0, window=self.grapher_frame, anchor=tk.NW)
+        self.grapher_frame.bind("<Configure>", self.__panel_configure)
+        self.panel_canvas.bind(
+            "<Configure>",
+            lambda event: self.panel_canvas.itemconfigure(panel_window, width=event.width)
+        )
 
-        canvas = tk.Canvas(frame, width=500, height=500)
-        canvas.grid(column=0, row=2)
-        canvas.rowconfigure(0, weight=1)
-        canvas.columnconfigure(0, weight=1)
+        canvas = tk.Canvas(frame, width=500, height=500, highlightthickness=0)
+        canvas.grid(column=0, row=2, sticky=tk.NSEW)
+        canvas.bind("<Configure>", self.handle_resize)
         canvas.bind("<Button-1>", self.handle_button_press)
+        canvas.bind("<ButtonRelease-1>", self.handle_button_release)
         canvas.bind("<B1-Motion>", self.handle_motion)
+        canvas.bind("<Motion>", self.handle_hover)
+        canvas.bind("<Leave>", lambda _: canvas.delete("hover"))
         canvas.bind("<MouseWheel>", self.handle_scroll)
         canvas.bind("<Button-4>", self.handle_scroll)
         canvas.bind("<Button-5>", self.handle_scroll)
         self.graph_canvas = GraphCanvas(canvas, x_range=(-5, 5), y_range=(-5, 5))
+        self.graph_canvas.segment_index = self.segment_index
 
     def handle_button_press(self, event):
+        self.__record("press", x=event.x, y=event.y)
         self.initial_cart = (
             self.graph_canvas.x_canvas_to_x_plane(event.x),
             self.graph_canvas.y_canvas_to_y_plane(event.y)
         )
         self.initial_x_range = self.graph_canvas.x_range
         self.initial_y_range = self.graph_canvas.y_range
+        self.__dragged = False
+
+    def handle_button_release(self, event):
+        self.__record("release", x=event.x, y=event.y)
+        if self.__dragged:
+            return
+        hit = self.segment_index.nearest(event.x, event.y, HOVER_DISTANCE)
+        selected = None if hit is None else hit.owner
+        if selected is not self.selected:
+            if self.selected is not None:
+                self.schedule_redraw(self.selected)
+            self.selected = selected
+            if selected is not None:
+                self.schedule_redraw(selected)
+
+    def __readout(self, hit):
+        x_canvas, y_canvas = hit.point
+        x = self.graph_canvas.x_canvas_to_x_plane(x_canvas)
+        y = self.graph_canvas.y_canvas_to_y_plane(y_canvas)
+        if hit.length <= READOUT_TOLERANCE:
+            return x, y
+        grapher = hit.owner.grapher
+        if isinstance(grapher, FunctionGraphX):
+            value = grapher.value_at(x)
+            if value is not None:
+                y = value
+        elif isinstance(grapher, FunctionGraphY):
+            value = grapher.value_at(y)
+            if value is not None:
+                x = value
+        return x, y
+
+    def handle_hover(self, event):
+        self.__record("hover", x=event.x, y=event.y)
+        canvas = self.graph_canvas.canvas
+        canvas.delete("hover")
+        hit = self.segment_index.nearest(event.x, event.y, HOVER_DISTANCE)
+        if hit is None:
+            return
+        x, y = self.__readout(hit)
+        x_canvas = self.graph_canvas.x_plane_to_x_canvas(x)
+        y_canvas = self.graph_canvas.y_plane_to_y_canvas(y)
+        canvas.create_oval(x_canvas - 3, y_canvas - 3, x_canvas + 3, y_canvas + 3, fill="#000000", tags="hover")
+        text = f"({x:.4g}, {y:.4g})"
+        anchor = "sw" if x_canvas < self.graph_canvas.width() / 2 else "se"
+        canvas.create_text(x_canvas, y_canvas - 5, text=text, anchor=anchor, fill="#000000", tags="hover")
 
     def handle_motion(self, event):
         if None in (self.initial_cart, self.initial_x_range, self.initial_y_range):
             return
-        self.graph_canvas.x_range = self.initial_x_range
-        self.graph_canvas.y_range = self.initial_y_range
-
-        x_cart = self.graph_canvas.x_canvas_to_x_plane(event.x)
-        y_cart = self.graph_canvas.y_canvas_to_y_plane(event.y)
-
-        diff_x = self.initial_cart[0] - x_cart
-        diff_y = self.initial_cart[1] - y_cart
+        self.__record("motion", x=event.x, y=event.y)
+        self.__dragged = True
+        self.graph_canvas.x_range, self.graph_canvas.y_range = panned_ranges(
+            self.graph_canvas, self.initial_x_range, self.initial_y_range, self.initial_cart, event.x, event.y
+        )
+        self.__interact()
 
-        self.graph_canvas.x_range = self.initial_x_range[0] + diff_x, self.initial_x_range[1] + diff_x
-        self.graph_canvas.y_range = self.initial_y_range[0] + diff_y, self.initial_y_range[1] + diff_y
+    def handle_resize(self, event):
+        if (event.width, event.height) == (self.graph_canvas.width(), self.graph_canvas.height()):
+            return
+        self.__pending_size = event.width, event.height
+        if self.__resize_job is None:
+            self.__resize_job = self.root.after(RESIZE_THROTTLE_MS, self.__apply_resize)
+        if self.__settle_job is not None:
+            self.root.after_cancel(self.__settle_job)
+        self.__settle_job = self.root.after(RESIZE_SETTLE_MS, self.__settle_resize)
+
+    def __apply_resize(self):
+        self.__resize_job = None
+        if self.__pending_size is None:
+            return
+        self.__record("resize", width=self.__pending_size[0], height=self.__pending_size[1])
+        self.graph_canvas.resize(*self.__pending_size)
+        self.__pending_size = None
+        # the segments moved with the items, the index is rebuilt by the final redraw
+        self.segment_index.clear()
 
-        self.redraw_canvas()
+    def __settle_resize(self):
+        self.__settle_job = None
+        self.__apply_resize()
+        self.schedule_redraw()
 
     def handle_scroll(self, event):
         if event.type == "4":  # button press, running on Linux
@@ -125,52 +252,186 @@ class Application:
         else:
             step = event.delta
 
-        min_x, max_x = self.graph_canvas.x_range
-        min_y, max_y = self.graph_canvas.y_range
-        x = self.graph_canvas.x_canvas_to_x_plane(event.x)
-        y = self.graph_canvas.y_canvas_to_y_plane(event.y)
-        x_range = max_x - min_x
-        y_range = max_y - min_y
-
-        if step < 0:
-            new_x_range = x_range * (10 / 9)
-            new_y_range = y_range * (10 / 9)
-        elif step > 0:
-            new_x_range = x_range * (9 / 10)
-            new_y_range = y_range * (9 / 10)
-        else:
+        ranges = zoomed_ranges(self.graph_canvas, event.x, event.y, step)
+        if ranges is None:
             return
-
-        x_diff = x_range - new_x_range
-        y_diff = y_range - new_y_range
-        if x_range == 0:
-            x_weight = .5
-        else:
-            x_weight = (x - min_x) / x_range
-
-        if y_range == 0:
-            y_weight = .5
+        self.__record("scroll", x=event.x, y=event.y, step=1 if step > 0 else -1)
+        self.graph_canvas.x_range, self.graph_canvas.y_range = ranges
+        self.__interact()
+
+    def __interact(self):
+        """redraws the view, as a preview until the input stops for interaction_idle_ms"""
+        self.graph_canvas.stride = self.__interaction_stride
+        if self.__idle_job is not None:
+            self.root.after_cancel(self.__idle_job)
+        self.__idle_job = self.root.after(self.interaction_idle_ms, self.__end_interaction)
+        self.schedule_redraw()
+
+    def __end_interaction(self):
+        self.__idle_job = None
+        if self.graph_canvas.stride != 1:
+            self.graph_canvas.stride = 1
+            self.schedule_redraw()
+
+    def __frame_done(self, frame_ms: float):
+        if self.__idle_job is None:
+            return
+        if frame_ms > FRAME_TARGET_MS:
+            self.__interaction_stride = min(self.__interaction_stride * 2, MAX_STRIDE)
+        elif frame_ms < FRAME_TARGET_MS / 3:
+            self.__interaction_stride = max(self.__interaction_stride // 2, 1)
+
+    def schedule_redraw(self, entry: GrapherEntry | None = None):
+        """redraws entry, or everything when it is None, once the pending events
+        have been handled so that bursts of changes cause a single redraw"""
+        if entry is None:
+            self.__full_redraw = True
         else:
-            y_weight = (y - min_y) / y_range
-
-        self.graph_canvas.x_range = min_x + x_diff * x_weight, max_x - x_diff * (1 - x_weight)
-        self.graph_canvas.y_range = min_y + y_diff * y_weight, max_y - y_diff * (1 - y_weight)
-
-        self.redraw_canvas()
-
-    def handle_return_event(self, _):
-        self.redraw_canvas()
+            entry.dirty = True
+        if self.__redraw_job is None:
+            self.__redraw_job = self.root.after_idle(self.__process_redraw)
+
+    def __dependents_of_changes(self) -> list[GrapherEntry]:
+        """reads the inputs of the graphers, which updates the user functions
+        they define, and returns the graphers using the functions changed
+        since the last call, directly or through other functions"""
+        for entry in self.graphers.values():
+            entry.grapher.params.available()
+        changed = DEFINITIONS.take_changes()
+        if not changed:
+            return []
+        affected = DEFINITIONS.dependents(changed)
+        return [entry for entry in self.graphers.values() if entry.grapher.params.user_functions() & affected]
+
+    def __process_redraw(self):
+        self.__redraw_job = None
+        if self.__full_redraw:
+            self.redraw_canvas()
+            return
+        for entry in self.__dependents_of_changes():
+            entry.dirty = True
+        PARTIAL_SUMS.set_budget(SERIES_TERM_BUDGET)
+        for entry in self.graphers.values():
+            if entry.dirty:
+                self.__redraw_entry(entry)
+        self.__render()
+
+    @property
+    def rendering(self) -> bool:
+        """tells if some graphers are still being drawn"""
+        return bool(self.__render_queue)
+
+    def __set_style(self, entry: GrapherEntry):
+        self.graph_canvas.color = entry.color
+        self.graph_canvas.line_width = 4 if entry is self.selected else 2
+        self.graph_canvas.owner = entry
+        self.graph_canvas.tag = entry.tag
+
+    def __reset_style(self):
+        self.graph_canvas.owner = None
+        self.graph_canvas.tag = None
+
+    def __set_warning(self, entry: GrapherEntry, text: str):
+        if entry.warning == text:
+            return
+        entry.warning = text
+        if entry.warning_label is not None:
+            entry.warning_label.configure(text=text)
+
+    def __unqueue(self, entry: GrapherEntry):
+        self.__render_queue = deque(job for job in self.__render_queue if job[0] is not entry)
+
+    def __redraw_entry(self, entry: GrapherEntry):
+        entry.dirty = False
+        self.__unqueue(entry)
+        self.graph_canvas.delete(entry.tag)
+        self.segment_index.remove_owner(entry)
+        self.__set_warning(entry, "")
+        if entry.visible:
+            self.__render_queue.append((entry, entry.grapher.graph_iter()))
 
     def redraw_canvas(self):
-        self.graph_canvas.line_width = 2
+        self.__full_redraw = False
+        now = perf_counter()
+        if self.__render_queue and self.__frame_start is not None:
+            # the previous frame did not even finish, slow if it took long already
+            elapsed = (now - self.__frame_start) * 1000
+            if elapsed > FRAME_TARGET_MS:
+                self.__frame_done(elapsed)
+        self.__frame_start = now
+        self.__render_queue.clear()
+        # everything is drawn again, the values shared by the user functions are kept for this redraw only
+        self.__dependents_of_changes()
+        DEFINITIONS.clear_memo()
+        PARTIAL_SUMS.set_budget(SERIES_TERM_BUDGET)
         self.graph_canvas.clear()
+        self.segment_index.clear()
         self.graph_canvas.draw_background()
-        for grapher, color, visible in self.graphers:
-            if not visible.get():
-                continue
-            self.graph_canvas.color = color
-            grapher.graph()
         self.graph_canvas.draw_foreground()
+        for entry in self.graphers.values():
+            entry.dirty = False
+            self.__set_warning(entry, "")
+            if entry.visible:
+                self.__render_queue.append((entry, entry.grapher.graph_iter()))
+        self.__render()
+
+    def __render(self):
+        if self.__render_job is None:
+            self.__render_slice()
+
+    def __render_slice(self):
+        """advances the graphers in the queue, one after the other, for at most
+        RENDER_BUDGET_MS and then lets Tk handle the events until the next slice"""
+        self.__render_job = None
+        deadline = perf_counter() + RENDER_BUDGET_MS / 1000
+        while self.__render_queue and perf_counter() < deadline:
+            entry, steps = self.__render_queue[0]
+            self.__set_style(entry)
+            refused = PARTIAL_SUMS.refused
+            try:
+                next(steps)
+            except StopIteration:
+                self.__render_queue.popleft()
+            finally:
+                self.__reset_style()
+            if PARTIAL_SUMS.refused != refused:
+                self.__set_warning(entry, SERIES_WARNING)
+        self.graph_canvas.canvas.tag_raise("foreground")
+        if self.__render_queue:
+            self.__render_job = self.root.after(RENDER_SLICE_DELAY_MS, self.__render_slice)
+        elif self.__frame_start is not None:
+            self.__frame_done((perf_counter() - self.__frame_start) * 1000)
+            self.__frame_start = None
+
+    def __poll_streams(self):
+        self.__stream_job = None
+        if not any(entry.grapher.streaming for entry in self.graphers.values()):
+            return
+
+        shown = [entry for entry in self.graphers.values() if entry.visible]
+        streams = [entry for entry in shown if entry.grapher.streaming]
+        if streams:
+            # following would scroll the other graphers too and they would all
+            # have to be drawn again, so the view only follows streams alone
+            self.__update_streams(streams, follow=len(streams) == len(shown))
+        self.__stream_job = self.root.after(STREAM_POLL_MS, self.__poll_streams)
+
+    def __update_streams(self, streams, follow: bool):
+        newest = [entry.grapher.newest_x() for entry in streams if entry.grapher.follow]
+        newest = [x for x in newest if x is not None]
+        min_x, max_x = self.graph_canvas.x_range
+        if follow and newest and max(newest) > max_x:
+            shift = max(newest) - max_x
+            self.graph_canvas.x_range = min_x + shift, max_x + shift
+            dx = self.graph_canvas.x_plane_to_x_canvas(min_x) - self.graph_canvas.canvas_x_range[0]
+            self.graph_canvas.scroll(dx, 0)
+            self.segment_index.clear()
+
+        for entry in streams:
+            self.__set_style(entry)
+            entry.grapher.graph_new()
+        self.__reset_style()
+        self.graph_canvas.canvas.tag_raise("foreground")
 
     def function_selection_popup(self):
         popup = tk.Toplevel()
@@ -179,7 +440,7 @@ class Application:
         popup.resizable(False, False)
         label = ttk.Label(popup, text="Select a graph to add:")
         label.pack(anchor=tk.W, padx=10, pady=5)
-        combobox = ttk.Combobox(popup, values=list(self.grapher_types.keys()), width=35)
+        combobox = ttk.Combobox(popup, values=REGISTRY.names(), width=35)
         combobox.pack(anchor=tk.W, padx=10, pady=5)
         ok_cancel_frame = ttk.Frame(popup)
         ok_cancel_frame.pack(anchor=tk.E, padx=10, pady=5)
@@ -190,77 +451,150 @@ class Application:
 
     def add_function(self, type_, popup):
         popup.destroy()
-        if type_ not in self.grapher_types:
-            return
-        grapher_type = self.grapher_types[type_]
-        grapher = grapher_type(self.graph_canvas)
+        self.add_grapher(type_)
+
+    def add_grapher(self, type_: str, texts: dict[str, str] | None = None) -> int | None:
+        """adds a grapher of the type registered as type_, texts fills the fields
+        of its input by name; returns the key of the grapher"""
+        if type_ not in REGISTRY:
+            return None
+        grapher = REGISTRY.load(type_)(self.graph_canvas)
+        for name, text in (texts or {}).items():
+            grapher.params.set_text(name, text)
+        self.__record("add", type=type_, texts=texts or {})
         color = self.colors[self.color_index]
         self.color_index += 1
         self.color_index %= len(self.colors)
 
+        key = self.__next_key
+        self.__next_key += 1
+        entry = GrapherEntry(key, grapher, color)
+        self.graphers[key] = entry
+        self.__pending_rows.append(key)
+        self.__fill_panel()
+
+        if grapher.streaming and self.__stream_job is None:
+            self.__stream_job = self.root.after(STREAM_POLL_MS, self.__poll_streams)
+        self.schedule_redraw(entry)
+        return key
+
+    def __panel_configure(self, _):
+        self.panel_canvas.configure(
+            scrollregion=self.panel_canvas.bbox("all"),
+            width=self.grapher_frame.winfo_reqwidth(),
+            height=min(self.grapher_frame.winfo_reqheight(), PANEL_MAX_HEIGHT)
+        )
+
+    def __scroll_panel(self, *args):
+        self.panel_canvas.yview(*args)
+        self.__fill_panel()
+
+    def __fill_panel(self):
+        """builds the rows of the panel that are visible or close to be"""
+        built = len(self.graphers) - len(self.__pending_rows)
+        bottom = self.panel_canvas.yview()[1]
+        needed = int(bottom * built) + PANEL_MAX_HEIGHT // ROW_HEIGHT + PANEL_MARGIN_ROWS
+        while self.__pending_rows and built < needed:
+            self.__build_row(self.graphers[self.__pending_rows.popleft()])
+            built += 1
+
+    def __build_row(self, entry: GrapherEntry):
         param_frame = ttk.Frame(self.grapher_frame)
         param_frame.pack(fill=tk.X, padx=10, pady=5)
         param_frame.columnconfigure(0, weight=10)
         param_frame.columnconfigure(1, weight=2)
-        param_widget = grapher.params.build_widget(param_frame)
+        param_widget = entry.grapher.params.build_widget(param_frame)
         param_widget.grid(row=0, column=0, sticky=tk.W)
 
         grapher_edit_frame = ttk.Frame(param_frame)
         grapher_edit_frame.grid(row=0, column=1, sticky=tk.E)
 
+        entry.warning_label = ttk.Label(grapher_edit_frame, text=entry.warning, foreground="#c00000")
+        entry.warning_label.grid(row=0, column=0, sticky=tk.E, padx=5)
+
         change_color_button = None
         change_color_button = tk.Button(
             grapher_edit_frame,
             text="     ",
-            bg=color,
-            command=lambda: self.change_color(grapher, change_color_button),
+            bg=entry.color,
+            command=lambda: self.change_color(entry.key, change_color_button),
             relief=tk.GROOVE
         )
         change_color_button.grid(row=0, column=1, sticky=tk.E)
 
-        checkbox_var = tk.IntVar()
+        checkbox_var = tk.IntVar(value=int(entry.visible))
         visible_button = ttk.Checkbutton(
             grapher_edit_frame,
             variable=checkbox_var,
-            command=self.redraw_canvas
+            command=lambda: self.set_visible(entry.key, bool(checkbox_var.get()))
         )
         visible_button.grid(row=0, column=2, sticky=tk.E, padx=2)
-        visible_button.invoke()
 
         remove_button = ttk.Button(
             grapher_edit_frame,
             text="Remove",
-            command=lambda: self.remove_grapher(grapher, param_frame)
+            command=lambda: self.remove_grapher(entry.key)
         )
         remove_button.grid(row=0, column=3, sticky=tk.E)
 
-        self.graphers.append([grapher, color, checkbox_var])
+        entry.row = param_frame
+        self.__bind_entries(param_widget, entry)
 
-        for child in param_widget.winfo_children():
+    def __bind_entries(self, widget, entry: GrapherEntry):
+        for child in widget.winfo_children():
             if isinstance(child, ttk.Entry) or isinstance(child, tk.Entry):
-                child.bind("<Return>", self.handle_return_event)
-                child.bind("<Button-1>", self.handle_return_event)
-                child.bind("<KeyPress>", self.handle_return_event)
-                child.bind("<KeyRelease>", self.handle_return_event)
-
-    def remove_grapher(self, grapher, param_frame):
+                child.bind("<Return>", lambda _: self.__edited(entry))
+                child.bind("<Button-1>", lambda _: self.schedule_redraw(entry))
+                child.bind("<KeyPress>", lambda _: self.schedule_redraw(entry))
+                child.bind("<KeyRelease>", lambda _: self.__edited(entry))
+            else:
+                self.__bind_entries(child, entry)
+
+    def __edited(self, entry: GrapherEntry):
+        if self.recorder is not None:
+            params = entry.grapher.params
+            texts = {name: params.get_text(name) or "" for name in params.text_names()}
+            self.recorder.record_edit(entry.key, texts)
+        self.schedule_redraw(entry)
+
+    def set_visible(self, key: int, visible: bool):
+        self.__record("visible", key=key, visible=visible)
+        entry = self.graphers[key]
+        entry.visible = visible
+        self.schedule_redraw(entry)
+
+    def remove_grapher(self, key: int):
         result = messagebox.askokcancel("Delete graph", "Are you sure you want to delete this graph?")
         if not result:
             return
-        del self.graphers[list(map(lambda x: x[0], self.graphers)).index(grapher)]
-        param_frame.pack_forget()
-        param_frame.destroy()
-        self.redraw_canvas()
-
-    def change_color(self, grapher, button):
-        idx = list(map(lambda x: x[0], self.graphers)).index(grapher)
-        color = self.graphers[idx][1]
-        new_color = colorchooser.askcolor(color)
+        self.delete_grapher(key)
+
+    def delete_grapher(self, key: int):
+        self.__record("remove", key=key)
+        entry = self.graphers.pop(key)
+        self.__unqueue(entry)
+        entry.grapher.close()
+        if self.selected is entry:
+            self.selected = None
+        if entry.row is None:
+            self.__pending_rows.remove(key)
+        else:
+            entry.row.pack_forget()
+            entry.row.destroy()
+        self.graph_canvas.delete(entry.tag)
+        self.segment_index.remove_owner(entry)
+        self.__fill_panel()
+        for dependent in self.__dependents_of_changes():
+            self.schedule_redraw(dependent)
+
+    def change_color(self, key: int, button):
+        entry = self.graphers[key]
+        new_color = colorchooser.askcolor(entry.color)
         if new_color == (None, None):
             return
         button.configure(bg=new_color[1])
-        self.graphers[idx][1] = new_color[1]
-        self.redraw_canvas()
+        entry.color = new_color[1]
+        self.schedule_redraw(entry)
 
     def run(self):
         self.root.mainloop()
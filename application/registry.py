@@ -0,0 +1,65 @@
+from importlib import import_module
+import sys
+
+from function_impls.manifest import GRAPHERS
+
+# installed packages add graphers with an entry point in this group, naming a
+# manifest like function_impls.manifest.GRAPHERS
+ENTRY_POINT_GROUP = "tkinter_grapher.graphers"
+
+
+class GrapherRegistry:
+    """The grapher types by the name they are listed and recorded under, as
+    declared by the manifests. The module of a type is imported the first time
+    the type is used, and the packages declaring entry points are only looked
+    up when a name is not among the known ones or all the names are listed."""
+
+    def __init__(self, manifest=GRAPHERS, entry_point_group: str | None = ENTRY_POINT_GROUP):
+        self.__targets: dict[str, str] = {}
+        self.__classes: dict[str, type] = {}
+        self.__entry_point_group = entry_point_group
+        self.add_manifest(manifest)
+
+    def add_manifest(self, manifest):
+        """adds the (name, "module:Class") pairs of manifest, a name already
+        declared keeps its first grapher"""
+        for name, target in manifest:
+            self.__targets.setdefault(name, target)
+
+    def __load_entry_points(self):
+        group = self.__entry_point_group
+        if group is None:
+            return
+        self.__entry_point_group = None
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=group):
+            try:
+                self.add_manifest(entry_point.load())
+            except Exception as e:
+                print(f"cannot load the graphers of {entry_point.value}: {e}", file=sys.stderr)
+
+    def __contains__(self, name: str) -> bool:
+        if name not in self.__targets:
+            self.__load_entry_points()
+        return name in self.__targets
+
+    def names(self) -> list[str]:
+        self.__load_entry_points()
+        return list(self.__targets)
+
+    def target(self, name: str) -> str:
+        """the "module:Class" of the grapher called name"""
+        if name not in self:
+            raise KeyError(name)
+        return self.__targets[name]
+
+    def load(self, name: str) -> type:
+        """the class of the grapher called name, importing its module"""
+        grapher_class = self.__classes.get(name)
+        if grapher_class is None:
+            module, _, class_name = self.target(name).partition(":")
+            grapher_class = self.__classes[name] = getattr(import_module(module), class_name)
+        return grapher_class
+
+
+REGISTRY = GrapherRegistry()
@@ -0,0 +1,270 @@
+import json
+from time import perf_counter
+from types import SimpleNamespace
+
+from core import SegmentIndex
+from core.definitions import DEFINITIONS
+from core.function_parser import PARTIAL_SUMS, SERIES_TERM_BUDGET
+from core.recording_canvas import RecordingCanvas
+from core.stats import STATS
+from core.tile_cache import TILE_CACHE
+from core.viewport import panned_ranges, zoomed_ranges
+from .registry import REGISTRY
+
+HOVER_DISTANCE = 8
+
+
+class SessionRecorder:
+    """Writes the events handled by an Application to a file, one JSON object
+    per line with the seconds since the start in "t" and the event in "kind"."""
+
+    def __init__(self, path: str):
+        self.__file = open(path, "w", encoding="utf-8")
+        self.__start = perf_counter()
+        self.__texts: dict[int, dict[str, str]] = {}
+
+    def record(self, kind: str, **fields):
+        event = {"t": round(perf_counter() - self.__start, 4), "kind": kind, **fields}
+        self.__file.write(json.dumps(event) + "\n")
+        self.__file.flush()
+
+    def record_edit(self, key: int, texts: dict[str, str]):
+        """records the texts of the grapher key, unless they did not change"""
+        if self.__texts.get(key) == texts:
+            return
+        self.__texts[key] = texts
+        self.record("edit", key=key, texts=texts)
+
+    def close(self):
+        self.__file.close()
+
+
+def load_session(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class HeadlessSession:
+    """Applies recorded events the way Application handles them, drawing on a
+    RecordingCanvas, so that sessions can be replayed without a display."""
+
+    def __init__(self, width: int = 500, height: int = 500):
+        self.graph_canvas = RecordingCanvas(width, height, x_range=(-5, 5), y_range=(-5, 5))
+        self.segment_index = SegmentIndex()
+        self.graph_canvas.segment_index = self.segment_index
+        self.graphers = {}
+        self.hidden = set()
+        self.__next_key = 0
+        self.__grab = None
+        self.redraw()
+
+    def item_count(self) -> int:
+        return len(self.graph_canvas.items)
+
+    def __draw(self, key):
+        self.graph_canvas.owner = key
+        self.graph_canvas.tag = f"grapher{key}"
+        self.graphers[key].graph()
+        self.graph_canvas.owner = None
+        self.graph_canvas.tag = None
+
+    def __redraw_grapher(self, key):
+        self.graph_canvas.delete(f"grapher{key}")
+        self.segment_index.remove_owner(key)
+        if key not in self.hidden:
+            self.__draw(key)
+
+    def __redraw_dependents(self):
+        for grapher in self.graphers.values():
+            grapher.params.available()
+        changed = DEFINITIONS.take_changes()
+        if not changed:
+            return
+        affected = DEFINITIONS.dependents(changed)
+        for key, grapher in self.graphers.items():
+            if grapher.params.user_functions() & affected:
+                self.__redraw_grapher(key)
+
+    def redraw(self):
+        DEFINITIONS.take_changes()
+        DEFINITIONS.clear_memo()
+        self.graph_canvas.clear()
+        self.segment_index.clear()
+        self.graph_canvas.draw_background()
+        for key in self.graphers:
+            if key not in self.hidden:
+                self.__draw(key)
+        self.graph_canvas.draw_foreground()
+
+    def apply(self, event: dict):
+        kind = event["kind"]
+        graph_canvas = self.graph_canvas
+        # the budget of a redraw in the application
+        PARTIAL_SUMS.set_budget(SERIES_TERM_BUDGET)
+        if kind == "add":
+            grapher = REGISTRY.load(event["type"])(graph_canvas)
+            for name, text in event["texts"].items():
+                grapher.params.set_text(name, text)
+            key = self.__next_key
+            self.__next_key += 1
+            self.graphers[key] = grapher
+            self.__redraw_grapher(key)
+            self.__redraw_dependents()
+        elif kind == "edit":
+            for name, text in event["texts"].items():
+                self.graphers[event["key"]].params.set_text(name, text)
+            self.__redraw_grapher(event["key"])
+            self.__redraw_dependents()
+        elif kind == "visible":
+            if event["visible"]:
+                self.hidden.discard(event["key"])
+            else:
+                self.hidden.add(event["key"])
+            self.__redraw_grapher(event["key"])
+        elif kind == "remove":
+            self.graphers.pop(event["key"]).close()
+            graph_canvas.delete(f"grapher{event['key']}")
+            self.segment_index.remove_owner(event["key"])
+            self.__redraw_dependents()
+        elif kind == "press":
+            self.__grab = (
+                (graph_canvas.x_canvas_to_x_plane(event["x"]), graph_canvas.y_canvas_to_y_plane(event["y"])),
+                graph_canvas.x_range,
+                graph_canvas.y_range
+            )
+        elif kind == "motion":
+            if self.__grab is None:
+                return
+            cart, x_range, y_range = self.__grab
+            graph_canvas.x_range, graph_canvas.y_range = panned_ranges(
+                graph_canvas, x_range, y_range, cart, event["x"], event["y"]
+            )
+            self.redraw()
+        elif kind == "release":
+            self.__grab = None
+            self.segment_index.nearest(event["x"], event["y"], HOVER_DISTANCE)
+        elif kind == "hover":
+            self.segment_index.nearest(event["x"], event["y"], HOVER_DISTANCE)
+        elif kind == "scroll":
+            graph_canvas.x_range, graph_canvas.y_range = zoomed_ranges(
+                graph_canvas, event["x"], event["y"], event["step"]
+            )
+            self.redraw()
+        elif kind == "resize":
+            graph_canvas.resize(event["width"], event["height"])
+            self.redraw()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        for grapher in self.graphers.values():
+            grapher.close()
+
+
+class TkSession:
+    """Applies recorded events to a real Application, through its handlers,
+    waiting for the redraws they schedule to be over."""
+
+    def __init__(self):
+        from .application import Application
+        self.app = Application()
+        self.app.root.update()
+
+    def item_count(self) -> int:
+        return len(self.app.graph_canvas.canvas.find_all())
+
+    def apply(self, event: dict):
+        app = self.app
+        kind = event["kind"]
+        tk_event = SimpleNamespace(**event)
+        if kind == "add":
+            app.add_grapher(event["type"], event["texts"])
+        elif kind == "edit":
+            entry = app.graphers[event["key"]]
+            for name, text in event["texts"].items():
+                entry.grapher.params.set_text(name, text)
+            app.schedule_redraw(entry)
+        elif kind == "visible":
+            app.set_visible(event["key"], event["visible"])
+        elif kind == "remove":
+            app.delete_grapher(event["key"])
+        elif kind == "press":
+            app.handle_button_press(tk_event)
+        elif kind == "motion":
+            app.handle_motion(tk_event)
+        elif kind == "release":
+            app.handle_button_release(tk_event)
+        elif kind == "hover":
+            app.handle_hover(tk_event)
+        elif kind == "scroll":
+            # replayed as a Linux wheel button, which every platform handles the same way
+            tk_event.type = "4"
+            tk_event.num = 4 if event["step"] > 0 else 5
+            app.handle_scroll(tk_event)
+        elif kind == "resize":
+            # resized at once rather than through the throttled <Configure> handling
+            app.graph_canvas.canvas.configure(width=event["width"], height=event["height"])
+            app.graph_canvas.resize(event["width"], event["height"])
+            app.segment_index.clear()
+            app.schedule_redraw()
+
+    def flush(self):
+        self.app.root.update()
+        while self.app.rendering:
+            self.app.root.update()
+
+    def close(self):
+        self.app.root.destroy()
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+class ReplayReport:
+    def __init__(self):
+        # (kind, seconds, evaluations, items) for every event replayed
+        self.frames: list[tuple[str, float, int, int]] = []
+        self.tile_hits = 0
+        self.tile_misses = 0
+
+    def latencies(self, kind: str | None = None) -> list[float]:
+        return [seconds for frame_kind, seconds, _, _ in self.frames if kind is None or frame_kind == kind]
+
+    def format(self) -> str:
+        lines = [f"{'event':<8}{'frames':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+        kinds = sorted({frame[0] for frame in self.frames})
+        for kind in [*kinds, None]:
+            latencies = self.latencies(kind)
+            lines.append(
+                f"{kind or 'all':<8}{len(latencies):>8}"
+                + "".join(f"{_percentile(latencies, p) * 1000:>9.2f}" for p in (50, 90, 99, 100))
+            )
+        evaluations = sum(frame[2] for frame in self.frames)
+        items = [frame[3] for frame in self.frames]
+        lines.append(f"evaluations: {evaluations} ({evaluations / max(len(self.frames), 1):.0f} per frame)")
+        lines.append(f"canvas items: {items[-1] if items else 0} at the end, {max(items, default=0)} at most")
+        lines.append(f"tile cache: {self.tile_hits} hits, {self.tile_misses} misses")
+        return "\n".join(lines)
+
+
+def replay(session, events: list[dict]) -> ReplayReport:
+    """applies events to session one at a time, as fast as possible, timing
+    each of them together with the redraw it causes"""
+    report = ReplayReport()
+    hits = TILE_CACHE.hits
+    misses = TILE_CACHE.misses
+    for event in events:
+        evaluations = STATS.evaluations
+        start = perf_counter()
+        session.apply(event)
+        session.flush()
+        seconds = perf_counter() - start
+        report.frames.append((event["kind"], seconds, STATS.evaluations - evaluations, session.item_count()))
+    report.tile_hits = TILE_CACHE.hits - hits
+    report.tile_misses = TILE_CACHE.misses - misses
+    return report
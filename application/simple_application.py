@@ -2,8 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 
 from core import GraphCanvas, GrapherBase, FunctionInput
-from function_impls.user_functions import FunctionX
-from function_impls.ellipse import Circle
+from .registry import REGISTRY
 
 
 class SimpleApplication:
@@ -24,9 +23,10 @@ class SimpleApplication:
         self.x_entry: ttk.Entry | None = None
         self.x_label: ttk.Label | None = None
 
+        # label shown -> name of the grapher in the registry
         self.available_graphers = {
-            "f(x)": FunctionX,
-            "Cerchio": Circle
+            "f(x)": "f(x)",
+            "Cerchio": "(x + a)^2 + (y + b)^2 = r^2"
         }
 
         self.default_graph = "f(x)"
@@ -158,7 +158,7 @@ class SimpleApplication:
         name = self.grapher_combobox.get()
         if name not in self.available_graphers:
             return
-        self.change_grapher(self.available_graphers[name])
+        self.change_grapher(REGISTRY.load(self.available_graphers[name]))
 
     def change_grapher(self, grapher_type: type):
         if self.grapher_param_widget is not None:
@@ -1,4 +1,48 @@
-from .function_parser import parse_func, FuncAST, ParseFuncError
-from .graph_canvas import GraphCanvasBase, GraphCanvas
-from .grapher_base import GrapherBase, FunctionGraphX, FunctionGraphY
-from .param_input import InputBase, ParamInput, TerminalParamInput, FunctionInput
+from importlib import import_module
+
+# the module of each name, imported the first time the name is used so that
+# e.g. parsing does not load the canvas backends, the widgets or tkinter
+_EXPORTS = {
+    "parse_func": "function_parser",
+    "FuncAST": "function_parser",
+    "ParseFuncError": "function_parser",
+    "GraphCanvasBase": "graph_canvas",
+    "GraphCanvas": "tk_canvas",
+    "Polyline": "polyline",
+    "GrapherBase": "grapher_base",
+    "FunctionGraphX": "grapher_base",
+    "FunctionGraphY": "grapher_base",
+    "InputBase": "param_input",
+    "ParamInput": "param_input",
+    "TerminalParamInput": "param_input",
+    "FunctionInput": "param_input",
+    "ParametricInput": "param_input",
+    "PolarInput": "param_input",
+    "RegionInput": "param_input",
+    "AreaInput": "param_input",
+    "HeatmapInput": "param_input",
+    "FileInput": "param_input",
+    "StreamInput": "param_input",
+    "MappedSeries": "data_series",
+    "RingBuffer": "ring_buffer",
+    "StreamReader": "stream_reader",
+    "SegmentIndex": "spatial_index",
+    "integrate": "integration",
+    "cumulative_integral": "integration",
+    "IntegralResult": "integration",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
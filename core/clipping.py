@@ -0,0 +1,130 @@
+from math import isfinite
+
+from .polyline import Polyline
+
+# the viewport is inflated by this many pixels so clipped ends stay out of sight
+MARGIN = 2
+
+
+def viewport(graph_canvas, margin: float = MARGIN) -> tuple[float, float, float, float]:
+    """the drawing area of graph_canvas as (min_x, min_y, max_x, max_y), in
+    canvas coordinates, inflated by margin"""
+    min_xc, max_xc = graph_canvas.canvas_x_range
+    min_yc, max_yc = graph_canvas.canvas_y_range
+    return (
+        min(min_xc, max_xc) - margin, min(min_yc, max_yc) - margin,
+        max(min_xc, max_xc) + margin, max(min_yc, max_yc) + margin
+    )
+
+
+def inside(x: float, y: float, rect) -> bool:
+    return rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]
+
+
+def clip_parameters(x: float, y: float, dx: float, dy: float, u0: float, u1: float, rect) -> tuple[float, float] | None:
+    """the Liang-Barsky algorithm: the range of u between u0 and u1 for which
+    (x + u * dx, y + u * dy) lies inside rect, None if there is none"""
+    for p, d, low, high in ((x, dx, rect[0], rect[2]), (y, dy, rect[1], rect[3])):
+        if d == 0:
+            if not low <= p <= high:
+                return None
+            continue
+        ua = (low - p) / d
+        ub = (high - p) / d
+        if ua > ub:
+            ua, ub = ub, ua
+        if ua > u0:
+            u0 = ua
+        if ub < u1:
+            u1 = ub
+    if u0 < u1:
+        return u0, u1
+    return None
+
+
+def clip_segment(p1: tuple[float, float], p2: tuple[float, float], rect) \
+        -> tuple[tuple[float, float], tuple[float, float]] | None:
+    """the part of the segment from p1 to p2 inside rect, None if it is outside"""
+    dx = p2[0] - p1[0]
+    dy = p2[1] - p1[1]
+    clipped = clip_parameters(p1[0], p1[1], dx, dy, 0, 1, rect)
+    if clipped is None:
+        return None
+    u0, u1 = clipped
+    return (p1[0] + u0 * dx, p1[1] + u0 * dy), (p1[0] + u1 * dx, p1[1] + u1 * dy)
+
+
+def clip_line(point: tuple[float, float], direction: tuple[float, float], rect) \
+        -> tuple[tuple[float, float], tuple[float, float]] | None:
+    """the part of the infinite line through point with the given direction
+    inside rect, None if it does not cross it"""
+    if direction[0] == 0 and direction[1] == 0:
+        return None
+    clipped = clip_parameters(point[0], point[1], direction[0], direction[1], float("-inf"), float("inf"), rect)
+    if clipped is None:
+        return None
+    u0, u1 = clipped
+    return (
+        (point[0] + u0 * direction[0], point[1] + u0 * direction[1]),
+        (point[0] + u1 * direction[0], point[1] + u1 * direction[1])
+    )
+
+
+def clip_polyline(polyline: Polyline, rect) -> Polyline:
+    """the parts of the runs of polyline inside rect; a run leaving rect ends
+    on its edge and continues from where it comes back, points that are not
+    finite break the runs"""
+    min_x, min_y, max_x, max_y = rect
+    clipped = Polyline()
+    coords = clipped.coords
+    for run in polyline.runs():
+        xs = run[0::2]
+        ys = run[1::2]
+        total = sum(run)
+        if total == total and min_x <= min(xs) and max(xs) <= max_x and min_y <= min(ys) and max(ys) <= max_y:
+            # all inside, and none is nan since the sum is not
+            clipped.end_run()
+            coords.extend(run)
+            continue
+
+        clipped.end_run()
+        x1 = xs[0]
+        y1 = ys[0]
+        inside1 = min_x <= x1 <= max_x and min_y <= y1 <= max_y
+        if inside1:
+            coords.append(x1)
+            coords.append(y1)
+        for x2, y2 in zip(xs[1:], ys[1:]):
+            inside2 = min_x <= x2 <= max_x and min_y <= y2 <= max_y
+            if inside1 and inside2:
+                coords.append(x2)
+                coords.append(y2)
+            else:
+                dx = x2 - x1
+                dy = y2 - y1
+                visible = None
+                if isfinite(dx) and isfinite(dy):
+                    visible = clip_parameters(x1, y1, dx, dy, 0, 1, rect)
+                if visible is not None:
+                    u0, u1 = visible
+                    if not inside1:
+                        clipped.end_run()
+                        coords.append(x1 + u0 * dx)
+                        coords.append(y1 + u0 * dy)
+                    if inside2:
+                        coords.append(x2)
+                        coords.append(y2)
+                    else:
+                        coords.append(x1 + u1 * dx)
+                        coords.append(y1 + u1 * dy)
+                elif inside2:
+                    # entering right at x2, or through a point that is not finite
+                    clipped.end_run()
+                    coords.append(x2)
+                    coords.append(y2)
+                if not inside2:
+                    clipped.end_run()
+            x1 = x2
+            y1 = y2
+            inside1 = inside2
+    return clipped
@@ -0,0 +1,199 @@
+from math import atan2, asinh, sqrt, sinh, cosh, exp, log, cos, sin, pi
+
+from .clipping import clip_line, inside, viewport
+from .graph_canvas import GraphCanvasBase
+from .polyline import Polyline
+
+# largest distance, in pixels, allowed between a curve and the chords drawn for it
+TOLERANCE = 0.5
+MAX_STEP = pi / 8
+MAX_POINTS = 100000
+# native ellipses are only used while they are at most this many times the viewport
+NATIVE_LIMIT = 4
+
+
+def _visible_intervals(point, u0, u1, crossings, rect):
+    """splits [u0, u1] at the parameters where the curve crosses the edges of
+    rect and keeps the pieces that lie inside it"""
+    bounds = [u0, *sorted(u for u in crossings if u0 < u < u1), u1]
+    intervals = []
+    for lo, hi in zip(bounds, bounds[1:]):
+        if hi <= lo or not inside(*point((lo + hi) / 2), rect):
+            continue
+        if intervals and intervals[-1][1] == lo:
+            intervals[-1] = (intervals[-1][0], hi)
+        else:
+            intervals.append((lo, hi))
+    return intervals
+
+
+def _walk(point, speed, cross, u0, u1, tolerance):
+    """samples point from u0 to u1 with steps small enough for the chord error
+    to stay below tolerance, speed is |p'(u)| and cross |p'(u) x p''(u)|,
+    constant for the conics"""
+    points = Polyline()
+    points.append(*point(u0))
+    u = u0
+    while u < u1 and len(points) < MAX_POINTS:
+        step = MAX_STEP
+        if cross > 0:
+            # the normal acceleration is cross / speed and the sagitta of a
+            # step h is about that times h^2 / 8
+            step = min(step, sqrt(8 * tolerance * speed(u) / cross))
+        u = min(u + step, u1)
+        points.append(*point(u))
+    return points
+
+
+def _ellipse_crossings(cx, cy, a, b, rect):
+    crossings = []
+    for x in (rect[0], rect[2]):
+        dx = x - cx
+        if abs(dx) < a:
+            # atan2 keeps the angle exact even when the edge is a tiny part of a huge ellipse
+            t = atan2(sqrt((a - dx) * (a + dx)), dx)
+            crossings += [t, 2 * pi - t]
+    for y in (rect[1], rect[3]):
+        dy = y - cy
+        if abs(dy) < b:
+            c = sqrt((b - dy) * (b + dy))
+            crossings += [atan2(dy, c) % (2 * pi), atan2(dy, -c) % (2 * pi)]
+    return crossings
+
+
+def draw_ellipse(graph_canvas: GraphCanvasBase, center: tuple[float, float], a: float, b: float,
+                 tolerance: float = TOLERANCE):
+    """draws the ellipse with the given center and semi-axes, in plane coordinates"""
+    cx = graph_canvas.x_plane_to_x_canvas(center[0])
+    cy = graph_canvas.y_plane_to_y_canvas(center[1])
+    a = abs(graph_canvas.x_plane_to_x_canvas(center[0] + a) - cx)
+    b = abs(graph_canvas.y_plane_to_y_canvas(center[1] + b) - cy)
+    if a == 0 or b == 0:
+        return
+
+    rect = viewport(graph_canvas)
+    # coarser while the canvas draws a preview
+    tolerance *= graph_canvas.stride
+    if cx + a < rect[0] or cx - a > rect[2] or cy + b < rect[1] or cy - b > rect[3]:
+        return
+
+    if graph_canvas.native_ellipse \
+            and 2 * a <= NATIVE_LIMIT * (rect[2] - rect[0]) and 2 * b <= NATIVE_LIMIT * (rect[3] - rect[1]):
+        graph_canvas.ellipse((cx - a, cy - b), (cx + a, cy + b))
+        return
+
+    def point(t):
+        return cx + a * cos(t), cy + b * sin(t)
+
+    def speed(t):
+        return sqrt((a * sin(t))**2 + (b * cos(t))**2)
+
+    intervals = _visible_intervals(point, 0, 2 * pi, _ellipse_crossings(cx, cy, a, b, rect), rect)
+    if len(intervals) > 1 and intervals[0][0] == 0 and intervals[-1][1] == 2 * pi:
+        # the arc going through t = 0 was cut in two
+        intervals[0] = (intervals.pop()[0], intervals[0][1] + 2 * pi)
+    for t0, t1 in intervals:
+        graph_canvas.polyline(_walk(point, speed, a * b, t0, t1, tolerance))
+
+
+def _hyperbola_runs(cx, cy, a, b, rect, tolerance):
+    """runs of points of the hyperbola (x - cx)^2/a^2 - (y - cy)^2/b^2 = 1"""
+    lo = asinh((rect[1] - cy) / b)
+    hi = asinh((rect[3] - cy) / b)
+
+    def speed(u):
+        return sqrt((a * sinh(u))**2 + (b * cosh(u))**2)
+
+    runs = []
+    for side in (1, -1):
+        def point(u, side=side):
+            return cx + side * a * cosh(u), cy + b * sinh(u)
+
+        crossings = []
+        for x in (rect[0], rect[2]):
+            k = side * (x - cx)
+            if k > a:
+                w = asinh(sqrt((k - a) * (k + a)) / a)
+                crossings += [w, -w]
+        for u0, u1 in _visible_intervals(point, lo, hi, crossings, rect):
+            runs.append(_walk(point, speed, a * b, u0, u1, tolerance))
+    return runs
+
+
+def draw_hyperbola(graph_canvas: GraphCanvasBase, center: tuple[float, float], a: float, b: float,
+                   vertical: bool = False, tolerance: float = TOLERANCE):
+    """draws the hyperbola with the given center and semi-axes, in plane
+    coordinates, opening left and right or, when vertical, up and down"""
+    cx = graph_canvas.x_plane_to_x_canvas(center[0])
+    cy = graph_canvas.y_plane_to_y_canvas(center[1])
+    a = abs(graph_canvas.x_plane_to_x_canvas(center[0] + a) - cx)
+    b = abs(graph_canvas.y_plane_to_y_canvas(center[1] + b) - cy)
+    if a == 0 or b == 0:
+        return
+
+    rect = viewport(graph_canvas)
+    tolerance *= graph_canvas.stride
+    if not vertical:
+        runs = _hyperbola_runs(cx, cy, a, b, rect, tolerance)
+    else:
+        runs = _hyperbola_runs(cy, cx, b, a, (rect[1], rect[0], rect[3], rect[2]), tolerance)
+    for run in runs:
+        if vertical:
+            # computed with x and y exchanged
+            ys = run.coords[0::2]
+            run.coords[0::2] = run.coords[1::2]
+            run.coords[1::2] = ys
+        graph_canvas.polyline(run)
+
+
+def draw_rectangular_hyperbola(graph_canvas: GraphCanvasBase, center: tuple[float, float], k: float,
+                               tolerance: float = TOLERANCE):
+    """draws (y - center_y) = k / (x - center_x), in plane coordinates"""
+    cx = graph_canvas.x_plane_to_x_canvas(center[0])
+    cy = graph_canvas.y_plane_to_y_canvas(center[1])
+    x_scale = graph_canvas.x_plane_to_x_canvas(center[0] + 1) - cx
+    y_scale = graph_canvas.y_plane_to_y_canvas(center[1] + 1) - cy
+    # the same curve in canvas coordinates, (y - cy) (x - cx) = k
+    k *= x_scale * y_scale
+    if k == 0:
+        return
+
+    rect = viewport(graph_canvas)
+    tolerance *= graph_canvas.stride
+    a = sqrt(abs(k))
+    b = k / a
+    max_dx = max(abs(rect[0] - cx), abs(rect[2] - cx))
+    max_dy = max(abs(rect[1] - cy), abs(rect[3] - cy))
+    if max_dx == 0 or max_dy == 0:
+        return
+    lo = -log(max_dy / abs(b))
+    hi = log(max_dx / a)
+
+    def speed(u):
+        return sqrt((a * exp(u))**2 + (b * exp(-u))**2)
+
+    for side in (1, -1):
+        def point(u, side=side):
+            return cx + side * a * exp(u), cy + side * b * exp(-u)
+
+        crossings = []
+        for x in (rect[0], rect[2]):
+            if side * (x - cx) > 0:
+                crossings.append(log(side * (x - cx) / a))
+        for y in (rect[1], rect[3]):
+            if side * (y - cy) / b > 0:
+                crossings.append(-log(side * (y - cy) / b))
+        for u0, u1 in _visible_intervals(point, lo, hi, crossings, rect):
+            graph_canvas.polyline(_walk(point, speed, 2 * abs(k), u0, u1, tolerance))
+
+
+def draw_line(graph_canvas: GraphCanvasBase, point: tuple[float, float], direction: tuple[float, float]):
+    """draws the part of the infinite line through point with the given
+    direction, in plane coordinates, that crosses the viewport"""
+    px = graph_canvas.x_plane_to_x_canvas(point[0])
+    py = graph_canvas.y_plane_to_y_canvas(point[1])
+    dx = graph_canvas.x_plane_to_x_canvas(point[0] + direction[0]) - px
+    dy = graph_canvas.y_plane_to_y_canvas(point[1] + direction[1]) - py
+    segment = clip_line((px, py), (dx, dy), viewport(graph_canvas))
+    if segment is not None:
+        graph_canvas.line(*segment)
@@ -0,0 +1,304 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from math import nan
+import hashlib
+import mmap
+import os
+import tempfile
+
+from .clipping import clip_polyline, viewport
+from .polyline import Polyline
+
+BINARY_EXTENSIONS = (".bin", ".f64", ".dat")
+
+# the first level of the pyramid groups PYRAMID_BASE samples per bucket, every
+# following level groups PYRAMID_FACTOR buckets of the previous one
+PYRAMID_BASE = 16
+PYRAMID_FACTOR = 4
+
+CSV_CHUNK_SIZE = 65536
+CACHE_PREFIX = "tkgrapher-"
+# the converted CSV files used least recently are deleted past this total size
+MAX_CACHE_BYTES = 1 << 30
+# CSV rows converted, or pyramid buckets built, between two yields of prepare_iter
+PREPARE_ROWS = 2048
+
+
+def _bucket_extremes(values: list, size: int, extreme, out: array):
+    """appends extreme, min or max, of each group of size values to out; nan
+    is skipped, min and max would return it or not depending on where it is,
+    and only a group of nan gives nan"""
+    total = sum(values)
+    if total == total:
+        out.extend([extreme(values[i:i + size]) for i in range(0, len(values), size)])
+        return
+    for i in range(0, len(values), size):
+        bucket = [v for v in values[i:i + size] if v == v]
+        out.append(extreme(bucket) if bucket else nan)
+
+
+def _evict_cache(keep: str):
+    """deletes the converted files used least recently, except keep, until they
+    take at most MAX_CACHE_BYTES"""
+    directory = tempfile.gettempdir()
+    files = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if not name.startswith(CACHE_PREFIX) or not name.endswith(".f64") or path == keep:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files) + os.path.getsize(keep)
+    for _, size, path in sorted(files):
+        if total <= MAX_CACHE_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            # still mapped by another series on Windows
+            continue
+        total -= size
+
+
+class MinMaxLevel:
+    def __init__(self, bucket_size: int, mins: array, maxs: array):
+        self.bucket_size = bucket_size
+        self.mins = mins
+        self.maxs = maxs
+
+    def __len__(self):
+        return len(self.mins)
+
+
+class MappedSeries:
+    """A series of (x, y) samples sorted by x, read through a memory map.
+
+    Binary files contain native float64 (x, y) pairs, CSV files contain one
+    'x, y' or 'y' row per line and are converted once to a binary cache file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__file = None
+        self.__mmap: mmap.mmap | None = None
+        self.__view: memoryview | None = None
+        self.__xs: memoryview | None = None
+        self.__ys: memoryview | None = None
+        self.__levels: list[MinMaxLevel] | None = None
+        self.__preparing = None
+
+    def __len__(self):
+        return len(self.xs)
+
+    @property
+    def xs(self) -> memoryview:
+        self.__prepare_now()
+        return self.__xs
+
+    @property
+    def ys(self) -> memoryview:
+        self.__prepare_now()
+        return self.__ys
+
+    @property
+    def levels(self) -> list[MinMaxLevel]:
+        self.__prepare_now()
+        return self.__levels
+
+    def prepare_iter(self):
+        """converts a CSV file, maps the file and builds the pyramid a slice at a
+        time, yielding in between; when abandoned it is resumed where it
+        stopped by the next call"""
+        if self.__preparing is None:
+            self.__preparing = self.__prepare()
+        try:
+            # not "yield from", closing this generator must not close the shared one
+            for _ in self.__preparing:
+                yield
+        except Exception:
+            self.__preparing = None
+            raise
+
+    def __prepare_now(self):
+        if self.__levels is None:
+            for _ in self.prepare_iter():
+                pass
+
+    def __prepare(self):
+        path = self.path
+        if not path.lower().endswith(BINARY_EXTENSIONS):
+            path = self.__cache_path()
+            if os.path.exists(path):
+                # marks it as recently used
+                os.utime(path)
+            else:
+                yield from self.__convert_csv(path)
+                _evict_cache(path)
+        self.__map(path)
+        self.__levels = yield from self.__build_levels()
+
+    def __cache_path(self):
+        stat = os.stat(self.path)
+        key = f"{os.path.abspath(self.path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        name = CACHE_PREFIX + hashlib.sha1(key.encode()).hexdigest() + ".f64"
+        return os.path.join(tempfile.gettempdir(), name)
+
+    def __convert_csv(self, dest):
+        tmp_dest = dest + ".tmp"
+        try:
+            with open(self.path, "rb") as src, open(tmp_dest, "wb") as out:
+                if os.fstat(src.fileno()).st_size == 0:
+                    lines = iter(())
+                else:
+                    lines = iter(mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ).readline, b"")
+                chunk = array("d")
+                row = 0
+                for line in lines:
+                    parts = line.replace(b",", b" ").replace(b";", b" ").split()
+                    try:
+                        values = [float(p) for p in parts]
+                    except ValueError:
+                        continue
+                    if len(values) == 1:
+                        chunk.append(row)
+                        chunk.append(values[0])
+                    elif len(values) >= 2:
+                        chunk.append(values[0])
+                        chunk.append(values[1])
+                    else:
+                        continue
+                    row += 1
+                    if row % PREPARE_ROWS == 0:
+                        yield
+                    if len(chunk) >= CSV_CHUNK_SIZE:
+                        chunk.tofile(out)
+                        chunk = array("d")
+                chunk.tofile(out)
+            os.replace(tmp_dest, dest)
+        finally:
+            # the conversion failed or was abandoned
+            if os.path.exists(tmp_dest):
+                os.remove(tmp_dest)
+
+    def __map(self, path):
+        self.__file = open(path, "rb")
+        size = os.fstat(self.__file.fileno()).st_size
+        pair_size = 2 * array("d").itemsize
+        if size < pair_size:
+            self.__xs = self.__ys = memoryview(array("d"))
+            return
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__mmap)[:size - size % pair_size].cast("d")
+        self.__xs = self.__view[0::2]
+        self.__ys = self.__view[1::2]
+
+    def __build_levels(self):
+        """the levels of the pyramid, returned by the generator"""
+        ys = self.__ys
+        n = len(ys)
+        if n == 0:
+            return []
+
+        mins = array("d")
+        maxs = array("d")
+        chunk_size = PYRAMID_BASE * PREPARE_ROWS
+        for start in range(0, n, chunk_size):
+            chunk = ys[start:start + chunk_size].tolist()
+            _bucket_extremes(chunk, PYRAMID_BASE, min, mins)
+            _bucket_extremes(chunk, PYRAMID_BASE, max, maxs)
+            yield
+        levels = [MinMaxLevel(PYRAMID_BASE, mins, maxs)]
+
+        while len(levels[-1]) > 1:
+            prev = levels[-1]
+            mins = array("d")
+            maxs = array("d")
+            chunk_size = PYRAMID_FACTOR * PREPARE_ROWS
+            for start in range(0, len(prev), chunk_size):
+                _bucket_extremes(prev.mins[start:start + chunk_size].tolist(), PYRAMID_FACTOR, min, mins)
+                _bucket_extremes(prev.maxs[start:start + chunk_size].tolist(), PYRAMID_FACTOR, max, maxs)
+                yield
+            levels.append(MinMaxLevel(prev.bucket_size * PYRAMID_FACTOR, mins, maxs))
+        return levels
+
+    def index_range(self, x_min: float, x_max: float) -> tuple[int, int]:
+        """indices of the samples inside [x_min, x_max] plus one sample on each side"""
+        xs = self.xs
+        start = max(bisect_left(xs, x_min) - 1, 0)
+        stop = min(bisect_right(xs, x_max) + 1, len(xs))
+        return start, stop
+
+    def decimate(self, x_min: float, x_max: float, columns: int):
+        """yields (x, min_y, max_y) with at most PYRAMID_FACTOR entries per column,
+        or one entry per sample if there are fewer than PYRAMID_BASE per column"""
+        start, stop = self.index_range(x_min, x_max)
+        samples_per_column = (stop - start) / max(columns, 1)
+        if samples_per_column < PYRAMID_BASE:
+            xs = self.xs
+            ys = self.ys
+            for i in range(start, stop):
+                y = ys[i]
+                yield xs[i], y, y
+            return
+
+        level = None
+        for lvl in self.levels:
+            if lvl.bucket_size > samples_per_column:
+                break
+            level = lvl
+
+        xs = self.xs
+        size = level.bucket_size
+        for bucket in range(start // size, min((stop - 1) // size + 1, len(level))):
+            yield xs[bucket * size], level.mins[bucket], level.maxs[bucket]
+
+    def close(self):
+        if self.__preparing is not None:
+            # first, it holds views of the memory map
+            self.__preparing.close()
+            self.__preparing = None
+        self.__xs = self.__ys = None
+        if self.__view is not None:
+            self.__view.release()
+            self.__view = None
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        self.__levels = None
+
+
+def column_points(graph_canvas, samples) -> Polyline:
+    """turns (x, min_y, max_y) samples into a polyline with at most two points
+    for each column of the canvas, clipped to the viewport"""
+    points = Polyline()
+
+    def add_column():
+        points.append(column, graph_canvas.y_plane_to_y_canvas(col_min))
+        if col_max != col_min:
+            points.append(column, graph_canvas.y_plane_to_y_canvas(col_max))
+
+    column = None
+    col_min = col_max = 0
+    for x, y_lo, y_hi in samples:
+        x_canvas = round(graph_canvas.x_plane_to_x_canvas(x))
+        if x_canvas != column:
+            if column is not None:
+                add_column()
+            column = x_canvas
+            col_min = y_lo
+            col_max = y_hi
+        else:
+            col_min = min(col_min, y_lo)
+            col_max = max(col_max, y_hi)
+    if column is not None:
+        add_column()
+
+    if len(points) == 1:
+        points.append(*points.last())
+    return clip_polyline(points, viewport(graph_canvas))
@@ -0,0 +1,150 @@
+import re
+
+from .function_parser import FuncAST, ONE_ARG_FUNCIONS, BASE_ARG_FUNCTIONS
+from .stats import STATS
+
+# "g(x) = ..." at the start of a function input defines g
+DEFINITION_HEAD = re.compile(r"\s*([A-Za-z]+)\s*\(\s*([A-Za-z]+)\s*\)\s*=")
+RESERVED_NAMES = {*ONE_ARG_FUNCIONS, *BASE_ARG_FUNCTIONS, "pi", "e", "i", "sum", "prod"}
+# the memoized values are forgotten past this many samples
+MEMO_LIMIT = 1_000_000
+
+_MISSING = object()
+
+
+class Definitions:
+    """Named functions of one variable, defined by the function inputs and
+    callable from all of them.
+
+    Each definition knows the names it calls, one that would end up calling
+    itself is refused. The values computed are memoized per sample, so the
+    functions called by several others, or drawn themselves, are evaluated
+    once per sample; redefining a function forgets its values and those of
+    the functions depending on it."""
+
+    def __init__(self):
+        # name -> (ast, owner)
+        self.__definitions: dict[str, tuple[FuncAST, object]] = {}
+        self.__versions: dict[str, int] = {}
+        self.__next_version = 1
+        self.__changed: set[str] = set()
+        self.__memo: dict[str, dict] = {}
+        self.__memo_size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__definitions
+
+    def define(self, name: str, ast: FuncAST, owner) -> str | None:
+        """defines name for owner, returns why it cannot be defined, if so"""
+        if name in RESERVED_NAMES:
+            return f"{name} is a predefined name"
+        current = self.__definitions.get(name)
+        if current is not None and current[1] is not owner:
+            return f"{name} is already defined"
+        if name in self.__reached(ast.calls):
+            return f"{name} depends on itself"
+        self.__definitions[name] = (ast, owner)
+        self.__touch(name)
+        return None
+
+    def undefine(self, name: str, owner):
+        current = self.__definitions.get(name)
+        if current is not None and current[1] is owner:
+            del self.__definitions[name]
+            self.__touch(name)
+
+    def __touch(self, name):
+        self.__versions[name] = self.__next_version
+        self.__next_version += 1
+        self.__changed.add(name)
+        for dependent in self.dependents({name}):
+            self.__memo_size -= len(self.__memo.pop(dependent, ()))
+
+    def __reached(self, names) -> set[str]:
+        """names and the names they call, directly or not"""
+        reached = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in reached:
+                continue
+            reached.add(name)
+            definition = self.__definitions.get(name)
+            if definition is not None:
+                pending += definition[0].calls
+        return reached
+
+    def dependents(self, names) -> set[str]:
+        """names and the names calling them, directly or not"""
+        result = set(names)
+        grown = True
+        while grown:
+            grown = False
+            for name, (ast, _) in self.__definitions.items():
+                if name not in result and ast.calls & result:
+                    result.add(name)
+                    grown = True
+        return result
+
+    def version(self, names) -> tuple:
+        """identifies the current definitions of names and of the functions
+        they call, for cache keys"""
+        return tuple(sorted((name, self.__versions.get(name, 0)) for name in self.__reached(names)))
+
+    def take_changes(self) -> set[str]:
+        """the names defined, redefined or removed since the last call"""
+        changed = self.__changed
+        self.__changed = set()
+        return changed
+
+    def clear_memo(self):
+        self.__memo.clear()
+        self.__memo_size = 0
+
+    def __remembered(self, name) -> dict:
+        if self.__memo_size > MEMO_LIMIT:
+            self.clear_memo()
+        return self.__memo.setdefault(name, {})
+
+    def call(self, name: str, x):
+        """the value of name at x, None where it is not defined"""
+        definition = self.__definitions.get(name)
+        if definition is None:
+            return None
+        memo = self.__remembered(name)
+        value = memo.get(x, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        STATS.evaluations += 1
+        value = definition[0].compile()(x)
+        memo[x] = value
+        self.__memo_size += 1
+        return value
+
+    def evaluate_many(self, name: str, xs) -> list:
+        """the values of name at xs, sharing the memoized values with call"""
+        definition = self.__definitions.get(name)
+        if definition is None:
+            return [None] * len(xs)
+        memo = self.__remembered(name)
+        func = definition[0].compile()
+        results = []
+        misses = 0
+        for x in xs:
+            value = memo.get(x, _MISSING)
+            if value is _MISSING:
+                value = memo[x] = func(x)
+                misses += 1
+            results.append(value)
+        self.hits += len(results) - misses
+        self.misses += misses
+        self.__memo_size += misses
+        STATS.evaluations += misses
+        return results
+
+
+DEFINITIONS = Definitions()
@@ -0,0 +1,72 @@
+from array import array
+from itertools import islice
+from math import isfinite, nan
+
+CHUNK_SIZE = 65536
+
+
+def range_chunks(start: float, stop: float, step: float, chunk_size: int = CHUNK_SIZE):
+    """yields lists of start + i * step up to stop included, computed from i so
+    that the rounding errors do not add up"""
+    if step == 0 or (stop - start) / step < 0:
+        return
+    count = int((stop - start) / step + 1e-9) + 1
+    for first in range(0, count, chunk_size):
+        yield [start + i * step for i in range(first, min(first + chunk_size, count))]
+
+
+def value_chunks(values, chunk_size: int = CHUNK_SIZE):
+    """groups an iterable of x values in lists of chunk_size"""
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_chunks(evaluate_many, chunks):
+    """yields (xs, ys) for each chunk of xs, ys holds nan where the function is
+    not defined; with a parsed expression pass FuncAST.evaluate_many, which
+    runs the compiled expression"""
+    for xs in chunks:
+        ys = [y if isinstance(y, (float, int)) and isfinite(y) else nan for y in evaluate_many(xs)]
+        yield xs, ys
+
+
+def grapher_evaluator(grapher):
+    """evaluates the function of a FunctionGraphX or FunctionGraphY grapher with
+    the current values of its parameters"""
+    kwargs = grapher._kwargs()
+    return lambda xs: grapher.evaluate_many(xs, kwargs)
+
+
+def write_csv(file, rows, header: bool = True) -> int:
+    """writes 'x,y' lines to the text file, leaving y empty where undefined;
+    returns the number of rows"""
+    if header:
+        file.write("x,y\n")
+    count = 0
+    for xs, ys in rows:
+        # repr is the shortest text that reads back as the same float
+        ys_text = map(repr, ys)
+        if any(y != y for y in ys):
+            ys_text = (text if text != "nan" else "" for text in ys_text)
+        file.write("\n".join(map(",".join, zip(map(repr, xs), ys_text))))
+        file.write("\n")
+        count += len(xs)
+    return count
+
+
+def write_binary(file, rows) -> int:
+    """writes native float64 (x, y) pairs to the binary file, the format read by
+    MappedSeries, with nan where undefined; returns the number of rows"""
+    count = 0
+    for xs, ys in rows:
+        pairs = array("d", bytes(16 * len(xs)))
+        pairs[0::2] = array("d", xs)
+        pairs[1::2] = array("d", ys)
+        file.write(memoryview(pairs).cast("B"))
+        count += len(xs)
+    return count
+
@@ -11,20 +11,39 @@ implied_mul: power [power]
 signed_power: signed_value ['^' value]
 power: value ['^' value]
 signed_value: ('+' | '-')? power
-value: literal | '(' signed_expr ')'
-literal: num_literal | 'pi' | 'e' | 'x' | func_call
+value: literal | '(' signed_expr ')' | piecewise
+piecewise: '{' case [';' case] [';' signed_expr] '}'
+case: comparison ':' signed_expr
+comparison: signed_expr (comparison_op signed_expr)+
+comparison_op: '<' | '<=' | '>' | '>=' | '=' | '!='
+literal: num_literal | 'pi' | 'e' | 'x' | variable | 'i' | func_call | user_func_call | series
+user_func_call: user_func_name '(' signed_expr ')'
+series: ('sum' | 'prod') '_' '(' index_name '=' signed_expr '..' signed_expr ')' call_argument
 base_arg_func_call: base_arg_func_name '_' value call_argument
 one_arg_func_call: one_arg_func_name call_argument
 base_arg_func_name: 'rt' | 'log'
 call_argument: '(' signed_expr ')' | implied_mul
 one_arg_func_name: 'sin' | 'cos' | 'tan' | 'arcsin' | 'arccos' | 'arctan' | 'sqrt' | 'ln'
 num_literal: (0-9)+ ['.' (0-9)+]
+
+The cases of a piecewise expression are tried in order, only the value of
+the first one whose condition holds is evaluated, the last value without a
+condition is used when none does. Comparisons can be chained, as in
+'0 < x <= 1'. 'i' is the imaginary unit in complex mode and the variables
+are those given to parse_func besides the main one. The user functions are
+the other names called with parentheses, looked up when evaluating in the
+table given to parse_func. In a series the index is a variable of the call
+argument, taking the integer values from the first bound to the second.
 """
 
 from abc import ABC, abstractmethod
 from enum import Enum, auto
 from string import ascii_letters
+import cmath
 import math
+import operator
+
+from .stats import STATS
 
 ONE_ARG_FUNCIONS = {
     'sin': math.sin,
@@ -43,6 +62,128 @@ BASE_ARG_FUNCTIONS = {
 }
 
 
+# used in complex mode, where 'i' is the imaginary unit
+COMPLEX_ONE_ARG_FUNCTIONS = {
+    'sin': cmath.sin,
+    'cos': cmath.cos,
+    'tan': cmath.tan,
+    'arcsin': cmath.asin,
+    'arccos': cmath.acos,
+    'arctan': cmath.atan,
+    'sqrt': cmath.sqrt,
+    'ln': cmath.log
+}
+
+
+def _complex_log(value, base):
+    # cmath.log(0, base) gives a nan instead of failing like cmath.log(0)
+    return cmath.log(value) / cmath.log(base)
+
+
+COMPLEX_BASE_ARG_FUNCTIONS = {
+    'rt': lambda num, index: num ** (1 / index),
+    'log': _complex_log
+}
+
+
+def _pow(base, exponent):
+    if base == exponent == 0:
+        raise ZeroDivisionError("0^0")
+    return math.pow(base, exponent)
+
+
+def _complex_pow(base, exponent):
+    if base == exponent == 0:
+        raise ZeroDivisionError("0^0")
+    return complex(base) ** exponent
+
+
+# new terms of the series computed per redraw, the callers drawing set it with
+# PartialSums.set_budget; the series past it are undefined until the next one
+SERIES_TERM_BUDGET = 2_000_000
+# the partial sums are forgotten past this many
+PARTIAL_SUMS_LIMIT = 2_000_000
+
+
+class PartialSums:
+    """Keeps the partial sums, or products, of the series evaluated at each
+    point, so that raising the upper bound only computes the new terms and
+    lowering it computes none."""
+
+    def __init__(self):
+        self.__partials: dict[tuple, list] = {}
+        self.__size = 0
+        # terms computed so far
+        self.terms = 0
+        # terms that can still be computed, None for no limit
+        self.remaining: int | None = None
+        # series left undefined since set_budget because the budget ran out
+        self.refused = 0
+
+    def clear(self):
+        self.__partials.clear()
+        self.__size = 0
+
+    def set_budget(self, terms: int | None):
+        self.remaining = terms
+        self.refused = 0
+
+    def evaluate(self, product: bool, source: str | None, term, lower, upper, point: tuple):
+        """the sum or product of term(k) for k from lower to upper, source
+        identifies term and point the values it depends on, with a source of
+        None nothing is kept"""
+        if lower != int(lower) or upper != int(upper):
+            raise ValueError("the bounds of a series must be integers")
+        lower = int(lower)
+        count = int(upper) - lower + 1
+        if count <= 0:
+            return 1 if product else 0
+
+        partials = None
+        if source is not None:
+            key = (product, source, lower, point)
+            partials = self.__partials.get(key)
+            if partials is None:
+                if self.__size > PARTIAL_SUMS_LIMIT:
+                    self.clear()
+                partials = self.__partials[key] = []
+        else:
+            partials = []
+        size = len(partials)
+        end = count if self.remaining is None else min(count, size + self.remaining)
+        total = partials[-1] if partials else (1 if product else 0)
+        try:
+            for k in range(lower + size, lower + end):
+                value = term(k)
+                total = total * value if product else total + value
+                partials.append(total)
+        finally:
+            computed = len(partials) - size
+            self.terms += computed
+            if self.remaining is not None:
+                self.remaining -= computed
+            if source is not None:
+                self.__size += computed
+        if end < count:
+            # the terms computed are kept, the next redraw continues from them
+            self.refused += 1
+            raise ValueError("out of series terms for this redraw")
+        return partials[count - 1]
+
+
+PARTIAL_SUMS = PartialSums()
+
+COMPILE_NAMESPACE = {
+    '_pow': _pow,
+    '_series': PARTIAL_SUMS.evaluate,
+    '_c_pow': _complex_pow,
+    **{f"_f_{name}": func for name, func in ONE_ARG_FUNCIONS.items()},
+    **{f"_b_{name}": func for name, func in BASE_ARG_FUNCTIONS.items()},
+    **{f"_c_f_{name}": func for name, func in COMPLEX_ONE_ARG_FUNCTIONS.items()},
+    **{f"_c_b_{name}": func for name, func in COMPLEX_BASE_ARG_FUNCTIONS.items()}
+}
+
+
 class ParseFuncError:
     def __init__(self, msg):
         self.msg = msg
@@ -60,6 +201,17 @@ class TokenType(Enum):
     OPEN_PAREN = auto()
     CLOSE_PAREN = auto()
     UNDERSCORE = auto()
+    DOTDOT = auto()
+    LESS = auto()
+    LESS_EQUAL = auto()
+    GREATER = auto()
+    GREATER_EQUAL = auto()
+    EQUAL = auto()
+    NOT_EQUAL = auto()
+    OPEN_BRACE = auto()
+    CLOSE_BRACE = auto()
+    COLON = auto()
+    SEMICOLON = auto()
     NUMBER = auto()
     IDENT = auto()
 
@@ -79,7 +231,21 @@ class Token:
         '^': TokenType.CARET,
         '(': TokenType.OPEN_PAREN,
         ')': TokenType.CLOSE_PAREN,
-        '_': TokenType.UNDERSCORE
+        '_': TokenType.UNDERSCORE,
+        '..': TokenType.DOTDOT,
+        '<': TokenType.LESS,
+        '<=': TokenType.LESS_EQUAL,
+        '≤': TokenType.LESS_EQUAL,
+        '>': TokenType.GREATER,
+        '>=': TokenType.GREATER_EQUAL,
+        '≥': TokenType.GREATER_EQUAL,
+        '=': TokenType.EQUAL,
+        '!=': TokenType.NOT_EQUAL,
+        '≠': TokenType.NOT_EQUAL,
+        '{': TokenType.OPEN_BRACE,
+        '}': TokenType.CLOSE_BRACE,
+        ':': TokenType.COLON,
+        ';': TokenType.SEMICOLON
     }
 
     symbol_tok_to_str = {
@@ -91,6 +257,17 @@ class Token:
         TokenType.OPEN_PAREN: '(',
         TokenType.CLOSE_PAREN: ')',
         TokenType.UNDERSCORE: '_',
+        TokenType.DOTDOT: '..',
+        TokenType.LESS: '<',
+        TokenType.LESS_EQUAL: '<=',
+        TokenType.GREATER: '>',
+        TokenType.GREATER_EQUAL: '>=',
+        TokenType.EQUAL: '=',
+        TokenType.NOT_EQUAL: '!=',
+        TokenType.OPEN_BRACE: '{',
+        TokenType.CLOSE_BRACE: '}',
+        TokenType.COLON: ':',
+        TokenType.SEMICOLON: ';',
         TokenType.EXPR_END: 'Expression end'
     }
 
@@ -130,6 +307,17 @@ class Token:
         return Token(Token.symbol_tok_from_str[symbol_str])
 
 
+# python operator and function of each comparison
+COMPARISON_OPERATORS = {
+    TokenType.LESS: ('<', operator.lt),
+    TokenType.LESS_EQUAL: ('<=', operator.le),
+    TokenType.GREATER: ('>', operator.gt),
+    TokenType.GREATER_EQUAL: ('>=', operator.ge),
+    TokenType.EQUAL: ('==', operator.eq),
+    TokenType.NOT_EQUAL: ('!=', operator.ne)
+}
+
+
 class Lexer:
     def __init__(self, text: str):
         self.text = text
@@ -174,7 +362,8 @@ class Lexer:
                 num_str += self.c
             self.advance()
 
-        if self.c != '.':
+        # '1..5' is a range, not a decimal point
+        if self.c != '.' or self.text[self.idx + 1:self.idx + 2] == '.':
             return Token(TokenType.NUMBER, float(num_str))
         self.advance()
 
@@ -195,6 +384,12 @@ class Lexer:
         return Token(TokenType.IDENT, name)
 
     def symbol_token(self) -> Token | ParseFuncError:
+        # the two character operators first, '<=' is not '<' followed by '='
+        token = Token.from_str(self.text[self.idx:self.idx + 2])
+        if token is not None:
+            self.advance()
+            self.advance()
+            return token
         token = Token.from_str(self.c)
         if token is None:
             return ParseFuncError(f"unexpected character '{self.c!r}'")
@@ -203,51 +398,114 @@ class Lexer:
 
 
 class FuncAST(ABC):
+    # the variables other than the main one, their values follow the main
+    # variable in the arguments of evaluate and of the compiled function
+    variables: tuple[str, ...] = ()
+    # the table of the user functions, with the names of those called
+    functions = None
+    calls: frozenset[str] = frozenset()
+
+    @abstractmethod
+    def evaluate(self, x: float, *args: float) -> float | None:
+        pass
+
     @abstractmethod
-    def evaluate(self, x: float) -> float | None:
+    def to_source(self) -> str:
+        """returns a python expression equivalent to the node, where the main
+        variable is 'x'; invalid operations raise instead of returning None"""
         pass
 
+    def compile(self):
+        """returns a python function with the same result as evaluate"""
+        compiled = self.__dict__.get("_compiled")
+        if compiled is not None:
+            return compiled
+        arguments = "".join(f", _v_{name}" for name in self.variables)
+        source = (
+            f"def _compiled(x{arguments}):\n"
+            "    try:\n"
+            f"        return {self.to_source()}\n"
+            "    except (ArithmeticError, ValueError, TypeError):\n"
+            "        return None\n"
+        )
+        namespace = dict(COMPILE_NAMESPACE)
+        if self.functions is not None:
+            namespace["_u"] = self.functions.call
+        exec(source, namespace)
+        self._compiled = namespace["_compiled"]
+        return self._compiled
+
+    def evaluate_many(self, xs, *columns) -> list[float | None]:
+        """evaluates the function on a list of values of the main variable and,
+        for each other variable, a list of its values"""
+        func = self.compile()
+        results = list(map(func, xs, *columns))
+        STATS.evaluations += len(results)
+        return results
+
     def __repr__(self):
         attrs = list(self.__dict__.keys())
-        attrs = [f"{attr}: {getattr(self, attr)}" for attr in attrs if not attr.startswith("__")]
+        attrs = [f"{attr}: {getattr(self, attr)}" for attr in attrs if not attr.startswith("_")]
         return self.__class__.__name__ + "(" + ", ".join(attrs) + ")"
 
 
 class XNode(FuncAST):
-    def evaluate(self, x: float) -> float | None:
+    def evaluate(self, x: float, *args: float) -> float | None:
         return x
 
+    def to_source(self) -> str:
+        return "x"
+
+
+class VarNode(FuncAST):
+    def __init__(self, name: str, index: int):
+        self.name = name
+        self.index = index
+
+    def evaluate(self, x: float, *args: float) -> float | None:
+        return args[self.index]
+
+    def to_source(self) -> str:
+        return f"_v_{self.name}"
+
 
 class ValueNode(FuncAST):
     def __init__(self, value: float):
         self.value = value
 
-    def evaluate(self, x: float) -> float | None:
+    def evaluate(self, x: float, *args: float) -> float | None:
         return self.value
 
+    def to_source(self) -> str:
+        return repr(self.value)
+
 
 class NegativeNode(FuncAST):
     def __init__(self, value_node: FuncAST):
         self.value_node = value_node
 
-    def evaluate(self, x: float) -> float | None:
-        result = self.value_node.evaluate(x)
+    def evaluate(self, x: float, *args: float) -> float | None:
+        result = self.value_node.evaluate(x, *args)
         if result is None:
             return None
         return -result
 
+    def to_source(self) -> str:
+        return f"(-{self.value_node.to_source()})"
+
 
 class BinOpNode(FuncAST):
-    def __init__(self, l_node: FuncAST, r_node: FuncAST, op: TokenType):
+    def __init__(self, l_node: FuncAST, r_node: FuncAST, op: TokenType, complex_mode: bool = False):
         self.l_node = l_node
         self.r_node = r_node
         self.op = op
+        self.complex_mode = complex_mode
 
-    def evaluate(self, x: float) -> float | None:
-        l_value = self.l_node.evaluate(x)
+    def evaluate(self, x: float, *args: float) -> float | None:
+        l_value = self.l_node.evaluate(x, *args)
         if l_value is None:
             return None
-        r_value = self.r_node.evaluate(x)
+        r_value = self.r_node.evaluate(x, *args)
         if r_value is None:
             return None
 
@@ -264,64 +522,208 @@ class BinOpNode(FuncAST):
         elif self.op == TokenType.CARET:
             if l_value == r_value == 0:
                 return None
-            result = math.pow(l_value, r_value)
-            return result
+            try:
+                return _complex_pow(l_value, r_value) if self.complex_mode else math.pow(l_value, r_value)
+            except (ArithmeticError, ValueError):
+                return None
         else:
             raise NotImplementedError(f"not implemented op {TokenType.to_str(self.op)!r}")
 
+    def to_source(self) -> str:
+        l_source = self.l_node.to_source()
+        r_source = self.r_node.to_source()
+        if self.op == TokenType.CARET:
+            return f"{'_c_pow' if self.complex_mode else '_pow'}({l_source}, {r_source})"
+        if self.op not in (TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH):
+            raise NotImplementedError(f"not implemented op {TokenType.to_str(self.op)!r}")
+        return f"({l_source} {TokenType.to_str(self.op)} {r_source})"
+
 
 class OneArgCallNode(FuncAST):
-    def __init__(self, value_node: FuncAST, func: str):
+    def __init__(self, value_node: FuncAST, func: str, complex_mode: bool = False):
         self.value_node = value_node
         self.func = func
+        self.complex_mode = complex_mode
 
-    def evaluate(self, x: float) -> float | None:
-        value = self.value_node.evaluate(x)
+    def evaluate(self, x: float, *args: float) -> float | None:
+        value = self.value_node.evaluate(x, *args)
         if value is None:
             return None
 
-        func = ONE_ARG_FUNCIONS.get(self.func)
+        func = (COMPLEX_ONE_ARG_FUNCTIONS if self.complex_mode else ONE_ARG_FUNCIONS).get(self.func)
         if func is None:
             raise NotImplementedError(f"function {self.func!r} not implemented")
         try:
             return func(value)
-        except (ZeroDivisionError, ValueError):
+        except (ArithmeticError, ValueError):
             return None
         except Exception as e:
             print(f"unhandled exception {e}")
             return None
 
+    def to_source(self) -> str:
+        if self.func not in ONE_ARG_FUNCIONS:
+            raise NotImplementedError(f"function {self.func!r} not implemented")
+        prefix = "_c_f_" if self.complex_mode else "_f_"
+        return f"{prefix}{self.func}({self.value_node.to_source()})"
+
 
 class BaseArgCallNode(FuncAST):
-    def __init__(self, value_node: FuncAST, base_node: FuncAST, func: str):
+    def __init__(self, value_node: FuncAST, base_node: FuncAST, func: str, complex_mode: bool = False):
         self.value_node = value_node
         self.base_node = base_node
         self.func = func
+        self.complex_mode = complex_mode
 
-    def evaluate(self, x: float) -> float | None:
-        value = self.value_node.evaluate(x)
+    def evaluate(self, x: float, *args: float) -> float | None:
+        value = self.value_node.evaluate(x, *args)
         if value is None:
             return None
-        base = self.base_node.evaluate(x)
+        base = self.base_node.evaluate(x, *args)
         if base is None:
             return None
 
-        func = BASE_ARG_FUNCTIONS.get(self.func)
+        func = (COMPLEX_BASE_ARG_FUNCTIONS if self.complex_mode else BASE_ARG_FUNCTIONS).get(self.func)
         if func is None:
             raise NotImplementedError(f"function {self.func!r} not implemented")
         try:
             return func(value, base)
-        except (ZeroDivisionError, ValueError):
+        except (ArithmeticError, ValueError):
             return None
         except Exception as e:
             print(f"unhandled exception {e}")
             return None
 
+    def to_source(self) -> str:
+        if self.func not in BASE_ARG_FUNCTIONS:
+            raise NotImplementedError(f"function {self.func!r} not implemented")
+        prefix = "_c_b_" if self.complex_mode else "_b_"
+        return f"{prefix}{self.func}({self.value_node.to_source()}, {self.base_node.to_source()})"
+
+
+class UserCallNode(FuncAST):
+    def __init__(self, value_node: FuncAST, name: str, functions):
+        self.value_node = value_node
+        self.name = name
+        self.functions = functions
+
+    def evaluate(self, x: float, *args: float) -> float | None:
+        value = self.value_node.evaluate(x, *args)
+        if value is None:
+            return None
+        return self.functions.call(self.name, value)
+
+    def to_source(self) -> str:
+        return f"_u({self.name!r}, {self.value_node.to_source()})"
+
+
+class SeriesNode(FuncAST):
+    def __init__(self, body_node: FuncAST, lower_node: FuncAST, upper_node: FuncAST, index: str,
+                 scope: tuple[str, ...], product: bool, cacheable: bool):
+        self.body_node = body_node
+        self.lower_node = lower_node
+        self.upper_node = upper_node
+        self.index = index
+        # the variables other than the main one usable in the bounds, the
+        # body also gets the index after them
+        self.scope = scope
+        self.product = product
+        # the partial sums are not kept when the body calls user functions,
+        # which could be redefined
+        self.source = body_node.to_source() if cacheable else None
+
+    def evaluate(self, x: float, *args: float) -> float | None:
+        lower = self.lower_node.evaluate(x, *args)
+        if lower is None:
+            return None
+        upper = self.upper_node.evaluate(x, *args)
+        if upper is None:
+            return None
+
+        def term(k):
+            value = self.body_node.evaluate(x, *args, k)
+            if value is None:
+                raise ValueError("undefined term")
+            return value
+
+        try:
+            return PARTIAL_SUMS.evaluate(self.product, self.source, term, lower, upper, (x, *args))
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+
+    def to_source(self) -> str:
+        point = "".join(f", _v_{name}" for name in self.scope)
+        return (
+            f"_series({self.product!r}, {self.source!r}, lambda _v_{self.index}: {self.body_node.to_source()}, "
+            f"{self.lower_node.to_source()}, {self.upper_node.to_source()}, (x{point},))"
+        )
+
+
+class ComparisonNode(FuncAST):
+    """one comparison or a chain of them, its value is a bool"""
+
+    def __init__(self, operands: list[FuncAST], ops: list[TokenType]):
+        self.operands = operands
+        self.ops = ops
+
+    def evaluate(self, x: float, *args: float) -> bool | None:
+        left = self.operands[0].evaluate(x, *args)
+        if left is None:
+            return None
+        for op, node in zip(self.ops, self.operands[1:]):
+            right = node.evaluate(x, *args)
+            if right is None:
+                return None
+            try:
+                if not COMPARISON_OPERATORS[op][1](left, right):
+                    return False
+            except TypeError:
+                # complex numbers are not ordered
+                return None
+            left = right
+        return True
+
+    def to_source(self) -> str:
+        source = self.operands[0].to_source()
+        for op, node in zip(self.ops, self.operands[1:]):
+            source += f" {COMPARISON_OPERATORS[op][0]} {node.to_source()}"
+        return f"({source})"
+
+
+class PiecewiseNode(FuncAST):
+    def __init__(self, cases: list[tuple[ComparisonNode, FuncAST]], default: FuncAST | None):
+        self.cases = cases
+        self.default = default
+
+    def evaluate(self, x: float, *args: float) -> float | None:
+        for condition, value_node in self.cases:
+            matched = condition.evaluate(x, *args)
+            if matched is None:
+                return None
+            if matched:
+                return value_node.evaluate(x, *args)
+        if self.default is None:
+            return None
+        return self.default.evaluate(x, *args)
+
+    def to_source(self) -> str:
+        # a conditional expression only evaluates the value it returns
+        source = "None" if self.default is None else self.default.to_source()
+        for condition, value_node in reversed(self.cases):
+            source = f"{value_node.to_source()} if {condition.to_source()} else {source}"
+        return f"({source})"
+
 
 class Parser:
-    def __init__(self, tokens: list[Token], main_var: str):
+    def __init__(self, tokens: list[Token], main_var: str, complex_mode: bool = False,
+                 variables: tuple[str, ...] = (), functions=None):
         self.tokens = tokens
         self.main_var = main_var
+        self.complex_mode = complex_mode
+        self.variables = variables
+        self.functions = functions
+        self.calls: set[str] = set()
+        self.call_count = 0
         self.idx = 0
 
     def advance(self):
@@ -337,6 +739,9 @@ class Parser:
             return expr
         if self.tok != TokenType.EXPR_END:
             return ParseFuncError(f"unexpected token {self.tok}")
+        expr.variables = self.variables
+        expr.functions = self.functions
+        expr.calls = frozenset(self.calls)
         return expr
 
     def func_arg(self):
@@ -353,19 +758,26 @@ class Parser:
         elif self.tok == (TokenType.IDENT, self.main_var):
             self.advance()
             return XNode()
+        elif self.tok == TokenType.IDENT and self.tok.value in self.variables:
+            name = self.tok.value
+            self.advance()
+            return VarNode(name, self.variables.index(name))
         elif self.tok == (TokenType.IDENT, 'pi'):
             self.advance()
             return ValueNode(math.pi)
         elif self.tok == (TokenType.IDENT, 'e'):
             self.advance()
             return ValueNode(math.e)
+        elif self.complex_mode and self.tok == (TokenType.IDENT, 'i'):
+            self.advance()
+            return ValueNode(1j)
         elif self.tok == TokenType.IDENT and self.tok.value in ONE_ARG_FUNCIONS:
             func = self.tok.value
             self.advance()
             value_node = self.func_arg()
             if isinstance(value_node, ParseFuncError):
                 return value_node
-            return OneArgCallNode(value_node, func)
+            return OneArgCallNode(value_node, func, self.complex_mode)
         elif self.tok == TokenType.IDENT and self.tok.value in BASE_ARG_FUNCTIONS:
             func = self.tok.value
             self.advance()
@@ -378,7 +790,20 @@ class Parser:
             value_node = self.func_arg()
             if isinstance(value_node, ParseFuncError):
                 return value_node
-            return BaseArgCallNode(value_node, base_node, func)
+            return BaseArgCallNode(value_node, base_node, func, self.complex_mode)
+        elif self.functions is not None and self.tok == TokenType.IDENT \
+                and self.tokens[self.idx + 1] == TokenType.OPEN_PAREN:
+            name = self.tok.value
+            self.advance()
+            value_node = self.value()
+            if isinstance(value_node, ParseFuncError):
+                return value_node
+            self.calls.add(name)
+            self.call_count += 1
+            return UserCallNode(value_node, name, self.functions)
+        elif self.tok in ((TokenType.IDENT, 'sum'), (TokenType.IDENT, 'prod')) \
+                and self.tokens[self.idx + 1] == TokenType.UNDERSCORE:
+            return self.series()
         else:
             return ParseFuncError(f"expected a value, found {self.tok}")
 
@@ -390,8 +815,92 @@ class Parser:
                 return ParseFuncError(f"expected ')', found {self.tok}")
             self.advance()
             return expr
+        if self.tok == TokenType.OPEN_BRACE:
+            return self.piecewise()
         return self.literal()
 
+    def series(self):
+        product = self.tok.value == 'prod'
+        self.advance()
+        self.advance()
+        if self.tok != TokenType.OPEN_PAREN:
+            return ParseFuncError(f"expected '(', found {self.tok}")
+        self.advance()
+        if self.tok != TokenType.IDENT:
+            return ParseFuncError(f"expected the name of the index, found {self.tok}")
+        index = self.tok.value
+        if index == self.main_var or index in self.variables:
+            return ParseFuncError(f"{index} is already a variable")
+        self.advance()
+        if self.tok != TokenType.EQUAL:
+            return ParseFuncError(f"expected '=', found {self.tok}")
+        self.advance()
+        lower_node = self.expr(True)
+        if isinstance(lower_node, ParseFuncError):
+            return lower_node
+        if self.tok != TokenType.DOTDOT:
+            return ParseFuncError(f"expected '..', found {self.tok}")
+        self.advance()
+        upper_node = self.expr(True)
+        if isinstance(upper_node, ParseFuncError):
+            return upper_node
+        if self.tok != TokenType.CLOSE_PAREN:
+            return ParseFuncError(f"expected ')', found {self.tok}")
+        self.advance()
+
+        scope = self.variables
+        call_count = self.call_count
+        self.variables = (*scope, index)
+        body_node = self.func_arg()
+        self.variables = scope
+        if isinstance(body_node, ParseFuncError):
+            return body_node
+        return SeriesNode(body_node, lower_node, upper_node, index, scope, product, self.call_count == call_count)
+
+    def piecewise(self):
+        self.advance()
+        cases = []
+        default = None
+        while default is None:
+            expr = self.expr(True)
+            if isinstance(expr, ParseFuncError):
+                return expr
+            if self.tok.type in COMPARISON_OPERATORS:
+                condition = self.comparison(expr)
+                if isinstance(condition, ParseFuncError):
+                    return condition
+                if self.tok != TokenType.COLON:
+                    return ParseFuncError(f"expected ':', found {self.tok}")
+                self.advance()
+                value_node = self.expr(True)
+                if isinstance(value_node, ParseFuncError):
+                    return value_node
+                cases.append((condition, value_node))
+            else:
+                default = expr
+            if self.tok != TokenType.SEMICOLON:
+                break
+            self.advance()
+
+        if self.tok != TokenType.CLOSE_BRACE:
+            return ParseFuncError(f"expected '}}', found {self.tok}")
+        self.advance()
+        if not cases:
+            return ParseFuncError("expected a condition")
+        return PiecewiseNode(cases, default)
+
+    def comparison(self, l_node):
+        operands = [l_node]
+        ops = []
+        while self.tok.type in COMPARISON_OPERATORS:
+            ops.append(self.tok.type)
+            self.advance()
+            r_node = self.expr(True)
+            if isinstance(r_node, ParseFuncError):
+                return r_node
+            operands.append(r_node)
+        return ComparisonNode(operands, ops)
+
     def signed_value(self):
         negative = False
         if self.tok == TokenType.PLUS:
@@ -422,7 +931,7 @@ class Parser:
         if isinstance(r_node, ParseFuncError):
             return r_node
 
-        l_node = BinOpNode(l_node, r_node, TokenType.CARET)
+        l_node = BinOpNode(l_node, r_node, TokenType.CARET, self.complex_mode)
         curr_node = l_node
 
         while self.tok == TokenType.CARET:
@@ -430,7 +939,7 @@ class Parser:
             r_node = self.value()
             if isinstance(r_node, ParseFuncError):
                 return r_node
-            curr_node.r_node = BinOpNode(curr_node.r_node, r_node, TokenType.CARET)
+            curr_node.r_node = BinOpNode(curr_node.r_node, r_node, TokenType.CARET, self.complex_mode)
             curr_node = curr_node.r_node
 
         return l_node
@@ -479,12 +988,17 @@ class Parser:
         return l_node
 
 
-def parse_func(func: str, main_var: str) -> ParseFuncError | FuncAST:
+def parse_func(func: str, main_var: str, complex_mode: bool = False,
+               variables: tuple[str, ...] = (), functions=None) -> ParseFuncError | FuncAST:
+    """parses func as a function of main_var and of the other variables, in
+    complex mode 'i' is the imaginary unit and the functions and powers work
+    on complex numbers; functions is the table of the user functions, with a
+    call(name, value) method, without it they are not recognized"""
     lexer = Lexer(func)
     tokens = lexer.tokenize()
 
     if isinstance(tokens, ParseFuncError):
         return tokens
 
-    parser = Parser(tokens, main_var)
+    parser = Parser(tokens, main_var, complex_mode, variables, functions)
     return parser.parse()
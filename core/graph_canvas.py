@@ -1,17 +1,29 @@
 from abc import ABC, abstractmethod
-from math import floor, log10
+from math import floor, log10, cos, sin, pi
 
-import tkinter as tk
-from tkinter import font as tk_font
-from itertools import chain
+from .polyline import Polyline
 
 
 class GraphCanvasBase(ABC):
+    # tells if ellipse() draws true ellipses, rather than polygons with a fixed number of sides
+    native_ellipse = False
+    # tells if image() draws anything
+    supports_images = False
+
     def __init__(self, x_range=(-10, 10), y_range=(-10, 10)):
         self._x_range = x_range
         self._y_range = y_range
         self.__color = "#000000"
         self.__line_width = 1
+        # when set, the segments drawn are added to it, labeled with owner
+        self.segment_index = None
+        self.owner = None
+        # an extra label for what is drawn, backends that can use it to
+        # delete or move groups of items
+        self.tag = None
+        # pixels between the samples of the graphers, raised to draw a coarser
+        # but faster preview while the view is being moved
+        self.stride = 1
 
     @property
     def color(self):
@@ -71,6 +83,11 @@ class GraphCanvasBase(ABC):
     def lines(self, points: list[tuple[int, int]]):
         pass
 
+    @abstractmethod
+    def polygon(self, points: list[tuple[int, int]]):
+        """draws a filled, semi-transparent when possible, polygon"""
+        pass
+
     @abstractmethod
     def circle(self, center: tuple[int, int], radius: int):
         pass
@@ -91,6 +108,73 @@ class GraphCanvasBase(ABC):
     def draw_foreground(self):
         pass
 
+    def polyline(self, polyline: Polyline) -> list:
+        """draws each run of polyline like lines, returns the items drawn;
+        backends that can take the flat coordinates override it"""
+        items = []
+        for run in polyline.runs():
+            items.append(self.lines(Polyline.points(run)))
+        return items
+
+    def image(self, position: tuple[int, int], rows: list[list[str]], scale: int = 1):
+        """draws rows of "#rrggbb" colors with their top left corner at position,
+        each color covering scale x scale pixels"""
+        pass
+
+    def flush(self):
+        pass
+
+    def delete(self, item):
+        pass
+
+    def _record(self, points):
+        if self.segment_index is not None:
+            self.segment_index.add_polyline(self.owner, points)
+
+    def _record_coords(self, coords):
+        if self.segment_index is not None:
+            self.segment_index.add_coords(self.owner, coords)
+
+    def _record_ellipse(self, p1, p2, steps=64):
+        if self.segment_index is None:
+            return
+        cx = (p1[0] + p2[0]) / 2
+        cy = (p1[1] + p2[1]) / 2
+        a = (p2[0] - p1[0]) / 2
+        b = (p2[1] - p1[1]) / 2
+        self._record([(cx + a * cos(2 * pi * i / steps), cy + b * sin(2 * pi * i / steps)) for i in range(steps + 1)])
+
+    @staticmethod
+    def _grid_lines(min_val, max_val):
+        steps = (max_val - min_val) / 5
+        steps10 = 10**floor(log10(steps))
+        steps2 = steps10 * 2
+        steps5 = steps10 * 5
+        steps = min(steps2, steps5, steps10, key=lambda s: abs(steps - s))
+        int_min_val = (min_val // steps) * steps
+        int_max_val = (max_val // steps + 2) * steps
+        vals = [round(int_min_val, 10)]
+        int_min_val += steps
+        while int_min_val < int_max_val:
+            vals.append(round(int_min_val, 10))
+            int_min_val += steps
+        return vals
+
+    @staticmethod
+    def _every_other(vals):
+        """keeps the grid lines at even multiples of the grid step, so that
+        the same ones are kept while the view moves"""
+        if len(vals) < 2:
+            return vals
+        step = vals[1] - vals[0]
+        return [v for v in vals if round(v / step) % 2 == 0]
+
+    def _grid_x_lines(self):
+        return self._grid_lines(*self.x_range)
+
+    def _grid_y_lines(self):
+        return self._grid_lines(*self.y_range)
+
     def x_plane_to_x_canvas(self, x):
         min_x, max_x = self.x_range
         min_xc, max_xc = self.canvas_x_range
@@ -118,131 +202,3 @@ class GraphCanvasBase(ABC):
         if max_yc == min_yc:
             return max_yc
         return (yc - min_yc) / (max_yc - min_yc) * (max_y - min_y) + min_y
-
-
-class GraphCanvas(GraphCanvasBase):
-    def __init__(self, canvas: tk.Canvas, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.canvas = canvas
-
-    def width(self) -> int:
-        return int(self.canvas.cget("width"))
-
-    def height(self) -> int:
-        return int(self.canvas.cget("height"))
-
-    @property
-    def canvas_x_range(self) -> tuple[float, float]:
-        return 0, self.width()
-
-    @property
-    def canvas_y_range(self) -> tuple[float, float]:
-        return self.height(), 0
-
-    def line(self, p1: tuple[int, int], p2: tuple[int, int]):
-        self.canvas.create_line(*p1, *p2, fill=self.color, width=self.line_width)
-
-    def lines(self, points: list[tuple[int, int]]):
-        if len(points) < 2:
-            return
-        self.canvas.create_line(*chain(points), fill=self.color, width=self.line_width)
-
-    def ellipse(self, p1: tuple[int, int], p2: tuple[int, int]):
-        self.canvas.create_oval(*p1, *p2, outline=self.color, width=self.line_width)
-
-    def circle(self, center: tuple[int, int], radius: int):
-        x1 = center[0] - radius
-        y1 = center[1] - radius
-        x2 = center[0] + radius + 1
-        y2 = center[1] + radius + 1
-        self.canvas.create_oval(x1, y1, x2, y2, outline=self.color, width=self.line_width)
-
-    def clear(self):
-        self.canvas.delete("all")
-
-    @staticmethod
-    def __grid_lines(min_val, max_val):
-        steps = (max_val - min_val) / 5
-        steps10 = 10**floor(log10(steps))
-        steps2 = steps10 * 2
-        steps5 = steps10 * 5
-        steps = min(steps2, steps5, steps10, key=lambda s: abs(steps - s))
-        int_min_val = (min_val // steps) * steps
-        int_max_val = (max_val // steps + 2) * steps
-        vals = [round(int_min_val, 10)]
-        int_min_val += steps
-        while int_min_val < int_max_val:
-            vals.append(round(int_min_val, 10))
-            int_min_val += steps
-        return vals
-
-    def __grid_x_lines(self):
-        return self.__grid_lines(*self.x_range)
-
-    def __grid_y_lines(self):
-        return self.__grid_lines(*self.y_range)
-
-    def draw_background(self):
-        self.__grid_x_lines()
-        w = self.width()
-        h = self.height()
-
-        self.canvas.create_rectangle(0, 0, w, h, width=0, fill="#FFFFFF")
-
-        for x in self.__grid_x_lines():
-            x_canvas = self.x_plane_to_x_canvas(x)
-            self.canvas.create_line(x_canvas, 0, x_canvas, h, fill="#DDDDDD")
-
-        for y in self.__grid_y_lines():
-            y_canvas = self.y_plane_to_y_canvas(y)
-            self.canvas.create_line(0, y_canvas, w, y_canvas, fill="#DDDDDD")
-
-        y_x_line = self.y_plane_to_y_canvas(0)
-        x_y_line = self.x_plane_to_x_canvas(0)
-        self.canvas.create_line(0, y_x_line, w, y_x_line, fill="#000000", arrow=tk.LAST)
-        self.canvas.create_line(x_y_line, 0, x_y_line, h, fill="#000000", arrow=tk.FIRST)
-
-    def __draw_x_coordinate(self, x, y, font, text):
-        line_height = font.metrics("linespace")
-        y += 5
-        color = "#000000"
-        if y < 5:
-            y = 5
-            color = "#888888"
-        elif y > self.height() - line_height - 5:
-            y = self.height() - line_height - 5
-            color = "#888888"
-        self.canvas.create_text(x, y, text=text, fill=color, anchor="n")
-
-    def __draw_y_coordinate(self, x, y, font, text):
-        line_width = font.measure(text)
-        x -= 5
-        color = "#000000"
-        if x > self.width() - 5:
-            x = self.width() - 5
-            color = "#888888"
-        elif x < line_width + 5:
-            x = line_width + 5
-            color = "#888888"
-        self.canvas.create_text(x, y, text=text, fill=color, anchor="e")
-
-    def draw_foreground(self):
-        font = tk_font.Font(font="TkDefaultFont")
-
-        y_center = self.y_plane_to_y_canvas(0)
-        for x in self.__grid_x_lines():
-            if x == 0:
-                continue
-            x_canvas = self.x_plane_to_x_canvas(x)
-            text = str(int(x)) if int(x) == x and abs(x) < 10000 else f"{float(x): .6g}"
-            self.__draw_x_coordinate(x_canvas, y_center, font, text)
-
-        x_center = self.x_plane_to_x_canvas(0)
-        for y in self.__grid_y_lines():
-            if y == 0:
-                continue
-            y_canvas = self.y_plane_to_y_canvas(y)
-            text = str(int(y)) if int(y) == y and abs(y) < 10000 else f"{float(y): .6g}"
-            self.__draw_y_coordinate(x_center, y_canvas, font, text)
-
-        self.canvas.create_text(x_center - 5, y_center + 5, text="0", fill="#000000", anchor="ne")
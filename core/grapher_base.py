@@ -1,11 +1,20 @@
 from abc import ABC, abstractmethod
+from math import isnan, isfinite
 from typing import Callable
 
 from .graph_canvas import GraphCanvasBase
+from .polyline import Polyline
+from .clipping import clip_polyline, viewport
 from .param_input import InputBase
+from .tile_cache import sample_tiles, sample_step, interpolate_cached, TILE_SIZE
+from .stats import STATS
+from .integration import cumulative_integral, IntegralResult
 
 
 class GrapherBase(ABC):
+    # tells if the grapher receives data over time, drawn with graph_new as it arrives
+    streaming = False
+
     def __init__(self, graph_canvas: GraphCanvasBase) -> None:
         self.graph_canvas = graph_canvas
         self.params: InputBase = self.get_params()
@@ -19,158 +28,176 @@ class GrapherBase(ABC):
     def graph(self):
         pass
 
+    def graph_iter(self):
+        """draws the same as graph, yielding between slices of the work so that
+        the caller can do something else in between; graphers that can be drawn
+        a piece at a time override it and implement graph by exhausting it"""
+        self.graph()
+        yield from ()
+
+    def close(self):
+        self.params.close()
 
-class FunctionGraphX(GrapherBase, ABC):
+
+class FunctionGraphBase(GrapherBase, ABC):
     def __init__(self, graph_canvas: GraphCanvasBase):
         super().__init__(graph_canvas)
         self.__func = self.get_func()
 
-    def __clamp_line(self, p1, p2):
-        """p1 is inside the plane, p2 is not, finds the intersection with the edge of the canvas.
-        p1 is a point of the canvas, p2 is a point of the plane"""
-        p1x = self.graph_canvas.x_canvas_to_x_plane(p1[0])
-        p1y = self.graph_canvas.y_canvas_to_y_plane(p1[1])
-
-        min_y, max_y = self.graph_canvas.y_range
-        min_yc, max_yc = self.graph_canvas.canvas_y_range
-        if p2[1] < min_y:
-            py = min_y
-            py_canvas = min_yc
-        else:
-            py = max_y
-            py_canvas = max_yc
-        if p1y == p2[1]:
-            return p1
-        inv_m = (p1x - p2[0]) / (p1y - p2[1])
-        px = (py - p1y) * inv_m + p1x
-        px_canvas = self.graph_canvas.x_plane_to_x_canvas(px)
-        return px_canvas, py_canvas
-
-    def graph(self):
-        if not self.params.available():
-            return
-
-        final_points = []
-        points = []
-
-        prev_invalid_point = None
-
+    def _kwargs(self):
         arg_names = self.params.get_names()
         values = (self.params[name] for name in arg_names)
-        kwargs = dict(zip(arg_names, values))
-        min_y, max_y = self.graph_canvas.y_range
-        min_xc, max_xc = self.graph_canvas.canvas_x_range
+        return dict(zip(arg_names, values))
 
-        for x_canvas in range(min_xc, max_xc, 1 if min_xc <= max_xc else -1):
-            x = self.graph_canvas.x_canvas_to_x_plane(x_canvas)
+    def evaluate_many(self, values, kwargs) -> list:
+        """evaluates the function on a list of values, graphers with a faster
+        way to evaluate many values at once can override it"""
+        results = []
+        for v in values:
             try:
-                y = self.__func(x, **kwargs)
+                results.append(self.__func(v, **kwargs))
             except Exception:
-                if points:
-                    final_points.append(points)
-                points = []
-                continue
-            if not isinstance(y, float) and not isinstance(y, int):
-                if points:
-                    final_points.append(points)
-                points = []
-                continue
-            y_canvas = self.graph_canvas.y_plane_to_y_canvas(y)
-            if y < min_y or y > max_y:
-                prev_invalid_point = (x, y)
-                if points:
-                    points.append(self.__clamp_line(points[-1], prev_invalid_point))
-                    final_points.append(points)
-                points = []
-                continue
-            elif prev_invalid_point is not None:
-                points.append(self.__clamp_line((x_canvas, y_canvas), prev_invalid_point))
-                prev_invalid_point = None
-            points.append((x_canvas, y_canvas))
-
-        if points:
-            final_points.append(points)
-        for p_list in final_points:
-            self.graph_canvas.lines(p_list)
+                results.append(None)
+        STATS.evaluations += len(results)
+        return results
+
+    def value_at(self, v):
+        """the value of the function at v, None where it is not defined;
+        interpolated between the samples drawn around v if they are cached"""
+        level = self._sample_level()
+        if level is not None:
+            value = interpolate_cached(self.cache_key(), v, level)
+            if value is not None:
+                return value
+        result = self.evaluate_many([v], self._kwargs())[0]
+        if not isinstance(result, (float, int)) or not isfinite(result):
+            return None
+        return result
+
+    def integral(self, a: float, b: float) -> IntegralResult:
+        """the definite integral of the function from a to b"""
+        kwargs = self._kwargs()
+        return cumulative_integral(self.cache_key(), lambda values: self.evaluate_many(values, kwargs), a, b)
+
+    def cache_key(self):
+        """identifies the function drawn for the tile cache, None disables caching"""
+        params_key = self.params.cache_key()
+        if params_key is None:
+            return None
+        return type(self).__module__, type(self).__qualname__, params_key
+
+    def _flush_runs(self, line: Polyline, clip: bool = True):
+        """draws the parts of the runs of line so far inside the viewport and
+        clears it, but for the last point of the current run which the next
+        points continue; without clip the points must all be in view"""
+        self.graph_canvas.polyline(clip_polyline(line, viewport(self.graph_canvas)) if clip else line)
+        line.clear(keep_last=True)
+
+    def _sample_level(self) -> int | None:
+        """the zoom level of the samples drawn in the current view, None if
+        they are not taken from the tile cache"""
+        return None
+
+    def _samples(self, min_v, max_v, pixels):
+        kwargs = self._kwargs()
+        return sample_tiles(
+            self.cache_key(),
+            lambda values: self.evaluate_many(values, kwargs),
+            min_v, max_v, pixels
+        )
 
     @abstractmethod
     def get_func(self) -> Callable:
         pass
 
 
-class FunctionGraphY(GrapherBase, ABC):
-    def __init__(self, graph_canvas: GraphCanvasBase):
-        super().__init__(graph_canvas)
-        self.__func = self.get_func()
+class FunctionGraphX(FunctionGraphBase, ABC):
+    def _sample_level(self) -> int:
+        min_x, max_x = self.graph_canvas.x_range
+        min_xc, max_xc = self.graph_canvas.canvas_x_range
+        return sample_step(max_x - min_x, (max_xc - min_xc) / self.graph_canvas.stride)[0]
 
-    def __clamp_line(self, p1, p2):
-        """p1 is inside the plane, p2 is not, finds the intersection with the edge of the canvas.
-        p1 is a point of the canvas, p2 is a point of the plane"""
-        p1x = self.graph_canvas.x_canvas_to_x_plane(p1[0])
-        p1y = self.graph_canvas.y_canvas_to_y_plane(p1[1])
+    def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
+        if not self.params.available():
+            return
+
+        line = Polyline()
+        prev_outside = False
+        # if line may have points out of view, the first and the last tile
+        # can have samples a step beyond the range
+        clip = True
 
         min_x, max_x = self.graph_canvas.x_range
+        min_y, max_y = self.graph_canvas.y_range
         min_xc, max_xc = self.graph_canvas.canvas_x_range
-        if p2[0] < min_x:
-            px = min_x
-            px_canvas = min_xc
-        else:
-            px = max_x
-            px_canvas = max_xc
-        if p1x == p2[0]:
-            return px
-        m = (p1y - p2[1]) / (p1x - p2[0])
-        py = (px - p1x) * m + p1y
-        py_canvas = self.graph_canvas.y_plane_to_y_canvas(py)
-        return px_canvas, py_canvas
+
+        pixels = (max_xc - min_xc) / self.graph_canvas.stride
+        for i, (x, y) in enumerate(self._samples(min_x, max_x, pixels), 1):
+            if i % TILE_SIZE == 0:
+                self._flush_runs(line, clip)
+                # only the point kept for the next ones can be out of view
+                clip = prev_outside
+                yield
+            if isnan(y):
+                line.end_run()
+                continue
+            outside = y < min_y or y > max_y
+            if outside:
+                clip = True
+                if prev_outside:
+                    # jumps between samples out of view are drawn as discontinuities, like asymptotes
+                    line.end_run()
+            prev_outside = outside
+            line.append(self.graph_canvas.x_plane_to_x_canvas(x), self.graph_canvas.y_plane_to_y_canvas(y))
+
+        self._flush_runs(line)
+
+
+class FunctionGraphY(FunctionGraphBase, ABC):
+    def _sample_level(self) -> int:
+        min_y, max_y = self.graph_canvas.y_range
+        min_yc, max_yc = self.graph_canvas.canvas_y_range
+        return sample_step(max_y - min_y, (max_yc - min_yc) / self.graph_canvas.stride)[0]
 
     def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
         if not self.params.available():
             return
 
-        final_points = []
-        points = []
-
-        prev_invalid_point = None
+        line = Polyline()
+        prev_outside = False
+        # if line may have points out of view, the first and the last tile
+        # can have samples a step beyond the range
+        clip = True
 
-        arg_names = self.params.get_names()
-        values = (self.params[name] for name in arg_names)
-        kwargs = dict(zip(arg_names, values))
         min_x, max_x = self.graph_canvas.x_range
+        min_y, max_y = self.graph_canvas.y_range
         min_yc, max_yc = self.graph_canvas.canvas_y_range
 
-        for y_canvas in range(min_yc, max_yc, 1 if min_yc <= max_yc else -1):
-            y = self.graph_canvas.y_canvas_to_y_plane(y_canvas)
-            try:
-                x = self.__func(y, **kwargs)
-            except Exception:
-                if points:
-                    final_points.append(points)
-                points = []
-                continue
-            if not isinstance(x, float) and not isinstance(x, int):
-                if points:
-                    final_points.append(points)
-                points = []
+        pixels = (max_yc - min_yc) / self.graph_canvas.stride
+        for i, (y, x) in enumerate(self._samples(min_y, max_y, pixels), 1):
+            if i % TILE_SIZE == 0:
+                self._flush_runs(line, clip)
+                # only the point kept for the next ones can be out of view
+                clip = prev_outside
+                yield
+            if isnan(x):
+                line.end_run()
                 continue
-            x_canvas = self.graph_canvas.x_plane_to_x_canvas(x)
-            if x < min_x or x > max_x:
-                prev_invalid_point = (x, y)
-                if points:
-                    points.append(self.__clamp_line(points[-1], prev_invalid_point))
-                    final_points.append(points)
-                points = []
-                continue
-            elif prev_invalid_point is not None:
-                points.append(self.__clamp_line((x_canvas, y_canvas), prev_invalid_point))
-                prev_invalid_point = None
-            points.append((x_canvas, y_canvas))
-
-        if points:
-            final_points.append(points)
-        for p_list in final_points:
-            self.graph_canvas.lines(p_list)
-
-    @abstractmethod
-    def get_func(self) -> Callable:
-        pass
+            outside = x < min_x or x > max_x
+            if outside:
+                clip = True
+                if prev_outside:
+                    # jumps between samples out of view are drawn as discontinuities, like asymptotes
+                    line.end_run()
+            prev_outside = outside
+            line.append(self.graph_canvas.x_plane_to_x_canvas(x), self.graph_canvas.y_plane_to_y_canvas(y))
+
+        self._flush_runs(line)
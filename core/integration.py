@@ -0,0 +1,208 @@
+from array import array
+from math import isfinite, floor, ceil, log2
+
+from .tile_cache import TileCache
+
+# 15 point Kronrod rule extending the 7 point Gauss one, for half of [-1, 1]
+KRONROD_NODES = (
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.0
+)
+KRONROD_WEIGHTS = (
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714
+)
+# weights of the Gauss rule, whose nodes are the odd Kronrod ones
+GAUSS_WEIGHTS = (
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327
+)
+NODES_PER_INTERVAL = 15
+
+ABS_TOLERANCE = 1e-10
+REL_TOLERANCE = 1e-10
+MAX_DEPTH = 30
+MAX_EVALUATIONS = 50000
+# an interval that does not converge is singular if the largest absolute value at its
+# nodes is at least this many times the largest one at the nodes of the first level
+UNBOUNDED_GROWTH = 1000
+# singularities closer than this fraction of the interval are reported as one
+SINGULARITY_MERGE = 1e-6
+# the cumulative integral is split in about this many cached cells
+CELLS = 16
+
+
+class IntegralResult:
+    def __init__(self, value: float = 0.0, error: float = 0.0, evaluations: int = 0,
+                 singularities: list[float] | None = None, converged: bool = True):
+        self.value = value
+        self.error = error
+        # function evaluations done to compute the result, not counting cached parts
+        self.evaluations = evaluations
+        # points where the function is undefined or not integrable
+        self.singularities = singularities if singularities is not None else []
+        # False if some intervals still had too large an error when the depth
+        # or the evaluations ran out, error is then not below the tolerance
+        self.converged = converged
+
+    def __add__(self, other: "IntegralResult") -> "IntegralResult":
+        return IntegralResult(
+            self.value + other.value, self.error + other.error,
+            self.evaluations + other.evaluations, self.singularities + other.singularities,
+            self.converged and other.converged
+        )
+
+    def __neg__(self) -> "IntegralResult":
+        return IntegralResult(-self.value, self.error, self.evaluations, self.singularities, self.converged)
+
+    def __repr__(self):
+        return f"IntegralResult({self.value!r} ± {self.error:.3g}, {self.evaluations} evaluations" \
+               + ("" if self.converged else ", not converged") \
+               + (f", singular at {self.singularities})" if self.singularities else ")")
+
+
+def _nodes(lo, hi):
+    center = (lo + hi) / 2
+    half = (hi - lo) / 2
+    return [center - half * n for n in KRONROD_NODES] + [center + half * n for n in reversed(KRONROD_NODES[:-1])]
+
+
+def _rules(values, half):
+    """the Kronrod and Gauss estimates from the values at _nodes"""
+    kronrod = values[7] * KRONROD_WEIGHTS[7]
+    gauss = values[7] * GAUSS_WEIGHTS[3]
+    for i in range(7):
+        pair = values[i] + values[14 - i]
+        kronrod += pair * KRONROD_WEIGHTS[i]
+        if i % 2 == 1:
+            gauss += pair * GAUSS_WEIGHTS[i // 2]
+    return kronrod * half, gauss * half
+
+
+def _merge_close(points, distance):
+    """points are (x, largest absolute value near x), inf where undefined; each
+    group of close points becomes the one with the largest value, or the mean
+    of those undefined"""
+    merged = []
+    for p in sorted(points):
+        if merged and p[0] - merged[-1][-1][0] <= distance:
+            merged[-1].append(p)
+        else:
+            merged.append([p])
+    singularities = []
+    for group in merged:
+        peak = max(value for _, value in group)
+        xs = [x for x, value in group if value == peak]
+        singularities.append(sum(xs) / len(xs))
+    return singularities
+
+
+def integrate(evaluate_many, a: float, b: float,
+              abs_tolerance: float = ABS_TOLERANCE,
+              rel_tolerance: float = REL_TOLERANCE,
+              max_depth: int = MAX_DEPTH,
+              max_evaluations: int = MAX_EVALUATIONS) -> IntegralResult:
+    """Integrates from a to b the function given by evaluate_many, which maps a
+    list of values to their results, None where the function is not defined.
+
+    Uses adaptive Gauss-Kronrod 7-15 quadrature, bisecting the intervals whose
+    error estimate is above their share of the tolerance; all the intervals
+    of one level are evaluated with a single call to evaluate_many. Intervals
+    undefined at every node are skipped, those still undefined somewhere when
+    they cannot be split are reported as singularities. If the error is still
+    too large when max_depth or max_evaluations is reached the result is not
+    converged, and the intervals where the values keep growing are reported
+    as singularities too."""
+    if a == b:
+        return IntegralResult()
+    if a > b:
+        return -integrate(evaluate_many, b, a, abs_tolerance, rel_tolerance, max_depth, max_evaluations)
+
+    result = IntegralResult()
+    singularities = []
+    # the largest absolute value at the nodes of the first level with any
+    scale = None
+    pending = [(a, b)]
+    for depth in range(max_depth + 1):
+        xs = [x for lo, hi in pending for x in _nodes(lo, hi)]
+        results = evaluate_many(xs)
+        result.evaluations += len(xs)
+        if scale is None:
+            defined = [abs(v) for v in results if isinstance(v, (float, int)) and isfinite(v)]
+            scale = max(defined) if defined else None
+
+        next_pending = []
+        for i, (lo, hi) in enumerate(pending):
+            values = results[i * NODES_PER_INTERVAL:(i + 1) * NODES_PER_INTERVAL]
+            valid = [isinstance(v, (float, int)) and isfinite(v) for v in values]
+            can_split = depth < max_depth \
+                and result.evaluations + NODES_PER_INTERVAL * 2 * (len(next_pending) // 2 + 1) <= max_evaluations
+            if not any(valid):
+                continue
+            if not all(valid):
+                if can_split:
+                    next_pending += [(lo, (lo + hi) / 2), ((lo + hi) / 2, hi)]
+                else:
+                    singularities.append(((lo + hi) / 2, float("inf")))
+                continue
+
+            kronrod, gauss = _rules(values, (hi - lo) / 2)
+            error = abs(kronrod - gauss)
+            allowed = max(abs_tolerance, rel_tolerance * abs(kronrod)) * (hi - lo) / (b - a)
+            if error <= allowed or (hi - lo) <= abs(lo) * 1e-15:
+                result.value += kronrod
+                result.error += error
+            elif can_split:
+                next_pending += [(lo, (lo + hi) / 2), ((lo + hi) / 2, hi)]
+            else:
+                result.value += kronrod
+                result.error += error
+                result.converged = False
+                peak = max(abs(v) for v in values)
+                if peak > scale * UNBOUNDED_GROWTH:
+                    singularities.append(((lo + hi) / 2, peak))
+        pending = next_pending
+        if not pending:
+            break
+    result.singularities = _merge_close(singularities, (b - a) * SINGULARITY_MERGE)
+    return result
+
+
+INTEGRAL_CACHE = TileCache(max_samples=100000)
+
+
+def cumulative_integral(key, evaluate_many, a: float, b: float, cache: TileCache = INTEGRAL_CACHE,
+                        **kwargs) -> IntegralResult:
+    """Integrates from a to b like integrate, splitting [a, b] on a grid whose
+    cells are cached under key, the grid size and the position of the cell.
+    Moving a or b keeps the grid, so only the cells at the ends are computed
+    again. key should change whenever the function does, None disables the
+    cache."""
+    if key is None or a == b:
+        return integrate(evaluate_many, a, b, **kwargs)
+    if a > b:
+        return -cumulative_integral(key, evaluate_many, b, a, cache, **kwargs)
+
+    level = floor(log2((b - a) / CELLS))
+    width = 2.0 ** level
+    first = ceil(a / width)
+    last = floor(b / width)
+    if first >= last:
+        return integrate(evaluate_many, a, b, **kwargs)
+
+    result = integrate(evaluate_many, a, first * width, **kwargs)
+    for idx in range(first, last):
+        cell = cache.get((key, level, idx))
+        if cell is None:
+            cell_result = integrate(evaluate_many, idx * width, (idx + 1) * width, **kwargs)
+            result += cell_result
+            cache.put((key, level, idx), array("d", [
+                cell_result.value, cell_result.error, cell_result.converged, *cell_result.singularities
+            ]))
+        else:
+            result += IntegralResult(cell[0], cell[1], 0, list(cell[3:]), bool(cell[2]))
+    return result + integrate(evaluate_many, last * width, b, **kwargs)
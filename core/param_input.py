@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, TYPE_CHECKING
+import os
 
-from tkinter import ttk
-import tkinter as tk
+# tkinter is imported by the methods building the widgets, the inputs are
+# also used without them, e.g. to replay sessions or to export tables
+if TYPE_CHECKING:
+    import tkinter as tk
+    from tkinter import ttk
 
 from .function_parser import parse_func, FuncAST, ParseFuncError
+from .definitions import DEFINITIONS, DEFINITION_HEAD
 
 
 class InputBase(ABC):
@@ -20,13 +25,54 @@ class InputBase(ABC):
         pass
 
     @abstractmethod
-    def build_widget(self, parent: tk.Widget | tk.Tk) -> tk.Widget:
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
         pass
 
     @abstractmethod
     def __getitem__(self, item):
         pass
 
+    def cache_key(self):
+        """a hashable value that changes whenever the input does, None if the
+        results depending on the input should not be cached"""
+        return None
+
+    def text_names(self) -> list[str]:
+        """the names of the fields accepted by get_text and set_text"""
+        return list(self.get_names())
+
+    @abstractmethod
+    def get_text(self, name: str) -> str | None:
+        """the text of the field called name"""
+        pass
+
+    @abstractmethod
+    def set_text(self, name: str, text: str):
+        """sets the text of the field called name, also before the widget is built"""
+        pass
+
+    def __inputs(self):
+        return [value for value in vars(self).values() if isinstance(value, InputBase)]
+
+    def user_functions(self) -> set[str]:
+        """the names of the user functions the input calls or defines, by
+        default those of the inputs it is made of"""
+        names = set()
+        for field in self.__inputs():
+            names |= field.user_functions()
+        return names
+
+    def close(self):
+        """called when the input is not used anymore"""
+        for field in self.__inputs():
+            field.close()
+
+
+def _set_entry_text(entry: "ttk.Entry | tk.Entry", text: str):
+    import tkinter as tk
+    entry.delete(0, tk.END)
+    entry.insert(0, text)
+
 
 class ParamInputBase(InputBase, ABC):
     def __init__(self, fmt: str):
@@ -45,6 +91,9 @@ class ParamInputBase(InputBase, ABC):
             return None
         return self._extract_value(item, val)
 
+    def cache_key(self):
+        return tuple(self[name] for name in self.get_names())
+
     @abstractmethod
     def _extract_value(self, param_name: str, param_value: Any) -> int | float | None:
         pass
@@ -57,7 +106,8 @@ class ParamInput(ParamInputBase):
                 return False
         return True
 
-    def build_widget(self, parent) -> tk.Widget:
+    def build_widget(self, parent) -> "tk.Widget":
+        from tkinter import ttk
         blocks = self.fmt.split("$")
         frame = ttk.Frame(parent)
 
@@ -65,6 +115,8 @@ class ParamInput(ParamInputBase):
             if i % 2 == 1:
                 entry = ttk.Entry(frame, width=4, justify="right")
                 entry.grid(row=0, column=i)
+                if isinstance(self._params[block], str):
+                    entry.insert(0, self._params[block])
                 self._params[block] = entry
             else:
                 label = ttk.Label(frame, text=block)
@@ -73,10 +125,23 @@ class ParamInput(ParamInputBase):
 
     def _extract_value(self, param_name, param_value):
         try:
-            return float(param_value.get())
+            return float(self.get_text(param_name))
         except ValueError:
             return None
 
+    def get_text(self, name: str) -> str | None:
+        value = self._params.get(name)
+        if value is None or isinstance(value, str):
+            return value
+        return value.get()
+
+    def set_text(self, name: str, text: str):
+        value = self._params.get(name)
+        if value is None or isinstance(value, str):
+            self._params[name] = text
+        else:
+            _set_entry_text(value, text)
+
 
 class TerminalParamInput(ParamInputBase):
     def __init__(self, *args, **kwargs):
@@ -88,7 +153,8 @@ class TerminalParamInput(ParamInputBase):
     def available(self) -> bool:
         return True
 
-    def build_widget(self, parent: tk.Widget | tk.Tk) -> tk.Widget:
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        import tkinter as tk
         return tk.Label(parent, text=self.fmt.replace("$", ""))
 
     @staticmethod
@@ -104,47 +170,445 @@ class TerminalParamInput(ParamInputBase):
     def _extract_value(self, param_name: str, param_value: Any) -> int | float | None:
         return param_value
 
+    def get_text(self, name: str) -> str | None:
+        value = self._params.get(name)
+        return None if value is None else str(value)
+
+    def set_text(self, name: str, text: str):
+        self._params[name] = float(text)
+
 
 class FunctionInput(InputBase):
-    def __init__(self, var_name: str):
+    def __init__(self, var_name: str, entry_width: int = 50, complex_mode: bool = False):
         super().__init__(var_name)
-        param_name = var_name.removeprefix("f(").removesuffix(")")
-        self.param_name: str = param_name
+        # "f(x, y)" is a function of x and of the other variable y
+        names = [name.strip() for name in var_name[var_name.index("(") + 1:].removesuffix(")").split(",")]
+        self.param_name: str = names[0]
+        self.variables: tuple[str, ...] = tuple(names[1:])
+        self.entry_width = entry_width
+        # parses 'i' as the imaginary unit and evaluates with complex numbers
+        self.complex_mode = complex_mode
         self.parsed_string: str = ""
         self.current_ast: FuncAST | None = None
+        # the user function defined by a text like "g(x) = ..."
+        self.defined_name: str | None = None
+        self.__names: set[str] = set()
         self.func_entry: ttk.Entry | None = None
+        self.__text: str | None = None
 
     def get_names(self):
         return []
 
+    def text_names(self) -> list[str]:
+        return [self.fmt]
+
+    def text(self) -> str | None:
+        if self.func_entry is not None:
+            return self.func_entry.get()
+        return self.__text
+
+    def get_text(self, name: str) -> str | None:
+        return self.text()
+
+    def set_text(self, name: str, text: str):
+        if self.func_entry is not None:
+            _set_entry_text(self.func_entry, text)
+        else:
+            self.__text = text
+
     def __update_ast(self):
-        if self.func_entry is None:
+        text = self.text()
+        if text is None:
             return
-        if self.func_entry.get() == self.parsed_string:
+        if text == self.parsed_string:
             return
-        self.parsed_string = self.func_entry.get()
-        new_ast = parse_func(self.parsed_string, self.param_name)
+        self.parsed_string = text
+        name = None
+        main_var = self.param_name
+        head = DEFINITION_HEAD.match(text)
+        if head is not None and not self.complex_mode and not self.variables:
+            name, main_var = head.groups()
+            text = text[head.end():]
+        new_ast = parse_func(text, main_var, self.complex_mode, self.variables, DEFINITIONS)
+
+        defined = None
+        self.__names = set()
         if isinstance(new_ast, ParseFuncError):
-            self.current_ast = None
+            new_ast = None
+        elif name is not None:
+            self.__names = {name, *new_ast.calls}
+            if name != main_var and DEFINITIONS.define(name, new_ast, self) is None:
+                defined = name
+            else:
+                new_ast = None
+                # tried again next time, the name may be free or the cycle broken by then
+                self.parsed_string = ""
         else:
-            self.current_ast = new_ast
+            self.__names = set(new_ast.calls)
+        if self.defined_name is not None and self.defined_name != defined:
+            DEFINITIONS.undefine(self.defined_name, self)
+        self.defined_name = defined
+        self.current_ast = new_ast
 
     def available(self) -> bool:
-        if self.func_entry is None:
+        if self.text() is None:
             return False
         self.__update_ast()
         return self.current_ast is not None
 
-    def build_widget(self, parent: tk.Widget | tk.Tk) -> tk.Widget:
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        from tkinter import ttk
         frame = ttk.Frame(parent)
-        f_label = ttk.Label(frame, text=f"f({self.param_name}) =")
+        f_label = ttk.Label(frame, text=f"{self.fmt} =")
         f_label.grid(row=0, column=0)
-        self.func_entry = ttk.Entry(frame, width=50)
+        self.func_entry = ttk.Entry(frame, width=self.entry_width)
         self.func_entry.grid(row=0, column=1)
+        if self.__text is not None:
+            self.func_entry.insert(0, self.__text)
         return frame
 
     def __getitem__(self, item: int | float) -> int | float | None:
         self.__update_ast()
         if self.current_ast is None:
             return None
+        if self.defined_name is not None:
+            return DEFINITIONS.call(self.defined_name, item)
         return self.current_ast.evaluate(item)
+
+    def evaluate_many(self, items, *columns) -> list[int | float | None]:
+        """columns holds the values of the other variables, if any"""
+        self.__update_ast()
+        if self.current_ast is None:
+            return [None] * len(items)
+        if self.defined_name is not None:
+            # through the table, where the functions calling this one find the values
+            return DEFINITIONS.evaluate_many(self.defined_name, items)
+        return self.current_ast.evaluate_many(items, *columns)
+
+    def cache_key(self):
+        self.__update_ast()
+        if self.current_ast is None:
+            return None
+        return self.parsed_string, DEFINITIONS.version(self.current_ast.calls)
+
+    def user_functions(self) -> set[str]:
+        self.__update_ast()
+        return set(self.__names)
+
+    def close(self):
+        if self.defined_name is not None:
+            DEFINITIONS.undefine(self.defined_name, self)
+            self.defined_name = None
+
+
+class ParametricInput(InputBase):
+    def __init__(self, fmt: str, x_name: str, y_name: str, range_fmt: str):
+        super().__init__(fmt)
+        self.x_input = FunctionInput(x_name, 25)
+        self.y_input = FunctionInput(y_name, 25)
+        self.range_input = ParamInput(range_fmt)
+
+    def get_names(self):
+        return self.range_input.get_names()
+
+    def text_names(self) -> list[str]:
+        return [self.x_input.fmt, self.y_input.fmt, *self.range_input.text_names()]
+
+    def available(self) -> bool:
+        return self.x_input.available() and self.y_input.available() and self.range_input.available()
+
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        import tkinter as tk
+        from tkinter import ttk
+        frame = ttk.Frame(parent)
+        self.x_input.build_widget(frame).grid(row=0, column=0)
+        self.y_input.build_widget(frame).grid(row=0, column=1)
+        self.range_input.build_widget(frame).grid(row=1, column=0, columnspan=2, sticky=tk.W)
+        return frame
+
+    def __getitem__(self, item):
+        """with a parameter name returns the value of the range parameter,
+        with a number returns the point of the curve or None"""
+        if isinstance(item, str):
+            return self.range_input[item]
+        x = self.x_input[item]
+        y = self.y_input[item]
+        if x is None or y is None:
+            return None
+        return x, y
+
+    def __field(self, name):
+        if name == self.x_input.fmt:
+            return self.x_input
+        if name == self.y_input.fmt:
+            return self.y_input
+        return self.range_input
+
+    def get_text(self, name: str) -> str | None:
+        return self.__field(name).get_text(name)
+
+    def set_text(self, name: str, text: str):
+        self.__field(name).set_text(name, text)
+
+    def evaluate_many(self, items) -> list[tuple[float, float] | None]:
+        xs = self.x_input.evaluate_many(items)
+        ys = self.y_input.evaluate_many(items)
+        return [None if x is None or y is None else (x, y) for x, y in zip(xs, ys)]
+
+
+class PolarInput(InputBase):
+    def __init__(self, fmt: str, range_fmt: str):
+        super().__init__(fmt)
+        self.r_input = FunctionInput(fmt)
+        self.range_input = ParamInput(range_fmt)
+
+    def get_names(self):
+        return self.range_input.get_names()
+
+    def text_names(self) -> list[str]:
+        return [self.r_input.fmt, *self.range_input.text_names()]
+
+    def available(self) -> bool:
+        return self.r_input.available() and self.range_input.available()
+
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        import tkinter as tk
+        from tkinter import ttk
+        frame = ttk.Frame(parent)
+        self.r_input.build_widget(frame).grid(row=0, column=0)
+        self.range_input.build_widget(frame).grid(row=1, column=0, sticky=tk.W)
+        return frame
+
+    def __getitem__(self, item):
+        """with a parameter name returns the value of the range parameter,
+        with a number returns the radius at that angle"""
+        if isinstance(item, str):
+            return self.range_input[item]
+        return self.r_input[item]
+
+    def get_text(self, name: str) -> str | None:
+        field = self.r_input if name == self.r_input.fmt else self.range_input
+        return field.get_text(name)
+
+    def set_text(self, name: str, text: str):
+        field = self.r_input if name == self.r_input.fmt else self.range_input
+        field.set_text(name, text)
+
+    def evaluate_many(self, items) -> list[int | float | None]:
+        return self.r_input.evaluate_many(items)
+
+
+class RegionInput(InputBase):
+    """Region between two functions of x, a blank bound means that the region
+    is unbounded on that side. A bound can call the function drawn by an f(x)
+    grapher that defines it by name, e.g. 'g(x) = ...', the region follows it
+    when it changes."""
+
+    def __init__(self, fmt: str, lower_name: str, upper_name: str):
+        super().__init__(fmt)
+        self.lower_input = FunctionInput(lower_name, 25)
+        self.upper_input = FunctionInput(upper_name, 25)
+
+    def get_names(self):
+        return []
+
+    def text_names(self) -> list[str]:
+        return [self.lower_input.fmt, self.upper_input.fmt]
+
+    def __is_blank(self, func_input: FunctionInput):
+        text = func_input.text()
+        return text is not None and not text.strip()
+
+    def bounds(self) -> tuple[FunctionInput | None, FunctionInput | None]:
+        lower = None if self.__is_blank(self.lower_input) else self.lower_input
+        upper = None if self.__is_blank(self.upper_input) else self.upper_input
+        return lower, upper
+
+    def available(self) -> bool:
+        lower, upper = self.bounds()
+        if lower is None and upper is None:
+            return False
+        return (lower is None or lower.available()) and (upper is None or upper.available())
+
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        from tkinter import ttk
+        frame = ttk.Frame(parent)
+        self.lower_input.build_widget(frame).grid(row=0, column=0)
+        self.upper_input.build_widget(frame).grid(row=0, column=1)
+        return frame
+
+    def __getitem__(self, item):
+        lower, upper = self.bounds()
+        lower_value = None if lower is None else lower[item]
+        upper_value = None if upper is None else upper[item]
+        return lower_value, upper_value
+
+    def get_text(self, name: str) -> str | None:
+        field = self.lower_input if name == self.lower_input.fmt else self.upper_input
+        return field.get_text(name)
+
+    def set_text(self, name: str, text: str):
+        field = self.lower_input if name == self.lower_input.fmt else self.upper_input
+        field.set_text(name, text)
+
+
+class AreaInput(InputBase):
+    """Function of x with the bounds of an interval, shows a line of text
+    with the result computed by the grapher."""
+
+    def __init__(self, fmt: str, func_name: str, range_fmt: str):
+        super().__init__(fmt)
+        self.func_input = FunctionInput(func_name)
+        self.range_input = ParamInput(range_fmt)
+        self.result_label: ttk.Label | None = None
+        self.__result = ""
+
+    def get_names(self):
+        return self.range_input.get_names()
+
+    def text_names(self) -> list[str]:
+        return [self.func_input.fmt, *self.range_input.text_names()]
+
+    def available(self) -> bool:
+        return self.func_input.available() and self.range_input.available()
+
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        import tkinter as tk
+        from tkinter import ttk
+        frame = ttk.Frame(parent)
+        self.func_input.build_widget(frame).grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        self.range_input.build_widget(frame).grid(row=1, column=0, sticky=tk.W)
+        self.result_label = ttk.Label(frame, text=self.__result)
+        self.result_label.grid(row=1, column=1, sticky=tk.W, padx=10)
+        return frame
+
+    def show_result(self, text: str):
+        self.__result = text
+        if self.result_label is not None:
+            self.result_label.configure(text=text)
+
+    def __getitem__(self, item):
+        """with a parameter name returns the value of the bound, with a number
+        returns the value of the function there"""
+        if isinstance(item, str):
+            return self.range_input[item]
+        return self.func_input[item]
+
+    def get_text(self, name: str) -> str | None:
+        field = self.func_input if name == self.func_input.fmt else self.range_input
+        return field.get_text(name)
+
+    def set_text(self, name: str, text: str):
+        field = self.func_input if name == self.func_input.fmt else self.range_input
+        field.set_text(name, text)
+
+    def evaluate_many(self, items) -> list[int | float | None]:
+        return self.func_input.evaluate_many(items)
+
+    def cache_key(self):
+        return self.func_input.cache_key()
+
+
+class HeatmapInput(InputBase):
+    """Function of two variables with the range of values spread over the
+    colormap."""
+
+    def __init__(self, fmt: str, func_name: str, range_fmt: str):
+        super().__init__(fmt)
+        self.func_input = FunctionInput(func_name)
+        self.range_input = ParamInput(range_fmt)
+
+    def get_names(self):
+        return self.range_input.get_names()
+
+    def text_names(self) -> list[str]:
+        return [self.func_input.fmt, *self.range_input.text_names()]
+
+    def available(self) -> bool:
+        return self.func_input.available() and self.range_input.available()
+
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        import tkinter as tk
+        from tkinter import ttk
+        frame = ttk.Frame(parent)
+        self.func_input.build_widget(frame).grid(row=0, column=0, sticky=tk.W)
+        self.range_input.build_widget(frame).grid(row=1, column=0, sticky=tk.W)
+        return frame
+
+    def __getitem__(self, item):
+        return self.range_input[item]
+
+    def get_text(self, name: str) -> str | None:
+        field = self.func_input if name == self.func_input.fmt else self.range_input
+        return field.get_text(name)
+
+    def set_text(self, name: str, text: str):
+        field = self.func_input if name == self.func_input.fmt else self.range_input
+        field.set_text(name, text)
+
+    def evaluate_many(self, xs, ys) -> list[int | float | None]:
+        return self.func_input.evaluate_many(xs, ys)
+
+    def cache_key(self):
+        """only the function, the range changes the colors but not the values"""
+        return self.func_input.cache_key()
+
+
+class FileInput(InputBase):
+    def __init__(self, fmt: str):
+        super().__init__(fmt)
+        self.path_entry: ttk.Entry | None = None
+        self.__text: str | None = None
+
+    def get_names(self):
+        return ["path"]
+
+    def available(self) -> bool:
+        path = self["path"]
+        return path is not None and os.path.isfile(path)
+
+    def __browse(self):
+        from tkinter import filedialog
+        path = filedialog.askopenfilename()
+        if not path:
+            return
+        _set_entry_text(self.path_entry, path)
+        self.path_entry.event_generate("<Return>")
+
+    def build_widget(self, parent: "tk.Widget | tk.Tk") -> "tk.Widget":
+        from tkinter import ttk
+        frame = ttk.Frame(parent)
+        label = ttk.Label(frame, text=f"{self.fmt}:")
+        label.grid(row=0, column=0)
+        self.path_entry = ttk.Entry(frame, width=40)
+        self.path_entry.grid(row=0, column=1)
+        browse_button = ttk.Button(frame, text="...", width=3, command=self.__browse)
+        browse_button.grid(row=0, column=2)
+        if self.__text is not None:
+            self.path_entry.insert(0, self.__text)
+        return frame
+
+    def get_text(self, name: str) -> str | None:
+        if self.path_entry is not None:
+            return self.path_entry.get()
+        return self.__text
+
+    def set_text(self, name: str, text: str):
+        if self.path_entry is not None:
+            _set_entry_text(self.path_entry, text)
+        else:
+            self.__text = text
+
+    def cache_key(self):
+        return self["path"]
+
+    def __getitem__(self, item):
+        text = self.get_text("path")
+        if item != "path" or text is None:
+            return None
+        return text.strip() or None
+
+
+class StreamInput(FileInput):
+    def available(self) -> bool:
+        return self["path"] is not None
@@ -0,0 +1,62 @@
+from array import array
+
+
+class Polyline:
+    """Runs of connected points kept flat, the x and y coordinates interleaved
+    in an array of doubles, with the offsets in it where each run starts.
+    Uses a fraction of the memory of lists of tuples and goes to the canvas
+    without building them."""
+
+    def __init__(self):
+        self.coords = array("d")
+        self.starts = array("q", [0])
+
+    @classmethod
+    def from_runs(cls, runs) -> "Polyline":
+        """the polyline made of runs, lists of (x, y) points"""
+        polyline = cls()
+        for run in runs:
+            for x, y in run:
+                polyline.append(x, y)
+            polyline.end_run()
+        return polyline
+
+    def __len__(self):
+        return len(self.coords) // 2
+
+    def append(self, x: float, y: float):
+        self.coords.append(x)
+        self.coords.append(y)
+
+    def end_run(self):
+        """the next point starts a new run"""
+        if self.starts[-1] != len(self.coords):
+            self.starts.append(len(self.coords))
+
+    def last(self) -> tuple[float, float] | None:
+        """the last point of the current run"""
+        if self.starts[-1] == len(self.coords):
+            return None
+        return self.coords[-2], self.coords[-1]
+
+    def runs(self):
+        """the coordinates of each run of at least two points"""
+        coords = self.coords
+        ends = [*self.starts[1:], len(coords)]
+        for start, end in zip(self.starts, ends):
+            if end - start >= 4:
+                yield coords[start:end]
+
+    def clear(self, keep_last: bool = False):
+        """forgets the points, but the last one when keep_last is set, so that
+        the current run can be continued after being drawn"""
+        last = self.last() if keep_last else None
+        del self.coords[:]
+        del self.starts[1:]
+        if last is not None:
+            self.append(*last)
+
+    @staticmethod
+    def points(run) -> list[tuple[float, float]]:
+        """the coordinates of a run as a list of points"""
+        return list(zip(run[0::2], run[1::2]))
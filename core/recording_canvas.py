@@ -0,0 +1,126 @@
+from .graph_canvas import GraphCanvasBase
+from .viewport import resized_ranges
+
+
+class RecordedItem:
+    def __init__(self, kind: str, points: list, tags: tuple[str, ...]):
+        self.kind = kind
+        self.points = points
+        self.tags = tags
+
+
+class RecordingCanvas(GraphCanvasBase):
+    """Backend that keeps what is drawn in memory instead of showing it, with
+    the same item and tag semantics as GraphCanvas, used to replay sessions
+    without a display."""
+    native_ellipse = True
+    supports_images = True
+
+    def __init__(self, width: int = 500, height: int = 500, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__width = width
+        self.__height = height
+        self.items: dict[int, RecordedItem] = {}
+        self.__next_id = 1
+
+    def width(self) -> int:
+        return self.__width
+
+    def height(self) -> int:
+        return self.__height
+
+    @property
+    def canvas_x_range(self) -> tuple[float, float]:
+        return 0, self.width()
+
+    @property
+    def canvas_y_range(self) -> tuple[float, float]:
+        return self.height(), 0
+
+    @property
+    def point_count(self) -> int:
+        return sum(len(item.points) for item in self.items.values())
+
+    def __add(self, kind, points, tags=None):
+        if tags is None:
+            tags = ("graph",) if self.tag is None else ("graph", self.tag)
+        item_id = self.__next_id
+        self.__next_id += 1
+        self.items[item_id] = RecordedItem(kind, list(points), tags)
+        return item_id
+
+    def line(self, p1: tuple[int, int], p2: tuple[int, int]):
+        self._record((p1, p2))
+        return self.__add("line", (p1, p2))
+
+    def lines(self, points: list[tuple[int, int]]):
+        if len(points) < 2:
+            return
+        self._record(points)
+        return self.__add("line", points)
+
+    def polygon(self, points: list[tuple[int, int]]):
+        if len(points) < 3:
+            return
+        return self.__add("polygon", points)
+
+    def ellipse(self, p1: tuple[int, int], p2: tuple[int, int]):
+        self._record_ellipse(p1, p2)
+        return self.__add("oval", (p1, p2))
+
+    def circle(self, center: tuple[int, int], radius: int):
+        p1 = center[0] - radius, center[1] - radius
+        p2 = center[0] + radius + 1, center[1] + radius + 1
+        self._record_ellipse(p1, p2)
+        return self.__add("oval", (p1, p2))
+
+    def image(self, position: tuple[int, int], rows: list[list[str]], scale: int = 1):
+        if not rows or not rows[0]:
+            return
+        x, y = position
+        # only the area covered is kept, not the colors
+        return self.__add("image", ((x, y), (x + len(rows[0]) * scale, y + len(rows) * scale)))
+
+    def clear(self):
+        self.items.clear()
+
+    def delete(self, item):
+        if isinstance(item, int):
+            self.items.pop(item, None)
+            return
+        for item_id in [i for i, recorded in self.items.items() if item in recorded.tags]:
+            del self.items[item_id]
+
+    def scroll(self, dx: float, dy: float):
+        for item in self.items.values():
+            if "graph" in item.tags:
+                item.points = [(x + dx, y + dy) for x, y in item.points]
+        self.delete("background")
+        self.delete("foreground")
+        self.draw_background()
+        self.draw_foreground()
+
+    def resize(self, width: int, height: int):
+        old_width = self.__width
+        old_height = self.__height
+        self.x_range, self.y_range = resized_ranges(self, width, height)
+        self.__width = width
+        self.__height = height
+        self.scroll((width - old_width) / 2, (height - old_height) / 2)
+
+    def draw_background(self):
+        w = self.width()
+        h = self.height()
+        self.__add("rectangle", ((0, 0), (w, h)), ("background",))
+        for x in self._grid_x_lines():
+            x_canvas = self.x_plane_to_x_canvas(x)
+            self.__add("line", ((x_canvas, 0), (x_canvas, h)), ("background",))
+        for y in self._grid_y_lines():
+            y_canvas = self.y_plane_to_y_canvas(y)
+            self.__add("line", ((0, y_canvas), (w, y_canvas)), ("background",))
+
+    def draw_foreground(self):
+        for x in self._grid_x_lines():
+            self.__add("text", ((self.x_plane_to_x_canvas(x), self.y_plane_to_y_canvas(0)),), ("foreground",))
+        for y in self._grid_y_lines():
+            self.__add("text", ((self.x_plane_to_x_canvas(0), self.y_plane_to_y_canvas(y)),), ("foreground",))
@@ -0,0 +1,157 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from math import nan
+import threading
+
+# the min/max summary keeps the extremes of each bucket of SUMMARY_BUCKET samples
+SUMMARY_BUCKET = 64
+# samples, or summary buckets, read under the lock by one step of decimate
+DECIMATE_CHUNK = 4096
+
+
+class RingBuffer:
+    """Fixed capacity buffer of (x, y) samples, safe to fill from another thread.
+
+    Samples are addressed by their absolute index, the number of samples pushed
+    before them, so readers can ask for what arrived after their last read.
+    The capacity is rounded up to a multiple of SUMMARY_BUCKET."""
+
+    def __init__(self, capacity: int):
+        capacity = -(-capacity // SUMMARY_BUCKET) * SUMMARY_BUCKET
+        self.capacity = capacity
+        self.__xs = array("d", bytes(8 * capacity))
+        self.__ys = array("d", bytes(8 * capacity))
+        # the bucket starting at absolute index i is in slot i // SUMMARY_BUCKET
+        # modulo the number of buckets, nan until it has a sample that is not
+        self.__mins = array("d", bytes(8 * (capacity // SUMMARY_BUCKET)))
+        self.__maxs = array("d", bytes(8 * (capacity // SUMMARY_BUCKET)))
+        self.__total = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        return self.__total
+
+    @property
+    def first(self) -> int:
+        return max(self.__total - self.capacity, 0)
+
+    def __len__(self):
+        return min(self.__total, self.capacity)
+
+    def push(self, x: float, y: float):
+        self.extend((x,), (y,))
+
+    def extend(self, xs, ys):
+        with self.__lock:
+            start = self.__total
+            for x, y in zip(xs, ys):
+                pos = self.__total % self.capacity
+                self.__xs[pos] = x
+                self.__ys[pos] = y
+                self.__total += 1
+            self.__summarize(start, self.__total)
+
+    def __summarize(self, start, stop):
+        """updates the summary of the buckets with samples from start to stop"""
+        size = SUMMARY_BUCKET
+        buckets = len(self.__mins)
+        # from the start of the first bucket, its older samples may be from a previous extend
+        low = max(max(start, stop - self.capacity) // size * size, stop - self.capacity)
+        values = self.__slice(low, stop)[1]
+        total = sum(values)
+        for bucket in range(low // size, -(-stop // size)):
+            ys = values[max(bucket * size - low, 0):bucket * size + size - low]
+            if total != total:
+                ys = [y for y in ys if y == y]
+            slot = bucket % buckets
+            if ys:
+                self.__mins[slot] = min(ys)
+                self.__maxs[slot] = max(ys)
+            else:
+                self.__mins[slot] = self.__maxs[slot] = nan
+
+    def last(self) -> tuple[float, float] | None:
+        with self.__lock:
+            if self.__total == 0:
+                return None
+            pos = (self.__total - 1) % self.capacity
+            return self.__xs[pos], self.__ys[pos]
+
+    def __slice(self, start, stop):
+        cap = self.capacity
+        a = start % cap
+        b = a + stop - start
+        if b <= cap:
+            return self.__xs[a:b].tolist(), self.__ys[a:b].tolist()
+        b -= cap
+        return self.__xs[a:].tolist() + self.__xs[:b].tolist(), self.__ys[a:].tolist() + self.__ys[:b].tolist()
+
+    def read(self, since: int = 0) -> tuple[int, list[float], list[float]]:
+        """returns the absolute index of the first sample and the samples from
+        since (or the oldest one still stored) to the newest one"""
+        with self.__lock:
+            start = max(since, self.first)
+            return start, *self.__slice(start, self.__total)
+
+    def __index_range(self, x_min, x_max):
+        first = self.first
+        cap = self.capacity
+        xs = self.__xs
+
+        def key(i):
+            return xs[i % cap]
+
+        indices = range(first, self.__total)
+        start = max(bisect_left(indices, x_min, key=key) - 1, 0) + first
+        stop = min(bisect_right(indices, x_max, key=key) + 1, len(indices)) + first
+        return start, stop
+
+    def read_range(self, x_min: float, x_max: float) -> tuple[int, list[float], list[float]]:
+        """like read but only for the samples with x inside [x_min, x_max] plus one
+        sample on each side, the x values must be pushed in increasing order"""
+        with self.__lock:
+            start, stop = self.__index_range(x_min, x_max)
+            return start, *self.__slice(start, stop)
+
+    def decimate(self, x_min: float, x_max: float, columns: int):
+        """yields lists of (x, min_y, max_y) for the samples read_range would return:
+        one entry per sample if there are fewer than SUMMARY_BUCKET per column,
+        else one per bucket of the summary. The lock is only held while a list
+        is read, samples overwritten in between are skipped"""
+        with self.__lock:
+            start, stop = self.__index_range(x_min, x_max)
+        size = SUMMARY_BUCKET
+        if (stop - start) / max(columns, 1) < size:
+            raw_stop = stop
+        else:
+            # up to the first whole bucket, the one before may be partly overwritten
+            raw_stop = min(-(-start // size) * size, stop)
+
+        for lo in range(start, raw_stop, DECIMATE_CHUNK):
+            with self.__lock:
+                lo = max(lo, self.first)
+                hi = min(lo + DECIMATE_CHUNK, raw_stop)
+                if lo >= hi:
+                    continue
+                xs, ys = self.__slice(lo, hi)
+            yield list(zip(xs, ys, ys))
+        if raw_stop == stop:
+            return
+
+        cap = self.capacity
+        buckets = len(self.__mins)
+        last = -(-stop // size)
+        for lo in range(raw_stop // size, last, DECIMATE_CHUNK):
+            with self.__lock:
+                xs = self.__xs
+                mins = self.__mins
+                maxs = self.__maxs
+                first = self.first
+                chunk = [
+                    (xs[bucket * size % cap], mins[bucket % buckets], maxs[bucket % buckets])
+                    for bucket in range(lo, min(lo + DECIMATE_CHUNK, last))
+                    if bucket * size >= first
+                ]
+            if chunk:
+                yield chunk
@@ -0,0 +1,138 @@
+from math import atan2, hypot
+
+INITIAL_SAMPLES = 64
+MAX_SEGMENT = 6.0
+MIN_SEGMENT = 0.5
+MAX_TURN = 0.1
+MAX_DEPTH = 16
+MAX_EVALUATIONS = 50000
+# a segment still this long at the maximum depth is treated as a discontinuity
+BREAK_SEGMENT = 50.0
+
+
+def _outside(pa, pm, pb, rect):
+    """tells if the bounding box of the three points misses rect"""
+    min_x, min_y, max_x, max_y = rect
+    return max(pa[0], pm[0], pb[0]) < min_x or min(pa[0], pm[0], pb[0]) > max_x \
+        or max(pa[1], pm[1], pb[1]) < min_y or min(pa[1], pm[1], pb[1]) > max_y
+
+
+def _far_outside(pa, pb, rect):
+    """tells if the segment between pa and pb stays outside rect even if the
+    curve bulges out of it by as much as its length"""
+    if pa is None or pb is None:
+        return False
+    margin = hypot(pb[0] - pa[0], pb[1] - pa[1])
+    min_x, min_y, max_x, max_y = rect
+    return max(pa[0], pb[0]) + margin < min_x or min(pa[0], pb[0]) - margin > max_x \
+        or max(pa[1], pb[1]) + margin < min_y or min(pa[1], pb[1]) - margin > max_y
+
+
+def _needs_split(pa, pm, pb, rect, max_segment, max_turn):
+    if pa is None or pb is None or pm is None:
+        return pa is not None or pb is not None
+    if rect is not None and _outside(pa, pm, pb, rect):
+        return False
+    ax, ay = pm[0] - pa[0], pm[1] - pa[1]
+    bx, by = pb[0] - pm[0], pb[1] - pm[1]
+    length = hypot(ax, ay) + hypot(bx, by)
+    if length > max_segment:
+        return True
+    if length > MIN_SEGMENT:
+        return abs(atan2(ax * by - ay * bx, ax * bx + ay * by)) > max_turn
+    return False
+
+
+def adaptive_sample(points, t0: float, t1: float, rect=None, **kwargs) -> list[list[tuple[float, float]]]:
+    """Samples a curve all at once, see adaptive_sample_iter."""
+    steps = adaptive_sample_iter(points, t0, t1, rect, **kwargs)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+def adaptive_sample_iter(points, t0: float, t1: float, rect=None,
+                         initial_samples: int = INITIAL_SAMPLES,
+                         max_segment: float = MAX_SEGMENT,
+                         max_turn: float = MAX_TURN,
+                         max_depth: int = MAX_DEPTH,
+                         max_evaluations: int = MAX_EVALUATIONS):
+    """Samples a curve given by points, which maps a list of values of t to
+    their points in canvas coordinates, or to None where the curve is not
+    defined.
+
+    An interval is split while its on-screen length is above max_segment pixels
+    or while it turns by more than max_turn radians. Intervals whose points all
+    lie outside rect, given as (min_x, min_y, max_x, max_y), are never split and
+    those far enough from it are not even evaluated. All
+    the intervals of one level are refined with a single call to points.
+    Yields after each level and returns the continuous runs of points, use
+    it with "runs = yield from adaptive_sample_iter(...)"."""
+
+    if rect is not None:
+        # inflated so that curves just outside the edges are still refined
+        rect = (
+            min(rect[0], rect[2]) - max_segment, min(rect[1], rect[3]) - max_segment,
+            max(rect[0], rect[2]) + max_segment, max(rect[1], rect[3]) + max_segment
+        )
+
+    ts = [t0 + (t1 - t0) * i / initial_samples for i in range(initial_samples + 1)]
+    pts = points(ts)
+    evaluations = len(pts)
+    # active[i] tells if the interval between ts[i] and ts[i + 1] must be refined
+    active = [True] * initial_samples
+
+    for _ in range(max_depth):
+        if rect is not None:
+            for i, is_active in enumerate(active):
+                if is_active and _far_outside(pts[i], pts[i + 1], rect):
+                    active[i] = False
+        if not any(active):
+            break
+        to_refine = [i for i, is_active in enumerate(active) if is_active]
+        if evaluations + len(to_refine) > max_evaluations:
+            break
+        mids = [(ts[i] + ts[i + 1]) / 2 for i in to_refine]
+        mid_pts = points(mids)
+        evaluations += len(mids)
+
+        new_ts = []
+        new_pts = []
+        new_active = []
+        j = 0
+        for i in range(len(active)):
+            new_ts.append(ts[i])
+            new_pts.append(pts[i])
+            if not active[i]:
+                new_active.append(False)
+                continue
+            tm = mids[j]
+            pm = mid_pts[j]
+            j += 1
+            split = _needs_split(pts[i], pm, pts[i + 1], rect, max_segment, max_turn)
+            new_ts.append(tm)
+            new_pts.append(pm)
+            new_active.append(split)
+            new_active.append(split)
+        new_ts.append(ts[-1])
+        new_pts.append(pts[-1])
+        ts, pts, active = new_ts, new_pts, new_active
+        yield
+
+    runs = []
+    run = [pts[0]] if pts[0] is not None else []
+    for i in range(1, len(pts)):
+        pa = pts[i - 1]
+        pb = pts[i]
+        if pb is None or (active[i - 1] and pa is not None
+                          and hypot(pb[0] - pa[0], pb[1] - pa[1]) > BREAK_SEGMENT):
+            if len(run) > 1:
+                runs.append(run)
+            run = []
+        if pb is not None:
+            run.append(pb)
+    if len(run) > 1:
+        runs.append(run)
+    return runs
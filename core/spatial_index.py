@@ -0,0 +1,123 @@
+from math import floor, ceil, hypot
+
+CELL_SIZE = 16
+
+
+def _closest_on_segment(px, py, x1, y1, x2, y2):
+    """returns the parameter along the segment of the point closest to (px, py)
+    and the distance between the two"""
+    dx = x2 - x1
+    dy = y2 - y1
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        t = 0.0
+    else:
+        t = min(max(((px - x1) * dx + (py - y1) * dy) / length_sq, 0.0), 1.0)
+    return t, hypot(x1 + t * dx - px, y1 + t * dy - py)
+
+
+class SegmentHit:
+    def __init__(self, owner, p1, p2, t, distance):
+        self.owner = owner
+        self.p1 = p1
+        self.p2 = p2
+        self.t = t
+        self.distance = distance
+
+    @property
+    def point(self) -> tuple[float, float]:
+        return self.p1[0] + (self.p2[0] - self.p1[0]) * self.t, self.p1[1] + (self.p2[1] - self.p1[1]) * self.t
+
+    @property
+    def length(self) -> float:
+        return hypot(self.p2[0] - self.p1[0], self.p2[1] - self.p1[1])
+
+
+class SegmentIndex:
+    """Uniform grid over the segments drawn on the canvas, in canvas coordinates."""
+
+    def __init__(self, cell_size: float = CELL_SIZE):
+        self.cell_size = cell_size
+        self.__cells: dict[tuple[int, int], list[int]] = {}
+        self.__segments: list[tuple[float, float, float, float]] = []
+        self.__owners: list = []
+        self.__by_owner: dict[int, list[int]] = {}
+        self.__removed: set[int] = set()
+
+    def __len__(self):
+        return len(self.__segments) - len(self.__removed)
+
+    def clear(self):
+        self.__cells.clear()
+        self.__segments.clear()
+        self.__owners.clear()
+        self.__by_owner.clear()
+        self.__removed.clear()
+
+    def remove_owner(self, owner):
+        """forgets the segments of owner, they are skipped by the queries until
+        they outnumber the others and the index is built again without them"""
+        self.__removed.update(self.__by_owner.pop(id(owner), ()))
+        if len(self.__removed) > len(self):
+            self.__compact()
+
+    def __compact(self):
+        live = [
+            (self.__owners[idx], *self.__segments[idx])
+            for idx in range(len(self.__segments)) if idx not in self.__removed
+        ]
+        self.clear()
+        for segment in live:
+            self.__add(*segment)
+
+    def add_segment(self, owner, p1, p2):
+        self.__add(owner, p1[0], p1[1], p2[0], p2[1])
+
+    def __add(self, owner, x1, y1, x2, y2):
+        idx = len(self.__segments)
+        self.__segments.append((x1, y1, x2, y2))
+        self.__owners.append(owner)
+        self.__by_owner.setdefault(id(owner), []).append(idx)
+
+        # every cell crossed by the segment is either marked or next to a
+        # marked one, nearest() always looks one cell further to account for it
+        size = self.cell_size
+        steps = max(int(hypot(x2 - x1, y2 - y1) / size), 0) + 1
+        prev_cell = None
+        for i in range(steps + 1):
+            t = i / steps
+            cell = floor((x1 + (x2 - x1) * t) / size), floor((y1 + (y2 - y1) * t) / size)
+            if cell != prev_cell:
+                self.__cells.setdefault(cell, []).append(idx)
+                prev_cell = cell
+
+    def add_polyline(self, owner, points):
+        for i in range(1, len(points)):
+            self.add_segment(owner, points[i - 1], points[i])
+
+    def add_coords(self, owner, coords):
+        """adds the segments of a polyline given as flat x, y coordinates"""
+        for i in range(2, len(coords) - 1, 2):
+            self.__add(owner, coords[i - 2], coords[i - 1], coords[i], coords[i + 1])
+
+    def nearest(self, x: float, y: float, max_distance: float) -> SegmentHit | None:
+        size = self.cell_size
+        reach = ceil(max_distance / size) + 1
+        cx = floor(x / size)
+        cy = floor(y / size)
+
+        best = None
+        best_distance = max_distance
+        seen = set()
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                for idx in self.__cells.get((i, j), ()):
+                    if idx in seen or idx in self.__removed:
+                        continue
+                    seen.add(idx)
+                    x1, y1, x2, y2 = self.__segments[idx]
+                    t, distance = _closest_on_segment(x, y, x1, y1, x2, y2)
+                    if distance <= best_distance:
+                        best_distance = distance
+                        best = SegmentHit(self.__owners[idx], (x1, y1), (x2, y2), t, distance)
+        return best
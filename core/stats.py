@@ -0,0 +1,11 @@
+class Stats:
+    """Counters read by the replay harness, cheap enough to be always kept."""
+
+    def __init__(self):
+        self.evaluations = 0
+
+    def reset(self):
+        self.evaluations = 0
+
+
+STATS = Stats()
@@ -0,0 +1,122 @@
+import platform
+import select
+import socket
+import sys
+import threading
+
+from .ring_buffer import RingBuffer
+
+READ_SIZE = 65536
+# a reader waiting for data on a pipe or a file checks this often if it was stopped
+STOP_POLL_S = 0.1
+
+
+def open_source(source: str):
+    """'-' reads from stdin, 'tcp:host:port' connects to a socket, anything else
+    is opened as a file (a named pipe, a device or a regular file)"""
+    if source == "-":
+        return sys.stdin.buffer, None
+    if source.startswith("tcp:"):
+        host, port = source[4:].rsplit(":", 1)
+        sock = socket.create_connection((host, int(port)))
+        return sock.makefile("rb"), sock
+    return open(source, "rb"), None
+
+
+class StreamReader(threading.Thread):
+    """Reads lines of 'x y' or 'y' samples from a source into a ring buffer,
+    for 'y' lines x is the index of the sample"""
+
+    def __init__(self, source: str, buffer: RingBuffer):
+        super().__init__(daemon=True)
+        self.source = source
+        self.buffer = buffer
+        self.error: str | None = None
+        self.__index = 0
+        self.__stopped = False
+        # the handles are set by run, stop closes them
+        self.__lock = threading.Lock()
+        self.__stream = None
+        self.__socket: socket.socket | None = None
+
+    def stop(self):
+        with self.__lock:
+            self.__stopped = True
+            self.__close()
+
+    def __close(self):
+        """closes the handles, the lock must be held"""
+        if self.__socket is not None:
+            # wakes up the blocked read, closing the file would wait for it
+            try:
+                self.__socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self.__stream is not None and self.__stream is not sys.stdin.buffer:
+            self.__stream.close()
+        if self.__socket is not None:
+            self.__socket.close()
+        self.__stream = None
+        self.__socket = None
+
+    def __parse(self, lines):
+        xs = []
+        ys = []
+        for line in lines:
+            parts = line.replace(b",", b" ").replace(b";", b" ").split()
+            try:
+                if len(parts) == 1:
+                    x = float(self.__index)
+                    y = float(parts[0])
+                elif len(parts) >= 2:
+                    x = float(parts[0])
+                    y = float(parts[1])
+                else:
+                    continue
+            except ValueError:
+                continue
+            xs.append(x)
+            ys.append(y)
+            self.__index += 1
+        return xs, ys
+
+    def __wait(self, stream) -> bool:
+        """if there is data to read, after at most STOP_POLL_S; closing a pipe
+        does not wake up a blocked read so it is only read when ready, a socket
+        is woken up by stop and Windows cannot wait on anything else"""
+        if self.__socket is not None or platform.system() == "Windows":
+            return True
+        return bool(select.select([stream], [], [], STOP_POLL_S)[0])
+
+    def run(self):
+        try:
+            # outside the lock, opening a named pipe waits for a writer
+            stream, sock = open_source(self.source)
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+            return
+        with self.__lock:
+            self.__stream = stream
+            self.__socket = sock
+            if self.__stopped:
+                self.__close()
+                return
+
+        pending = b""
+        try:
+            while not self.__stopped:
+                if not self.__wait(stream):
+                    continue
+                data = stream.read1(READ_SIZE)
+                if not data:
+                    break
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                self.buffer.extend(*self.__parse(lines))
+        except (OSError, ValueError) as e:
+            # reading a handle closed by stop is not an error
+            if not self.__stopped:
+                self.error = str(e)
+        finally:
+            with self.__lock:
+                self.__close()
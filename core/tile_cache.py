@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from array import array
+from math import floor, log2, isfinite, isnan, nan
+
+TILE_SIZE = 256
+DEFAULT_MAX_SAMPLES = 2_000_000
+
+
+class TileCache:
+    """Least recently used cache of tiles of samples, limited by the total
+    number of samples stored."""
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.__tiles: OrderedDict = OrderedDict()
+        self.__size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__tiles)
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def get(self, key):
+        tile = self.__tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__tiles.move_to_end(key)
+        return tile
+
+    def peek(self, key):
+        """like get, but neither counted nor marked as recently used"""
+        return self.__tiles.get(key)
+
+    def put(self, key, tile):
+        old = self.__tiles.pop(key, None)
+        if old is not None:
+            self.__size -= len(old)
+        self.__tiles[key] = tile
+        self.__size += len(tile)
+        while self.__size > self.max_samples and len(self.__tiles) > 1:
+            _, evicted = self.__tiles.popitem(last=False)
+            self.__size -= len(evicted)
+
+    def clear(self):
+        self.__tiles.clear()
+        self.__size = 0
+
+
+TILE_CACHE = TileCache()
+
+
+def sample_step(span: float, pixels: int) -> tuple[int, float]:
+    """returns the zoom level and the largest power of two not above the size
+    of a pixel, so that the samples of the same level always line up"""
+    level = floor(log2(abs(span) / max(abs(pixels), 1)))
+    return level, 2.0 ** level
+
+
+def interpolate_cached(key, v: float, level: int, cache: TileCache = TILE_CACHE) -> float | None:
+    """the value at v interpolated between the samples of level on each side
+    of it, None if they are not cached or not defined"""
+    if key is None:
+        return None
+    position = v / 2.0 ** level
+    index = floor(position)
+    values = []
+    for i in (index, index + 1):
+        tile = cache.peek((key, level, i // TILE_SIZE))
+        if tile is None or isnan(tile[i % TILE_SIZE]):
+            return None
+        values.append(tile[i % TILE_SIZE])
+    return values[0] + (values[1] - values[0]) * (position - index)
+
+
+def _compute_tile(evaluate_many, xs):
+    tile = array("d")
+    for y in evaluate_many(xs):
+        if isinstance(y, (float, int)) and isfinite(y):
+            tile.append(y)
+        else:
+            tile.append(nan)
+    return tile
+
+
+def sample_tiles(key, evaluate_many, min_v: float, max_v: float, pixels: int, cache: TileCache = TILE_CACHE):
+    """Yields (v, f(v)) for v on a regular grid covering [min_v, max_v] with at
+    least one sample per pixel, f(v) is nan where the function is not defined.
+
+    evaluate_many maps a list of values to a list of results, the samples are
+    cached in tiles of TILE_SIZE values identified by key, the zoom level and
+    the position of the tile, key should change whenever the function does.
+    With a key of None nothing is cached."""
+    if min_v > max_v:
+        min_v, max_v = max_v, min_v
+    if min_v == max_v:
+        return
+    level, step = sample_step(max_v - min_v, pixels)
+    tile_span = TILE_SIZE * step
+    first_tile = floor(min_v / tile_span)
+    last_tile = floor(max_v / tile_span)
+
+    for tile_idx in range(first_tile, last_tile + 1):
+        start = tile_idx * TILE_SIZE
+        xs = [(start + i) * step for i in range(TILE_SIZE)]
+        tile = None
+        if key is not None:
+            tile = cache.get((key, level, tile_idx))
+        if tile is None:
+            tile = _compute_tile(evaluate_many, xs)
+            if key is not None:
+                cache.put((key, level, tile_idx), tile)
+
+        for x, y in zip(xs, tile):
+            if min_v - step <= x <= max_v + step:
+                yield x, y
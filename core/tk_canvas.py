@@ -0,0 +1,187 @@
+from itertools import chain
+import tkinter as tk
+from tkinter import font as tk_font
+
+from .graph_canvas import GraphCanvasBase
+from .polyline import Polyline
+from .viewport import resized_ranges
+
+
+class GraphCanvas(GraphCanvasBase):
+    native_ellipse = True
+    supports_images = True
+
+    def __init__(self, canvas: tk.Canvas, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.canvas = canvas
+        # Tk does not keep the images shown by the canvas alive
+        self.__images: dict[int, tk.PhotoImage] = {}
+        self.__width = int(canvas.cget("width"))
+        self.__height = int(canvas.cget("height"))
+
+    def __tags(self):
+        return "graph" if self.tag is None else ("graph", self.tag)
+
+    def width(self) -> int:
+        return self.__width
+
+    def height(self) -> int:
+        return self.__height
+
+    def resize(self, width: int, height: int):
+        """changes the size of the drawing area keeping the scale and the center
+        of the view, what is already drawn is moved to match"""
+        old_width = self.__width
+        old_height = self.__height
+        self.x_range, self.y_range = resized_ranges(self, width, height)
+        self.__width = width
+        self.__height = height
+        self.scroll((width - old_width) / 2, (height - old_height) / 2)
+
+    @property
+    def canvas_x_range(self) -> tuple[float, float]:
+        return 0, self.width()
+
+    @property
+    def canvas_y_range(self) -> tuple[float, float]:
+        return self.height(), 0
+
+    def line(self, p1: tuple[int, int], p2: tuple[int, int]):
+        self._record((p1, p2))
+        return self.canvas.create_line(*p1, *p2, fill=self.color, width=self.line_width, tags=self.__tags())
+
+    def lines(self, points: list[tuple[int, int]]):
+        if len(points) < 2:
+            return
+        self._record(points)
+        return self.canvas.create_line(*chain(points), fill=self.color, width=self.line_width, tags=self.__tags())
+
+    def polyline(self, polyline: Polyline) -> list:
+        items = []
+        for run in polyline.runs():
+            self._record_coords(run)
+            # tkinter flattens a list of numbers into the coordinates itself
+            items.append(self.canvas.create_line(
+                run.tolist(), fill=self.color, width=self.line_width, tags=self.__tags()
+            ))
+        return items
+
+    def polygon(self, points: list[tuple[int, int]]):
+        if len(points) < 3:
+            return
+        return self.canvas.create_polygon(
+            *chain(points), fill=self.color, outline="", stipple="gray25", tags=self.__tags()
+        )
+
+    def ellipse(self, p1: tuple[int, int], p2: tuple[int, int]):
+        self._record_ellipse(p1, p2)
+        return self.canvas.create_oval(*p1, *p2, outline=self.color, width=self.line_width, tags=self.__tags())
+
+    def circle(self, center: tuple[int, int], radius: int):
+        x1 = center[0] - radius
+        y1 = center[1] - radius
+        x2 = center[0] + radius + 1
+        y2 = center[1] + radius + 1
+        self._record_ellipse((x1, y1), (x2, y2))
+        return self.canvas.create_oval(x1, y1, x2, y2, outline=self.color, width=self.line_width, tags=self.__tags())
+
+    def image(self, position: tuple[int, int], rows: list[list[str]], scale: int = 1):
+        if not rows or not rows[0]:
+            return
+        photo = tk.PhotoImage(master=self.canvas, width=len(rows[0]), height=len(rows))
+        # a single put for all the rows, Tk parses them much faster than it runs one command per pixel
+        photo.put(" ".join("{" + " ".join(row) + "}" for row in rows))
+        if scale > 1:
+            photo = photo.zoom(scale)
+        item = self.canvas.create_image(*position, image=photo, anchor=tk.NW, tags=self.__tags())
+        self.__images[item] = photo
+        return item
+
+    def clear(self):
+        self.canvas.delete("all")
+        self.__images.clear()
+
+    def delete(self, item):
+        if self.__images:
+            for item_id in ((item,) if isinstance(item, int) else self.canvas.find_withtag(item)):
+                self.__images.pop(item_id, None)
+        self.canvas.delete(item)
+
+    def scroll(self, dx: float, dy: float):
+        """moves what the graphers drew by (dx, dy) pixels and redraws the axes,
+        the caller is expected to have already moved x_range and y_range"""
+        self.canvas.move("graph", dx, dy)
+        self.canvas.delete("background", "foreground")
+        self.draw_background()
+        self.canvas.tag_lower("background")
+        self.draw_foreground()
+
+    def draw_background(self):
+        w = self.width()
+        h = self.height()
+
+        self.canvas.create_rectangle(0, 0, w, h, width=0, fill="#FFFFFF", tags="background")
+
+        for x in self._grid_x_lines():
+            x_canvas = self.x_plane_to_x_canvas(x)
+            self.canvas.create_line(x_canvas, 0, x_canvas, h, fill="#DDDDDD", tags="background")
+
+        for y in self._grid_y_lines():
+            y_canvas = self.y_plane_to_y_canvas(y)
+            self.canvas.create_line(0, y_canvas, w, y_canvas, fill="#DDDDDD", tags="background")
+
+        y_x_line = self.y_plane_to_y_canvas(0)
+        x_y_line = self.x_plane_to_x_canvas(0)
+        self.canvas.create_line(0, y_x_line, w, y_x_line, fill="#000000", arrow=tk.LAST, tags="background")
+        self.canvas.create_line(x_y_line, 0, x_y_line, h, fill="#000000", arrow=tk.FIRST, tags="background")
+
+    def __draw_x_coordinate(self, x, y, font, text):
+        line_height = font.metrics("linespace")
+        y += 5
+        color = "#000000"
+        if y < 5:
+            y = 5
+            color = "#888888"
+        elif y > self.height() - line_height - 5:
+            y = self.height() - line_height - 5
+            color = "#888888"
+        self.canvas.create_text(x, y, text=text, fill=color, anchor="n", tags="foreground")
+
+    def __draw_y_coordinate(self, x, y, font, text):
+        line_width = font.measure(text)
+        x -= 5
+        color = "#000000"
+        if x > self.width() - 5:
+            x = self.width() - 5
+            color = "#888888"
+        elif x < line_width + 5:
+            x = line_width + 5
+            color = "#888888"
+        self.canvas.create_text(x, y, text=text, fill=color, anchor="e", tags="foreground")
+
+    def draw_foreground(self):
+        font = tk_font.Font(font="TkDefaultFont")
+
+        x_lines = self._grid_x_lines()
+        y_lines = self._grid_y_lines()
+        if self.stride > 1:
+            x_lines = self._every_other(x_lines)
+            y_lines = self._every_other(y_lines)
+
+        y_center = self.y_plane_to_y_canvas(0)
+        for x in x_lines:
+            if x == 0:
+                continue
+            x_canvas = self.x_plane_to_x_canvas(x)
+            text = str(int(x)) if int(x) == x and abs(x) < 10000 else f"{float(x): .6g}"
+            self.__draw_x_coordinate(x_canvas, y_center, font, text)
+
+        x_center = self.x_plane_to_x_canvas(0)
+        for y in y_lines:
+            if y == 0:
+                continue
+            y_canvas = self.y_plane_to_y_canvas(y)
+            text = str(int(y)) if int(y) == y and abs(y) < 10000 else f"{float(y): .6g}"
+            self.__draw_y_coordinate(x_center, y_canvas, font, text)
+
+        self.canvas.create_text(x_center - 5, y_center + 5, text="0", fill="#000000", anchor="ne", tags="foreground")
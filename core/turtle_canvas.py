@@ -3,7 +3,29 @@ import turtle as t
 import math
 
 
+def _ellipse_steps(a, b, tolerance=0.5):
+    """number of segments needed so that the chord error stays below tolerance pixels"""
+    r = max(abs(a), abs(b))
+    if r <= tolerance:
+        return 4
+    step = 2 * math.acos(1 - tolerance / r)
+    return max(int(math.ceil(2 * math.pi / step)), 4)
+
+
 class TurtleCanvas(GraphCanvasBase):
+    # ellipse() picks its number of segments from the curvature
+    native_ellipse = True
+
+    def __init__(self, *args, batched=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batched = batched
+        if batched:
+            self.__disable_tracing()
+
+    def __disable_tracing(self):
+        t.tracer(0, 0)
+        t.hideturtle()
+
     def width(self) -> int:
         return t.screensize()[0]
 
@@ -33,6 +55,8 @@ class TurtleCanvas(GraphCanvasBase):
         t.penup()
 
     def lines(self, points):
+        if not points:
+            return
         self.__set_style()
         t.penup()
         t.goto(*points[0])
@@ -41,13 +65,24 @@ class TurtleCanvas(GraphCanvasBase):
             t.goto(*p)
         t.penup()
 
+    def polygon(self, points):
+        if len(points) < 3:
+            return
+        self.__set_style()
+        t.penup()
+        t.goto(*points[0])
+        t.begin_fill()
+        for p in points[1:]:
+            t.goto(*p)
+        t.end_fill()
+
     def circle(self, center: tuple[int, int], radius: int):
         self.__set_style()
         t.penup()
         t.seth(0)
         t.goto(center[0], center[1] - radius)
         t.pendown()
-        t.circle(radius)
+        t.circle(radius, steps=_ellipse_steps(radius, radius) if self.batched else None)
         t.penup()
 
     def ellipse(self, p1: tuple[int, int], p2: tuple[int, int]):
@@ -56,13 +91,12 @@ class TurtleCanvas(GraphCanvasBase):
         a = (p2[0] - p1[0]) / 2
         b = (p2[1] - p1[1]) / 2
 
-        # ensure that there is at least one step per pixel
-        r_max = int(max(a, b) * 4)
-        if r_max == 0:
+        if a == 0 or b == 0:
             return
 
-        for i in range(r_max + 1):
-            k = i / r_max * math.pi * 2
+        steps = _ellipse_steps(a, b)
+        for i in range(steps + 1):
+            k = i / steps * math.pi * 2
             x = a * math.sin(k) + a
             y = b * math.cos(k) + b
             t.goto(x + p1[0], y + p1[1])
@@ -71,6 +105,13 @@ class TurtleCanvas(GraphCanvasBase):
 
     def clear(self):
         t.clearscreen()
+        if self.batched:
+            # clearing the screen turns tracing back on
+            self.__disable_tracing()
+
+    def flush(self):
+        if self.batched:
+            t.update()
 
     def draw_background(self):
         min_xc, max_xc = self.canvas_x_range
@@ -79,14 +120,16 @@ class TurtleCanvas(GraphCanvasBase):
         prev_color = self.color
         self.color = "#DDDDDD"
         min_x, max_x = self.x_range
-        for x in range(int(math.floor(min_x)), int(math.ceil(max_x))):
-            x_canvas = self.x_plane_to_x_canvas(x)
-            self.line((x_canvas, min_yc), (x_canvas, max_yc))
+        for x in self._grid_x_lines():
+            if min_x <= x <= max_x:
+                x_canvas = self.x_plane_to_x_canvas(x)
+                self.line((x_canvas, min_yc), (x_canvas, max_yc))
 
         min_y, max_y = self.y_range
-        for y in range(int(math.floor(min_y)), int(math.ceil(max_y))):
-            y_canvas = self.y_plane_to_y_canvas(y)
-            self.line((min_xc, y_canvas), (max_xc, y_canvas))
+        for y in self._grid_y_lines():
+            if min_y <= y <= max_y:
+                y_canvas = self.y_plane_to_y_canvas(y)
+                self.line((min_xc, y_canvas), (max_xc, y_canvas))
 
         self.color = "#000000"
 
@@ -105,4 +148,4 @@ class TurtleCanvas(GraphCanvasBase):
         self.color = prev_color
 
     def draw_foreground(self):
-        pass
+        self.flush()
@@ -0,0 +1,64 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .graph_canvas import GraphCanvasBase
+
+ZOOM_FACTOR = 9 / 10
+
+
+def panned_ranges(graph_canvas: "GraphCanvasBase", initial_x_range, initial_y_range, initial_cart,
+                  x_canvas: float, y_canvas: float):
+    """the ranges that put the plane point initial_cart, grabbed while the view
+    was initial_x_range, initial_y_range, under (x_canvas, y_canvas)"""
+    graph_canvas.x_range = initial_x_range
+    graph_canvas.y_range = initial_y_range
+
+    diff_x = initial_cart[0] - graph_canvas.x_canvas_to_x_plane(x_canvas)
+    diff_y = initial_cart[1] - graph_canvas.y_canvas_to_y_plane(y_canvas)
+
+    return (
+        (initial_x_range[0] + diff_x, initial_x_range[1] + diff_x),
+        (initial_y_range[0] + diff_y, initial_y_range[1] + diff_y)
+    )
+
+
+def zoomed_ranges(graph_canvas: "GraphCanvasBase", x_canvas: float, y_canvas: float, step: int):
+    """the ranges after zooming in, for a positive step, or out around
+    (x_canvas, y_canvas), None when step is 0"""
+    if step == 0:
+        return None
+
+    min_x, max_x = graph_canvas.x_range
+    min_y, max_y = graph_canvas.y_range
+    x = graph_canvas.x_canvas_to_x_plane(x_canvas)
+    y = graph_canvas.y_canvas_to_y_plane(y_canvas)
+    x_range = max_x - min_x
+    y_range = max_y - min_y
+
+    factor = ZOOM_FACTOR if step > 0 else 1 / ZOOM_FACTOR
+    x_diff = x_range - x_range * factor
+    y_diff = y_range - y_range * factor
+    x_weight = .5 if x_range == 0 else (x - min_x) / x_range
+    y_weight = .5 if y_range == 0 else (y - min_y) / y_range
+
+    return (
+        (min_x + x_diff * x_weight, max_x - x_diff * (1 - x_weight)),
+        (min_y + y_diff * y_weight, max_y - y_diff * (1 - y_weight))
+    )
+
+
+def resized_ranges(graph_canvas: "GraphCanvasBase", width: int, height: int):
+    """the ranges that keep the scale and the center of the view once the
+    canvas is width by height pixels"""
+    old_width = graph_canvas.width()
+    old_height = graph_canvas.height()
+    min_x, max_x = graph_canvas.x_range
+    min_y, max_y = graph_canvas.y_range
+    x_scale = (max_x - min_x) / old_width if old_width else 0
+    y_scale = (max_y - min_y) / old_height if old_height else 0
+    x_center = (min_x + max_x) / 2
+    y_center = (min_y + max_y) / 2
+    return (
+        (x_center - x_scale * width / 2, x_center + x_scale * width / 2),
+        (y_center - y_scale * height / 2, y_center + y_scale * height / 2)
+    )
@@ -0,0 +1,75 @@
+import argparse
+import sys
+
+from core import parse_func, ParseFuncError, FunctionGraphX, FunctionGraphY
+from core.export import range_chunks, value_chunks, evaluate_chunks, grapher_evaluator, write_csv, write_binary
+
+
+def grapher_function(name: str, params: list[str]):
+    from application.registry import REGISTRY
+    # the class name of each grapher, read from the manifests without importing them
+    names = {REGISTRY.target(type_).partition(":")[2]: type_ for type_ in REGISTRY.names()}
+    grapher_class = REGISTRY.load(names[name]) if name in names else None
+    if grapher_class is None or not issubclass(grapher_class, (FunctionGraphX, FunctionGraphY)):
+        choices = [class_name for class_name, type_ in names.items()
+                   if issubclass(REGISTRY.load(type_), (FunctionGraphX, FunctionGraphY))]
+        sys.exit(f"unknown grapher {name!r}, choose one of: {', '.join(choices)}")
+    grapher = grapher_class(None)
+    for param in params:
+        param_name, _, text = param.partition("=")
+        grapher.params.set_text(param_name, text)
+    if not grapher.params.available():
+        sys.exit(f"missing parameters, {name} needs: {', '.join(grapher.params.text_names())}")
+    return grapher_evaluator(grapher)
+
+
+def read_values(path: str):
+    file = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    with file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield float(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Writes a table of values of a function")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("expression", nargs="?", help="a function of x, e.g. 'sin(x)/x'")
+    source.add_argument("--grapher", help="the class name of a built-in grapher, e.g. Sine")
+    parser.add_argument("--param", action="append", default=[], help="NAME=VALUE for the grapher parameters")
+    parser.add_argument("--start", type=float, default=0)
+    parser.add_argument("--stop", type=float, default=1)
+    parser.add_argument("--step", type=float, default=0.01)
+    parser.add_argument("--xs", help="file with one x per line, '-' for stdin, instead of start/stop/step")
+    parser.add_argument("--format", choices=("csv", "f64"), default="csv",
+                        help="csv text or native float64 (x, y) pairs, readable by the data series grapher")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout")
+    args = parser.parse_args()
+
+    if args.grapher is not None:
+        evaluate_many = grapher_function(args.grapher, args.param)
+    else:
+        ast = parse_func(args.expression, "x")
+        if isinstance(ast, ParseFuncError):
+            sys.exit(f"invalid expression: {ast.msg}")
+        evaluate_many = ast.evaluate_many
+
+    if args.xs is not None:
+        chunks = value_chunks(read_values(args.xs))
+    else:
+        chunks = range_chunks(args.start, args.stop, args.step)
+    rows = evaluate_chunks(evaluate_many, chunks)
+
+    if args.format == "csv":
+        file = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        with file:
+            write_csv(file, rows)
+    else:
+        file = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        with file:
+            write_binary(file, rows)
+
+
+if __name__ == "__main__":
+    main()
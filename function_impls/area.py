@@ -0,0 +1,61 @@
+from math import isfinite
+
+from core import GrapherBase, AreaInput, InputBase, cumulative_integral, IntegralResult
+
+
+def _describe(result: IntegralResult) -> str:
+    text = f"∫ = {result.value:.10g} ± {result.error:.2g}, {result.evaluations} evaluations"
+    if not result.converged:
+        text += ", not converged"
+    if result.singularities:
+        text += f", singular near x = {result.singularities[0]:.6g}"
+    return text
+
+
+class Area(GrapherBase):
+    @staticmethod
+    def get_params() -> InputBase:
+        return AreaInput("∫ f(x) dx from a to b", "f(x)", "$a$ ≤ x ≤ $b$")
+
+    def integral(self) -> IntegralResult | None:
+        if not self.params.available():
+            return None
+        return cumulative_integral(self.params.cache_key(), self.params.evaluate_many, self.params["a"], self.params["b"])
+
+    def graph(self):
+        result = self.integral()
+        if result is None:
+            self.params.show_result("")
+            return
+        self.params.show_result(_describe(result))
+
+        a = min(self.params["a"], self.params["b"])
+        b = max(self.params["a"], self.params["b"])
+        min_x, max_x = self.graph_canvas.x_range
+        min_y, max_y = self.graph_canvas.y_range
+        a = max(a, min_x)
+        b = min(b, max_x)
+        if a >= b:
+            return
+
+        xc_start = self.graph_canvas.x_plane_to_x_canvas(a)
+        xc_end = self.graph_canvas.x_plane_to_x_canvas(b)
+        columns = max(int(abs(xc_end - xc_start) / self.graph_canvas.stride), 1)
+        xs = [a + (b - a) * i / columns for i in range(columns + 1)]
+        zero = self.graph_canvas.y_plane_to_y_canvas(min(max(0, min_y), max_y))
+
+        curve = []
+        for x, y in zip(xs, self.params.evaluate_many(xs)):
+            if not isinstance(y, (float, int)) or not isfinite(y):
+                self.__fill(curve, zero)
+                curve = []
+                continue
+            y = min(max(y, min_y), max_y)
+            curve.append((self.graph_canvas.x_plane_to_x_canvas(x), self.graph_canvas.y_plane_to_y_canvas(y)))
+        self.__fill(curve, zero)
+
+    def __fill(self, curve, zero):
+        if len(curve) < 2:
+            return
+        self.graph_canvas.polygon([(curve[0][0], zero), *curve, (curve[-1][0], zero)])
+        self.graph_canvas.lines(curve)
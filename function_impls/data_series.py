@@ -0,0 +1,50 @@
+from core import GrapherBase, FileInput, InputBase, MappedSeries
+from core.data_series import column_points
+
+
+class DataSeries(GrapherBase):
+    def __init__(self, graph_canvas):
+        super().__init__(graph_canvas)
+        self.__series: MappedSeries | None = None
+
+    @staticmethod
+    def get_params() -> InputBase:
+        return FileInput("Data series")
+
+    def __get_series(self):
+        path = self.params["path"]
+        if self.__series is None or self.__series.path != path:
+            self.__close_series()
+            self.__series = MappedSeries(path)
+        return self.__series
+
+    def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
+        if not self.params.available():
+            return
+
+        try:
+            series = self.__get_series()
+            # a large file is converted and indexed over several frames
+            yield from series.prepare_iter()
+            if len(series) == 0:
+                return
+        except (OSError, ValueError):
+            return
+
+        min_x, max_x = self.graph_canvas.x_range
+        min_xc, max_xc = self.graph_canvas.canvas_x_range
+        samples = series.decimate(min_x, max_x, abs(max_xc - min_xc) // self.graph_canvas.stride)
+        self.graph_canvas.polyline(column_points(self.graph_canvas, samples))
+
+    def close(self):
+        super().close()
+        self.__close_series()
+
+    def __close_series(self):
+        if self.__series is not None:
+            self.__series.close()
+            self.__series = None
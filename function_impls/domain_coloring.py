@@ -0,0 +1,86 @@
+from cmath import phase, isfinite
+from colorsys import hls_to_rgb
+from math import atan, pi
+
+from core import GrapherBase, FunctionInput, InputBase
+
+# the picture is first drawn with blocks of PASSES[0] pixels, then refined
+PASSES = (8, 4, 2, 1)
+# evaluated and drawn between two yields
+BAND_PIXELS = 4096
+HUES = 256
+LEVELS = 64
+UNDEFINED_COLOR = "#808080"
+
+
+def _color_table():
+    """colors for every hue and lightness level, hue-major"""
+    colors = []
+    for hue in range(HUES):
+        for level in range(LEVELS):
+            r, g, b = hls_to_rgb(hue / HUES, (level + 0.5) / LEVELS, 1)
+            colors.append(f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}")
+    return colors
+
+
+COLORS = _color_table()
+HUE_SCALE = HUES / (2 * pi)
+LEVEL_SCALE = LEVELS * 2 / pi
+
+
+def _color(w) -> str:
+    """the hue gives the argument of w and the lightness its modulus, from
+    black at 0 to white at infinity"""
+    if w is None or not isfinite(w):
+        return UNDEFINED_COLOR
+    level = int(atan(abs(w)) * LEVEL_SCALE)
+    return COLORS[int(phase(w) * HUE_SCALE) % HUES * LEVELS + (level if level < LEVELS else LEVELS - 1)]
+
+
+class DomainColoring(GrapherBase):
+    @staticmethod
+    def get_params() -> InputBase:
+        return FunctionInput("f(z)", complex_mode=True)
+
+    def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
+        if not self.params.available() or not self.graph_canvas.supports_images:
+            return
+
+        stride = self.graph_canvas.stride
+        scales = [scale for scale in PASSES if scale >= stride] or [stride]
+        previous = []
+        for scale in scales:
+            items = []
+            for item in self.__pass(scale):
+                items.append(item)
+                yield
+            for item in previous:
+                self.graph_canvas.delete(item)
+            previous = items
+
+    def __pass(self, scale):
+        """draws the whole view with blocks of scale pixels, a band of rows at a
+        time, yielding the image items"""
+        canvas = self.graph_canvas
+        min_xc, max_xc = sorted(canvas.canvas_x_range)
+        min_yc, max_yc = sorted(canvas.canvas_y_range)
+        columns = int(-(-(max_xc - min_xc) // scale))
+        rows = int(-(-(max_yc - min_yc) // scale))
+        # the value at the center of each block
+        xs = [canvas.x_canvas_to_x_plane(min_xc + (c + 0.5) * scale) for c in range(columns)]
+        band_rows = max(BAND_PIXELS // max(columns, 1), 1)
+
+        for first in range(0, rows, band_rows):
+            band = range(first, min(first + band_rows, rows))
+            ys = [canvas.y_canvas_to_y_plane(min_yc + (r + 0.5) * scale) for r in band]
+            values = self.params.evaluate_many([complex(x, y) for y in ys for x in xs])
+            colors = list(map(_color, values))
+            yield canvas.image(
+                (min_xc, min_yc + first * scale),
+                [colors[i:i + columns] for i in range(0, len(colors), columns)],
+                scale
+            )
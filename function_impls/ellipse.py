@@ -1,4 +1,5 @@
 from core import GrapherBase, ParamInput, InputBase
+from core.conics import draw_ellipse
 
 
 class Circle(GrapherBase):
@@ -17,12 +18,7 @@ class Circle(GrapherBase):
         if r == 0:
             return
 
-        x1 = self.graph_canvas.x_plane_to_x_canvas(a - r)
-        y1 = self.graph_canvas.y_plane_to_y_canvas(b - r)
-        x2 = self.graph_canvas.x_plane_to_x_canvas(a + r)
-        y2 = self.graph_canvas.y_plane_to_y_canvas(b + r)
-
-        self.graph_canvas.ellipse((x1, y1), (x2, y2))
+        draw_ellipse(self.graph_canvas, (-a, -b), r, r)
 
 
 class Ellipse(GrapherBase):
@@ -42,9 +38,4 @@ class Ellipse(GrapherBase):
         if a == 0 or b == 0:
             return
 
-        x1 = self.graph_canvas.x_plane_to_x_canvas(c - a)
-        y1 = self.graph_canvas.y_plane_to_y_canvas(d - b)
-        x2 = self.graph_canvas.x_plane_to_x_canvas(c + a)
-        y2 = self.graph_canvas.y_plane_to_y_canvas(d + b)
-
-        self.graph_canvas.ellipse((x1, y1), (x2, y2))
+        draw_ellipse(self.graph_canvas, (-c, -d), a, b)
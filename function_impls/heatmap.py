@@ -0,0 +1,117 @@
+from array import array
+from math import floor, isfinite, nan
+
+from core import GrapherBase, HeatmapInput, InputBase
+from core.tile_cache import TILE_CACHE
+
+# the picture is first drawn with blocks of PASSES[0] pixels, then refined
+PASSES = (8, 4, 2, 1)
+# samples on each side of a cached tile, a tile is drawn as one image
+TILE = 32
+UNDEFINED_COLOR = "#808080"
+COLORMAP_SIZE = 256
+# anchors of a perceptually uniform dark blue to yellow colormap
+COLORMAP_ANCHORS = ((68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98), (253, 231, 37))
+
+
+def _colormap():
+    colors = []
+    segments = len(COLORMAP_ANCHORS) - 1
+    for i in range(COLORMAP_SIZE):
+        position = i / (COLORMAP_SIZE - 1) * segments
+        segment = min(int(position), segments - 1)
+        t = position - segment
+        start = COLORMAP_ANCHORS[segment]
+        end = COLORMAP_ANCHORS[segment + 1]
+        r, g, b = (round(s + (e - s) * t) for s, e in zip(start, end))
+        colors.append(f"#{r:02x}{g:02x}{b:02x}")
+    return colors
+
+
+COLORMAP = _colormap()
+
+
+def _colors(values, low: float, high: float) -> list[str]:
+    factor = COLORMAP_SIZE / (high - low) if high != low else 0
+    last = COLORMAP_SIZE - 1
+    colors = []
+    for v in values:
+        if v != v:
+            colors.append(UNDEFINED_COLOR)
+            continue
+        i = int((v - low) * factor)
+        colors.append(COLORMAP[0 if i < 0 else last if i > last else i])
+    return colors
+
+
+def _sample_step(span: float, pixels: int) -> float:
+    """the size of a pixel, rounded so that it does not change while the view
+    is panned and the cached tiles keep lining up"""
+    return float(f"{abs(span) / max(pixels, 1):.10g}")
+
+
+class Heatmap(GrapherBase):
+    @staticmethod
+    def get_params() -> InputBase:
+        return HeatmapInput("heatmap of f(x, y)", "f(x, y)", "$low$ ≤ f ≤ $high$")
+
+    def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
+        if not self.params.available() or not self.graph_canvas.supports_images:
+            return
+
+        stride = self.graph_canvas.stride
+        scales = [scale for scale in PASSES if scale >= stride] or [stride]
+        previous = []
+        for scale in scales:
+            items = []
+            for item in self.__pass(scale):
+                items.append(item)
+                yield
+            for item in previous:
+                self.graph_canvas.delete(item)
+            previous = items
+
+    def __pass(self, scale):
+        """draws the tiles covering the view with blocks of scale pixels, one
+        at a time, yielding the image items"""
+        canvas = self.graph_canvas
+        min_x, max_x = sorted(canvas.x_range)
+        min_y, max_y = sorted(canvas.y_range)
+        step_x = _sample_step(max_x - min_x, canvas.width()) * scale
+        step_y = _sample_step(max_y - min_y, canvas.height()) * scale
+        if step_x == 0 or step_y == 0:
+            return
+        low = self.params["low"]
+        high = self.params["high"]
+
+        # from the top row of tiles down, as the images are drawn
+        for ty in range(floor(max_y / (TILE * step_y)), floor(min_y / (TILE * step_y)) - 1, -1):
+            for tx in range(floor(min_x / (TILE * step_x)), floor(max_x / (TILE * step_x)) + 1):
+                colors = _colors(self.__tile(step_x, step_y, tx, ty), low, high)
+                position = (
+                    round(canvas.x_plane_to_x_canvas(tx * TILE * step_x)),
+                    round(canvas.y_plane_to_y_canvas((ty + 1) * TILE * step_y))
+                )
+                yield canvas.image(position, [colors[i:i + TILE] for i in range(0, TILE * TILE, TILE)], scale)
+
+    def __tile(self, step_x, step_y, tx, ty) -> array:
+        """the values at the center of the samples of a tile, row by row from
+        the top, nan where the function is not defined"""
+        key = self.params.cache_key()
+        if key is not None:
+            key = (type(self).__module__, type(self).__qualname__, key, step_x, step_y, tx, ty)
+            tile = TILE_CACHE.get(key)
+            if tile is not None:
+                return tile
+
+        xs = [(tx * TILE + i + 0.5) * step_x for i in range(TILE)]
+        ys = [((ty + 1) * TILE - r - 0.5) * step_y for r in range(TILE)]
+        values = self.params.evaluate_many(xs * TILE, [y for y in ys for _ in range(TILE)])
+        tile = array("d", [v if isinstance(v, (float, int)) and isfinite(v) else nan for v in values])
+        if key is not None:
+            TILE_CACHE.put(key, tile)
+        return tile
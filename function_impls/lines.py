@@ -1,4 +1,5 @@
 from core import GrapherBase, ParamInput, InputBase
+from core.conics import draw_line
 
 
 class LineType1(GrapherBase):
@@ -13,15 +14,7 @@ class LineType1(GrapherBase):
         m = self.params["m"]
         q = self.params["q"]
 
-        min_x, max_x = self.graph_canvas.x_range
-        y1 = min_x * m + q
-        y2 = max_x * m + q
-        y1_canvas = self.graph_canvas.y_plane_to_y_canvas(y1)
-        y2_canvas = self.graph_canvas.y_plane_to_y_canvas(y2)
-        self.graph_canvas.line(
-            (self.graph_canvas.canvas_x_range[0], y1_canvas),
-            (self.graph_canvas.canvas_x_range[1], y2_canvas)
-        )
+        draw_line(self.graph_canvas, (0, q), (1, m))
 
 
 class LineType2(GrapherBase):
@@ -40,21 +33,5 @@ class LineType2(GrapherBase):
         if a == b == 0:
             return
 
-        if b == 0:
-            x_canvas = self.graph_canvas.x_plane_to_x_canvas(-c)
-            self.graph_canvas.line(
-                (x_canvas, self.graph_canvas.canvas_y_range[0]),
-                (x_canvas, self.graph_canvas.canvas_y_range[1])
-            )
-        else:
-            m = -a / b
-            q = -c / b
-            min_x, max_x = self.graph_canvas.x_range
-            y1 = min_x * m + q
-            y2 = max_x * m + q
-            y1_canvas = self.graph_canvas.y_plane_to_y_canvas(y1)
-            y2_canvas = self.graph_canvas.y_plane_to_y_canvas(y2)
-            self.graph_canvas.line(
-                (self.graph_canvas.canvas_x_range[0], y1_canvas),
-                (self.graph_canvas.canvas_x_range[1], y2_canvas)
-            )
+        point = (0, -c / b) if b != 0 else (-c / a, 0)
+        draw_line(self.graph_canvas, point, (b, -a))
@@ -0,0 +1,28 @@
+# the graphers of the package, in the order they are listed: the name they are
+# listed and recorded under, which is the format of their input without the
+# '$', and "module:Class"; read without importing the grapher modules
+GRAPHERS = (
+    ("f(x)", "function_impls.user_functions:FunctionX"),
+    ("f(y)", "function_impls.user_functions:FunctionY"),
+    ("x(t), y(t)", "function_impls.parametric:Parametric"),
+    ("r(t)", "function_impls.polar:Polar"),
+    ("lower(x) < y < upper(x)", "function_impls.region:Region"),
+    ("∫ f(x) dx from a to b", "function_impls.area:Area"),
+    ("f(z)", "function_impls.domain_coloring:DomainColoring"),
+    ("heatmap of f(x, y)", "function_impls.heatmap:Heatmap"),
+    ("y = mx + q", "function_impls.lines:LineType1"),
+    ("ax + by + c = 0", "function_impls.lines:LineType2"),
+    ("y = ax^2 + bx + c", "function_impls.parabola:Parabola"),
+    ("(x + a)^2 + (y + b)^2 = r^2", "function_impls.ellipse:Circle"),
+    ("(x + c)^2/a^2 + (y + d)^2/b^2 = 1", "function_impls.ellipse:Ellipse"),
+    ("y = (ax + b) / (cx + d)", "function_impls.homographic:Homographic"),
+    ("(x + c)^2/a^2 - (y + d)^2/b^2 = 1", "function_impls.hyperbole:HyperboleType1"),
+    ("(x + c)^2/a^2 - (y + d)^2/b^2 = -1", "function_impls.hyperbole:HyperboleType2"),
+    ("y = a * sin(w * x)", "function_impls.trigonometry:Sine"),
+    ("y = a * cos(w * x)", "function_impls.trigonometry:Cosine"),
+    ("y = a * tan(w * x)", "function_impls.trigonometry:Tangent"),
+    ("y = log_n(a * x)", "function_impls.logarithm:Logarithm"),
+    ("y = rtn(a * x)", "function_impls.roots:NthRoot"),
+    ("Data series", "function_impls.data_series:DataSeries"),
+    ("Stream", "function_impls.stream:StreamGrapher"),
+)
@@ -0,0 +1,47 @@
+from math import isfinite
+
+from core import GrapherBase, Polyline, ParametricInput, InputBase
+from core.clipping import clip_polyline, viewport
+from core.sampling import adaptive_sample_iter, MAX_SEGMENT
+
+
+class Parametric(GrapherBase):
+    @staticmethod
+    def get_params() -> InputBase:
+        return ParametricInput("x(t), y(t)", "x(t)", "y(t)", "$t_min$ ≤ t ≤ $t_max$")
+
+    def points(self, ts):
+        canvas_points = []
+        for point in self.params.evaluate_many(ts):
+            if point is None:
+                canvas_points.append(None)
+                continue
+            x, y = point
+            if not isinstance(x, (float, int)) or not isinstance(y, (float, int)) \
+                    or not isfinite(x) or not isfinite(y):
+                canvas_points.append(None)
+                continue
+            canvas_points.append((self.graph_canvas.x_plane_to_x_canvas(x), self.graph_canvas.y_plane_to_y_canvas(y)))
+        return canvas_points
+
+    def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
+        if not self.params.available():
+            return
+
+        t_min = self.params["t_min"]
+        t_max = self.params["t_max"]
+        if t_min == t_max:
+            return
+
+        min_xc, max_xc = self.graph_canvas.canvas_x_range
+        min_yc, max_yc = self.graph_canvas.canvas_y_range
+        runs = yield from adaptive_sample_iter(
+            self.points, t_min, t_max,
+            (min_xc, min_yc, max_xc, max_yc),
+            max_segment=MAX_SEGMENT * self.graph_canvas.stride
+        )
+        self.graph_canvas.polyline(clip_polyline(Polyline.from_runs(runs), viewport(self.graph_canvas)))
@@ -0,0 +1,48 @@
+from math import cos, sin, isfinite, pi, ceil
+
+from core import GrapherBase, Polyline, PolarInput, InputBase
+from core.clipping import clip_polyline, viewport
+from core.sampling import adaptive_sample_iter, MAX_SEGMENT
+
+SAMPLES_PER_TURN = 16
+
+
+class Polar(GrapherBase):
+    @staticmethod
+    def get_params() -> InputBase:
+        return PolarInput("r(t)", "$t_min$ ≤ t ≤ $t_max$")
+
+    def points(self, ts):
+        canvas_points = []
+        for t, r in zip(ts, self.params.evaluate_many(ts)):
+            if not isinstance(r, (float, int)) or not isfinite(r):
+                canvas_points.append(None)
+                continue
+            x = self.graph_canvas.x_plane_to_x_canvas(r * cos(t))
+            y = self.graph_canvas.y_plane_to_y_canvas(r * sin(t))
+            canvas_points.append((x, y))
+        return canvas_points
+
+    def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
+        if not self.params.available():
+            return
+
+        t_min = self.params["t_min"]
+        t_max = self.params["t_max"]
+        if t_min == t_max:
+            return
+
+        turns = abs(t_max - t_min) / (2 * pi)
+        min_xc, max_xc = self.graph_canvas.canvas_x_range
+        min_yc, max_yc = self.graph_canvas.canvas_y_range
+        runs = yield from adaptive_sample_iter(
+            self.points, t_min, t_max,
+            (min_xc, min_yc, max_xc, max_yc),
+            initial_samples=max(int(ceil(turns * SAMPLES_PER_TURN)), 64),
+            max_segment=MAX_SEGMENT * self.graph_canvas.stride
+        )
+        self.graph_canvas.polyline(clip_polyline(Polyline.from_runs(runs), viewport(self.graph_canvas)))
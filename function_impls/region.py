@@ -0,0 +1,85 @@
+from math import inf, isfinite
+
+from core import GrapherBase, RegionInput, InputBase, Polyline
+from core.clipping import clip_polyline, viewport
+
+
+def _boundary_values(func_input, xs, default):
+    if func_input is None:
+        return [default] * len(xs)
+    values = []
+    for y in func_input.evaluate_many(xs):
+        if isinstance(y, (float, int)) and isfinite(y):
+            values.append(y)
+        else:
+            values.append(None)
+    return values
+
+
+def _merge_edge(points):
+    """removes the points in the middle of horizontal runs, which are common
+    where the region is cut by the edges of the canvas"""
+    merged = []
+    for p in points:
+        if len(merged) >= 2 and merged[-1][1] == p[1] == merged[-2][1]:
+            merged[-1] = p
+        else:
+            merged.append(p)
+    return merged
+
+
+class Region(GrapherBase):
+    @staticmethod
+    def get_params() -> InputBase:
+        return RegionInput("lower(x) < y < upper(x)", "lower(x)", "upper(x)")
+
+    def graph(self):
+        if not self.params.available():
+            return
+
+        lower, upper = self.params.bounds()
+        min_xc, max_xc = self.graph_canvas.canvas_x_range
+        min_y, max_y = self.graph_canvas.y_range
+        step = self.graph_canvas.stride if min_xc <= max_xc else -self.graph_canvas.stride
+        x_canvases = list(range(min_xc, max_xc + step, step))
+        xs = [self.graph_canvas.x_canvas_to_x_plane(x_canvas) for x_canvas in x_canvases]
+        lows = _boundary_values(lower, xs, -inf)
+        highs = _boundary_values(upper, xs, inf)
+
+        top = []
+        bottom = []
+        for x_canvas, low, high in zip(x_canvases, lows, highs):
+            span = None
+            if low is not None and high is not None:
+                low = max(low, min_y)
+                high = min(high, max_y)
+                if low < high:
+                    span = low, high
+            if span is None:
+                self.__fill(top, bottom)
+                top = []
+                bottom = []
+                continue
+            top.append((x_canvas, self.graph_canvas.y_plane_to_y_canvas(span[1])))
+            bottom.append((x_canvas, self.graph_canvas.y_plane_to_y_canvas(span[0])))
+        self.__fill(top, bottom)
+
+        if lower is not None:
+            self.__boundary(x_canvases, lows)
+        if upper is not None:
+            self.__boundary(x_canvases, highs)
+
+    def __fill(self, top, bottom):
+        if len(top) < 2:
+            return
+        bottom.reverse()
+        self.graph_canvas.polygon(_merge_edge(top) + _merge_edge(bottom))
+
+    def __boundary(self, x_canvases, values):
+        line = Polyline()
+        for x_canvas, y in zip(x_canvases, values):
+            if y is None:
+                line.end_run()
+                continue
+            line.append(x_canvas, self.graph_canvas.y_plane_to_y_canvas(y))
+        self.graph_canvas.polyline(clip_polyline(line, viewport(self.graph_canvas)))
@@ -0,0 +1,104 @@
+from collections import deque
+
+from core import GrapherBase, StreamInput, InputBase, RingBuffer, StreamReader
+from core.data_series import column_points
+
+
+class StreamGrapher(GrapherBase):
+    CAPACITY = 1 << 20
+    streaming = True
+
+    def __init__(self, graph_canvas):
+        super().__init__(graph_canvas)
+        self.buffer = RingBuffer(self.CAPACITY)
+        self.follow = True
+        self.__reader: StreamReader | None = None
+        self.__drawn = 0
+        self.__last_point: tuple[float, float] | None = None
+        self.__items = deque()
+
+    @staticmethod
+    def get_params() -> InputBase:
+        return StreamInput("Stream")
+
+    def push(self, x: float, y: float):
+        """producer API, can be called from any thread"""
+        self.buffer.push(x, y)
+
+    def __update_reader(self):
+        source = self.params["path"]
+        if self.__reader is not None and self.__reader.source == source:
+            return
+        if self.__reader is not None:
+            # the samples of the new source start again from x = 0; a new
+            # buffer also keeps the old reader, which may still be blocked
+            # reading, from adding to it after being stopped
+            self.__reader.stop()
+            self.buffer = RingBuffer(self.CAPACITY)
+            while self.__items:
+                self.graph_canvas.delete(self.__items.popleft()[0])
+            self.__drawn = 0
+            self.__last_point = None
+        self.__reader = StreamReader(source, self.buffer)
+        self.__reader.start()
+
+    def newest_x(self) -> float | None:
+        last = self.buffer.last()
+        return None if last is None else last[0]
+
+    def __draw(self, samples: list):
+        """samples are (x, min_y, max_y)"""
+        for item in self.graph_canvas.polyline(column_points(self.graph_canvas, samples)):
+            if item is not None:
+                self.__items.append((item, samples[-1][0]))
+
+    def graph(self):
+        for _ in self.graph_iter():
+            pass
+
+    def graph_iter(self):
+        if not self.params.available():
+            return
+        self.__update_reader()
+
+        self.__items.clear()
+        min_x, max_x = self.graph_canvas.x_range
+        min_xc, max_xc = self.graph_canvas.canvas_x_range
+        start, last_xs, last_ys = self.buffer.read(self.buffer.total - 1)
+        self.__drawn = start + len(last_xs)
+        self.__last_point = (last_xs[-1], last_ys[-1]) if last_xs else None
+
+        prev = None
+        for samples in self.buffer.decimate(min_x, max_x, abs(max_xc - min_xc) // self.graph_canvas.stride):
+            # each chunk starts from the end of the previous one
+            self.__draw(samples if prev is None else [prev, *samples])
+            prev = samples[-1]
+            yield
+
+    def graph_new(self):
+        """draws only the samples that arrived since the last call and deletes
+        what has scrolled out of view"""
+        if not self.params.available():
+            return
+        self.__update_reader()
+
+        min_x, _ = self.graph_canvas.x_range
+        while self.__items and self.__items[0][1] < min_x:
+            self.graph_canvas.delete(self.__items.popleft()[0])
+
+        start, xs, ys = self.buffer.read(self.__drawn)
+        if not xs:
+            return
+        prev_point = self.__last_point if start == self.__drawn else None
+        self.__drawn = start + len(xs)
+        self.__last_point = xs[-1], ys[-1]
+        samples = list(zip(xs, ys, ys))
+        if prev_point is not None:
+            samples.insert(0, (prev_point[0], prev_point[1], prev_point[1]))
+        self.__draw(samples)
+
+    def close(self):
+        super().close()
+        if self.__reader is not None:
+            self.__reader.stop()
+            self.__reader = None
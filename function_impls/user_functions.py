@@ -13,6 +13,9 @@ class FunctionX(FunctionGraphX):
     def f(self, x):
         return self.params[x]
 
+    def evaluate_many(self, values, kwargs) -> list:
+        return self.params.evaluate_many(values)
+
 
 class FunctionY(FunctionGraphY):
     @staticmethod
@@ -24,3 +27,6 @@ class FunctionY(FunctionGraphY):
 
     def f(self, y):
         return self.params[y]
+
+    def evaluate_many(self, values, kwargs) -> list:
+        return self.params.evaluate_many(values)
@@ -8,8 +8,8 @@ from core.grapher_base import FunctionGraphX
 
 class FunctionInClass(FunctionGraphX):
     @staticmethod
-    def get_param_string() -> str:
-        return ""
+    def get_params():
+        return TerminalParamInput("y = (sin(pi*x/2) + cos(x)^2) / 2 - sqrt(3)")
 
     def get_func(self):
         return self.f
@@ -20,18 +20,17 @@ class FunctionInClass(FunctionGraphX):
 
 
 def main():
-    canvas = TurtleCanvas()
-    grapher = FunctionInClass(canvas, TerminalParamInput)
+    t.screensize(500, 500)
+    canvas = TurtleCanvas(batched=True)
+    grapher = FunctionInClass(canvas)
     canvas.x_range = -5, 5
     canvas.y_range = -5, 5
 
-    t.screensize(500, 500)
-    t.speed(0)
-    t.showturtle()
     canvas.draw_background()
     canvas.color = "#DD0000"
     canvas.line_width = 2
     grapher.graph()
+    canvas.draw_foreground()
     t.done()
 
 
@@ -0,0 +1,58 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# imported by the processes that draw or evaluate without a window, they must not load tkinter
+HEADLESS_MODULES = (
+    "core",
+    "core.function_parser",
+    "core.grapher_base",
+    "core.recording_canvas",
+    "core.export",
+    "function_impls.user_functions",
+)
+MARKER = "-- start --"
+
+
+def import_time(module: str) -> tuple[float, bool]:
+    """the microseconds spent importing module in a new interpreter, as
+    reported by -X importtime, and if tkinter was imported"""
+    code = f"import sys; sys.stderr.write({MARKER!r} + '\\n'); import {module}; print('tkinter' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    lines = result.stderr.splitlines()
+    total = 0
+    for line in lines[lines.index(MARKER) + 1:]:
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # only the outermost imports, the cumulative time includes the nested ones
+        if not name.startswith("  ") and cumulative.strip().isdigit():
+            total += int(cumulative)
+    return total, result.stdout.strip() == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the import time of the modules used without a window")
+    parser.add_argument("modules", nargs="*", default=HEADLESS_MODULES, help="the modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="imports of each module, the median is shown")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        times = []
+        loads_tk = False
+        for _ in range(args.runs):
+            time, tk = import_time(module)
+            times.append(time)
+            loads_tk |= tk
+        failed |= loads_tk
+        note = "  imports tkinter" if loads_tk else ""
+        print(f"{module:32} {statistics.median(times) / 1000:8.2f} ms{note}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
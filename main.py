@@ -1,4 +1,11 @@
+import sys
+
 from application import Application
+from application.replay import SessionRecorder
 
-app = Application()
+# python main.py --record session.jsonl writes the session to be replayed with replay.py
+recorder = SessionRecorder(sys.argv[2]) if sys.argv[1:2] == ["--record"] and len(sys.argv) > 2 else None
+app = Application(recorder)
 app.run()
+if recorder is not None:
+    recorder.close()
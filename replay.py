@@ -0,0 +1,27 @@
+import argparse
+
+from application.replay import load_session, replay, HeadlessSession, TkSession
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays a session recorded with main.py --record")
+    parser.add_argument("session", help="the file written by main.py --record")
+    parser.add_argument("--tk", action="store_true", help="replay on a real Tk window instead of in memory")
+    parser.add_argument("--size", default="500x500", help="canvas size of the in-memory replay, WIDTHxHEIGHT")
+    args = parser.parse_args()
+
+    events = load_session(args.session)
+    if args.tk:
+        session = TkSession()
+    else:
+        width, height = (int(n) for n in args.size.split("x"))
+        session = HeadlessSession(width, height)
+    try:
+        report = replay(session, events)
+    finally:
+        session.close()
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()